@@ -1,7 +1,23 @@
 from fastapi import APIRouter
+from ai_features.views.LLMCacheStats import LLMCacheStats
+from ai_features.views.RateLimiterStats import RateLimiterStats
 from ai_features.views.QuestionAnswerGenerationModel import QuestionAnswerGenerationModel
+from ai_features.views.QuestionAnswerProgressStream import QuestionAnswerGenerationStream
+from ai_features.views.QuestionAnswerJobs import (
+    SubmitQuestionAnswerJob,
+    DeleteQuestionAnswerJob,
+    DownloadQuestionAnswerJob,
+    GetQuestionAnswerJobStatus
+)
 
 aiFeatureRoutes = APIRouter(prefix="/Ai_Features", tags=["AI"])
 
 
 aiFeatureRoutes.add_api_route("/LactureQuestionAnswerGenerationModel", QuestionAnswerGenerationModel, methods=["POST"])
+aiFeatureRoutes.add_api_route("/LactureQuestionAnswerGenerationStream", QuestionAnswerGenerationStream, methods=["POST"])
+aiFeatureRoutes.add_api_route("/LactureQuestionAnswerGenerationJobs", SubmitQuestionAnswerJob, methods=["POST"])
+aiFeatureRoutes.add_api_route("/LactureQuestionAnswerGenerationJobs/{job_id}", GetQuestionAnswerJobStatus, methods=["GET"])
+aiFeatureRoutes.add_api_route("/LactureQuestionAnswerGenerationJobs/{job_id}/download", DownloadQuestionAnswerJob, methods=["GET"])
+aiFeatureRoutes.add_api_route("/LactureQuestionAnswerGenerationJobs/{job_id}", DeleteQuestionAnswerJob, methods=["DELETE"])
+aiFeatureRoutes.add_api_route("/LLMCacheStats", LLMCacheStats, methods=["GET"])
+aiFeatureRoutes.add_api_route("/RateLimiterStats", RateLimiterStats, methods=["GET"])
\ No newline at end of file
@@ -0,0 +1,16 @@
+import asyncio
+from fastapi.responses import JSONResponse
+from helper_function.llm_cache import llm_response_cache
+
+async def LLMCacheStats():
+    """Hit/miss counters of the LLM response cache"""
+    try:
+        if llm_response_cache is None:
+            return JSONResponse(content={"enabled": False}, status_code=200)
+        stats = await asyncio.to_thread(llm_response_cache.stats)
+        return JSONResponse(content={"enabled": True, **stats}, status_code=200)
+    except Exception as err:
+        return JSONResponse(
+            content={"message": "Cache stats failed", "error": str(err)},
+            status_code=500
+        )
@@ -1,11 +1,10 @@
-import io
-import json
 import uuid
 import shutil
-import zipfile
+import httpx
 import asyncio
-from typing import List
+from typing import List, Optional
 from pathlib import Path
+from openai import AsyncOpenAI
 from langchain_xai import ChatXAI
 from core.config import ai_api_secrets
 from langchain_openai import ChatOpenAI
@@ -13,89 +12,242 @@ from langchain_anthropic import ChatAnthropic
 from fastapi import Request, UploadFile, File, Form
 from langchain.schema.runnable import RunnableParallel
 from langchain_google_genai import ChatGoogleGenerativeAI
+from starlette.background import BackgroundTask
 from fastapi.responses import StreamingResponse, JSONResponse
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.runnables import RunnableLambda
 from langchain_core.runnables.passthrough import RunnableAssign
 from helper_function.runnable_lambda import extract_summary, extract_questions
+from helper_function.transcript_cache import file_sha256, transcript_cache
+from helper_function.upload_streaming import UploadTooLargeError, stream_upload_to_file
+from helper_function.output_archive import (
+    OUTPUT_FORMATS,
+    ZIP_COMPRESSION_METHODS,
+    iter_zip_stream,
+    read_output_entry,
+    iter_ndjson_stream,
+    collect_output_entries
+)
+from helper_function.task_graph import TaskGraph
+from helper_function.quorum_fanout import drop_reason_label, quorum_fan_out
+from helper_function.rate_limiter import get_rate_limiter, rate_limited_model
+from helper_function.metrics import STAGE_DURATION, QUESTION_MODELS_DROPPED, metered_model, timed_iterator
+from helper_function.admission_control import AdmissionRejected, admission_controller, estimate_job_cost
+from helper_function.summary_context import RollingSummaryContext
+from helper_function.progress_events import ProgressCallback, emit_progress
+from helper_function.llm_cache import LLMResponseCache, llm_response_cache, cached_structured_model
+from helper_function.cassette import ModelCassette, CassetteAudioClient, model_cassette, cassette_model, cassette_fan_out
+from helper_function.transcript_windowing import (
+    WINDOWING_MODES,
+    count_tokens,
+    window_transcript
+)
 
 from helper_function.prompt_templates import (
     summary_prompt, 
     question_prompt_multi_model,
+    concise_stitch_prompt,
+    context_digest_prompt,
     cumulative_summary_prompt,
     question_selection_prompt
 )
 from helper_function.schema_definitions import (
     summary_json_schema, 
     question_json_schema,
+    concise_stitch_json_schema,
+    context_digest_json_schema,
     cumulative_summary_json_schema
 )
 from helper_function.video_to_pdf_function import (
-    split_pdf, 
     write_file, 
-    audio_to_text,
-    video_to_audio, 
     save_text_to_pdf,
+    segments_to_text,
+    probe_media_duration_seconds,
+    video_to_speech_segments,
     sanitize_question_dict
 )
 
-def init_models():
+SUMMARY_MODE_SEQUENTIAL = "sequential"
+SUMMARY_MODE_PARALLEL = "parallel"
+SUMMARY_MODES = (SUMMARY_MODE_SEQUENTIAL, SUMMARY_MODE_PARALLEL)
+
+def create_shared_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared by all OpenAI-compatible clients"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=ai_api_secrets.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=ai_api_secrets.HTTP_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(ai_api_secrets.HTTP_TIMEOUT_SECONDS)
+    )
+
+def _model_name(model) -> str:
+    """Provider model id of a LangChain chat model"""
+    return getattr(model, "model_name", None) or getattr(model, "model")
+
+def _provider(model) -> str:
+    """Rate limiter key for a LangChain chat model"""
+    if isinstance(model, ChatXAI):
+        return "xai"
+    if isinstance(model, ChatAnthropic):
+        return "anthropic"
+    if isinstance(model, ChatGoogleGenerativeAI):
+        return "google"
+    return "openai_chat"
+
+def _structured(
+    model,
+    schema: dict,
+    llm_cache: Optional[LLMResponseCache],
+    cassette: Optional[ModelCassette] = None
+):
+    """
+    Metered structured-output model behind its provider's rate limiter, answered
+    from the response cache when one is configured (cache hits cost no budget).
+    With a cassette the provider call itself is recorded or replayed.
+    """
+    structured_model = model.with_structured_output(schema)
+    if cassette is not None:
+        structured_model = cassette_model(structured_model, cassette, _model_name(model), schema)
+    structured_model = rate_limited_model(
+        metered_model(structured_model, _model_name(model), count_tokens),
+        get_rate_limiter(_provider(model)),
+        count_tokens,
+        _model_name(model)
+    )
+    if llm_cache is None:
+        return structured_model
+    return cached_structured_model(structured_model, llm_cache, _model_name(model), schema)
+
+def init_models(
+    http_async_client: Optional[httpx.AsyncClient] = None,
+    llm_cache: Optional[LLMResponseCache] = None,
+    cassette: Optional[ModelCassette] = None
+):
     """Initialize all AI models for parallel processing"""
     try:
+        # SDK retries are off: call_with_rate_limit is the only retry layer, so
+        # every attempt goes through the shared provider budget
+        
         # Summary generation model (single model)
-        summary_model = ChatOpenAI(model="gpt-5.1-2025-11-13")
+        summary_model = ChatOpenAI(model="gpt-5.1-2025-11-13", http_async_client=http_async_client, max_retries=0)
         
         # Cumulative summary generation model (single model)
-        cumulative_summary_model = ChatOpenAI(model="gpt-5.1-2025-11-13")
+        cumulative_summary_model = ChatOpenAI(model="gpt-5.1-2025-11-13", http_async_client=http_async_client, max_retries=0)
         
         # Multiple models for question generation (parallel processing)
         question_models = {
-            "openai": ChatOpenAI(model="gpt-5.1-2025-11-13"),
-            "anthropic": ChatAnthropic(model="claude-haiku-4-5-20251001"),
-            "xai": ChatXAI(model="grok-4-fast-reasoning"),
-            "google": ChatGoogleGenerativeAI(model="gemini-2.5-flash")
+            "openai": ChatOpenAI(model="gpt-5.1-2025-11-13", http_async_client=http_async_client, max_retries=0),
+            "anthropic": ChatAnthropic(model="claude-haiku-4-5-20251001", max_retries=0),
+            "xai": ChatXAI(model="grok-4-fast-reasoning", http_async_client=http_async_client, max_retries=0),
+            "google": ChatGoogleGenerativeAI(model="gemini-2.5-flash", max_retries=0)
         }
         
         # Question selection model (best question picker)
-        selection_model = ChatOpenAI(model="gpt-5.1-2025-11-13")
+        selection_model = ChatOpenAI(model="gpt-5.1-2025-11-13", http_async_client=http_async_client, max_retries=0)
+        
+        # Concise summary stitching model (parallel summary mode; small prompts, cheap model)
+        stitch_model = ChatOpenAI(model="gpt-5-mini", http_async_client=http_async_client, max_retries=0)
+        
+        # Rolling summary context digest model (compacts earlier pages; cheap model)
+        digest_model = ChatOpenAI(model="gpt-5-mini", http_async_client=http_async_client, max_retries=0)
 
         # Structured outputs
-        structured_summary_model = summary_model.with_structured_output(summary_json_schema)
-        structured_cumulative_summary_model = cumulative_summary_model.with_structured_output(
-            cumulative_summary_json_schema
+        structured_summary_model = _structured(summary_model, summary_json_schema, llm_cache, cassette)
+        structured_cumulative_summary_model = _structured(
+            cumulative_summary_model, cumulative_summary_json_schema, llm_cache, cassette
         )
         structured_question_models = {
-            name: model.with_structured_output(question_json_schema) 
+            name: _structured(model, question_json_schema, llm_cache, cassette)
             for name, model in question_models.items()
         }
-        structured_selection_model = selection_model.with_structured_output(question_json_schema)
+        structured_selection_model = _structured(selection_model, question_json_schema, llm_cache, cassette)
+        structured_stitch_model = _structured(stitch_model, concise_stitch_json_schema, llm_cache, cassette)
+        structured_digest_model = _structured(digest_model, context_digest_json_schema, llm_cache, cassette)
         
         return (
             structured_summary_model,
             structured_cumulative_summary_model,
             structured_question_models,
-            structured_selection_model
+            structured_selection_model,
+            structured_stitch_model,
+            structured_digest_model
         )
     except Exception as err:
         raise Exception(f"Model initialization failed: {err}")
 
-async def paths():
+def build_chain_registry(
+    http_async_client: Optional[httpx.AsyncClient] = None,
+    models: Optional[tuple] = None,
+    transcription_client=None
+) -> dict:
+    """
+    Build every model client and chain once so all requests can share them.
+    
+    `models` (shaped like the init_models() result) and `transcription_client`
+    stand in for the real providers, e.g. in the offline benchmarks. With
+    CASSETTE_MODE set, the response cache is bypassed so every call reaches
+    the cassette.
+    """
+    try:
+        llm_cache = llm_response_cache if model_cassette is None else None
+        transcription_client = transcription_client or AsyncOpenAI(http_client=http_async_client, max_retries=0)
+        if model_cassette is not None:
+            transcription_client = CassetteAudioClient(transcription_client, model_cassette)
+        (
+            summary_model,
+            cumulative_summary_model,
+            question_models,
+            selection_model,
+            stitch_model,
+            digest_model
+        ) = models or init_models(http_async_client, llm_cache, model_cassette)
+        
+        return {
+            "http_async_client": http_async_client,
+            "transcription_client": transcription_client,
+            "summary_chain": create_summary_chain(summary_model),
+            "question_generation_chain": create_question_generation_chain(question_models, cassette=model_cassette),
+            "question_selection_chain": create_question_selection_chain(selection_model),
+            "cumulative_summary_chain": create_cumulative_summary_chain(cumulative_summary_model),
+            "concise_stitch_chain": create_concise_stitch_chain(stitch_model),
+            "context_digest_chain": create_context_digest_chain(digest_model)
+        }
+    except Exception as err:
+        raise Exception(f"Chain registry creation failed: {err}")
+
+async def close_chain_registry(chain_registry: dict) -> None:
+    """Close the pooled connections held by a chain registry"""
+    await chain_registry["transcription_client"].close()
+    if chain_registry["http_async_client"] is not None:
+        await chain_registry["http_async_client"].aclose()
+
+def get_chain_registry(request: Request) -> dict:
+    """Return the app-wide chain registry, building it if the lifespan hook did not run"""
+    chain_registry = getattr(request.app.state, "chain_registry", None)
+    if chain_registry is None:
+        chain_registry = build_chain_registry(create_shared_http_client())
+        request.app.state.chain_registry = chain_registry
+    return chain_registry
+
+async def paths(request_id: Optional[str] = None):
     """Create all necessary directory paths"""
     try:
         base_dir = ai_api_secrets.BASE_DIR 
-        request_id = str(uuid.uuid4())
+        request_id = request_id or str(uuid.uuid4())
         data_dir = base_dir / "data" / request_id
         output_dir = data_dir / "output"
         
         all_paths = {
+            "request_id": request_id,
             "base_dir": base_dir,
             "data_dir": data_dir,
             "output_dir": output_dir,
             "input_video_dir": data_dir / "input_video",
             "input_audio_dir": data_dir / "input_audio",
             "input_text_dir": data_dir / "input_text",
-            "input_pdf_dir": data_dir / "input_pdf",
-            "split_pdf_dir": data_dir / "split_pdf",
+            "lecture_pdfs_dir": output_dir / "lecture_pdfs",
             "lecture_summaries_dir": output_dir / "lecture_summaries",
+            "lecture_stats_dir": output_dir / "lecture_stats",
             "lecture_questions_dir": output_dir / "lecture_questions",
             "cumulative_questions_dir": output_dir / "cumulative_questions",
             "all_previous_lecture_summary_file": output_dir / "all_previous_lecture_summary.txt",
@@ -111,15 +263,6 @@ async def paths():
     except Exception as err:
         raise Exception(f"Path creation failed: {err}")
 
-async def pdf_loader(pdf_path: Path) -> str:
-    """Load PDF and extract text"""
-    try:
-        loader = PyPDFLoader(str(pdf_path))
-        docs = await loader.aload()
-        return docs[0].page_content
-    except Exception as err:
-        raise Exception(f"PDF loading failed: {err}")
-
 def create_summary_chain(structured_summary_model):
     """Create chain for page summary generation"""
     try:
@@ -130,16 +273,42 @@ def create_summary_chain(structured_summary_model):
     except Exception as err:
         raise Exception(f"Summary chain creation failed: {err}")
 
-def create_question_generation_chain(structured_question_models):
-    """Create parallel chain for question generation using multiple models"""
+def create_question_generation_chain(
+    structured_question_models,
+    quorum: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    cassette: Optional[ModelCassette] = None
+):
+    """
+    Create hedged fan-out chain for question generation using multiple models.
+    
+    Selection proceeds once `quorum` models have answered or the deadline has
+    passed; late or failed models are dropped and reported under "question_fanout".
+    With a cassette the set of contributing models is recorded or replayed too.
+    """
     try:
-        # Create parallel chains for each model
-        parallel_chains = {
-            f"{name}_questions": question_prompt_multi_model | model
+        quorum = ai_api_secrets.QUESTION_QUORUM if quorum is None else quorum
+        if deadline_seconds is None:
+            deadline_seconds = ai_api_secrets.QUESTION_DEADLINE_SECONDS or None
+        
+        # Create chains for each model
+        model_chains = {
+            name: question_prompt_multi_model | model
             for name, model in structured_question_models.items()
         }
-        question_chain = RunnableAssign(RunnableParallel(parallel_chains))
-        final_chain = question_chain | extract_questions
+        
+        async def _fan_out(inputs: dict) -> dict:
+            if cassette is not None:
+                answers, report = await cassette_fan_out(cassette, model_chains, inputs, quorum, deadline_seconds)
+            else:
+                answers, report = await quorum_fan_out(model_chains, inputs, quorum, deadline_seconds)
+            return {
+                **inputs,
+                **{f"{name}_questions": questions for name, questions in answers.items()},
+                "question_fanout": report
+            }
+        
+        final_chain = RunnableLambda(_fan_out) | extract_questions
         return final_chain
     except Exception as err:
         raise Exception(f"Question generation chain creation failed: {err}")
@@ -160,25 +329,42 @@ def create_cumulative_summary_chain(structured_cumulative_summary_model):
     except Exception as err:
         raise Exception(f"Cumulative summary chain creation failed: {err}")
 
+def create_concise_stitch_chain(structured_stitch_model):
+    """Create chain for connecting independently generated concise page summaries"""
+    try:
+        stitch_chain = concise_stitch_prompt | structured_stitch_model
+        return stitch_chain
+    except Exception as err:
+        raise Exception(f"Concise stitch chain creation failed: {err}")
+
+def create_context_digest_chain(structured_digest_model):
+    """Create chain for compacting earlier page summaries in the rolling context"""
+    try:
+        digest_chain = context_digest_prompt | structured_digest_model
+        return digest_chain
+    except Exception as err:
+        raise Exception(f"Context digest chain creation failed: {err}")
+
 async def process_single_page(
     page_num: int,
-    split_pdf_dir: Path,
+    page_text: str,
     previous_pages_summary: str,
     summary_chain,
     number_of_questions: int
 ) -> tuple:
-    """Process a single PDF page to generate summary"""
+    """Process a single transcript page to generate summary"""
     try:
         current_page_number = page_num + 1
-        pdf_name = split_pdf_dir / f"page_{current_page_number}.pdf"
-        page_text = await pdf_loader(pdf_name)
         
-        result = await summary_chain.ainvoke({
+        summary_inputs = {
             "page_text": page_text,
             "cumulative_concise_summary": previous_pages_summary,
             "number_of_questions": number_of_questions,
             "number_of_questions_in_each_category": number_of_questions // 3
-        })
+        }
+        prompt_tokens = await asyncio.to_thread(count_tokens, summary_prompt.format(**summary_inputs))
+        with STAGE_DURATION.time(stage="page_summary"):
+            result = await summary_chain.ainvoke(summary_inputs)
         
         concise_summary = result["concise_page_summary"]
         detailed_summary = result["detail_page_summary"]
@@ -187,7 +373,7 @@ async def process_single_page(
         formatted_concise = f"\n\n#### Page {current_page_number}:\n{concise_summary}\n"
         formatted_detailed = f"\n\n#### Page {current_page_number}:\n{detailed_summary}\n"
         
-        return formatted_concise, formatted_detailed
+        return formatted_concise, formatted_detailed, prompt_tokens
     except Exception as err:
         raise Exception(f"Page processing failed for page {page_num}: {err}")
 
@@ -199,78 +385,243 @@ async def generate_questions_for_lecture(
 ) -> dict:
     """Generate questions using multiple models and select the best ones"""
     try:
-        # Step 1: Generate questions from multiple models in parallel
-        all_model_questions = await question_generation_chain.ainvoke({
-            "lecture_summary": lecture_summary,
-            "number_of_questions": number_of_questions,
-            "number_of_questions_in_each_category": number_of_questions // 3
-        })
+        # Step 1: Generate questions from multiple models in parallel (quorum/deadline)
+        with STAGE_DURATION.time(stage="question_generation"):
+            all_model_questions = await question_generation_chain.ainvoke({
+                "lecture_summary": lecture_summary,
+                "number_of_questions": number_of_questions,
+                "number_of_questions_in_each_category": number_of_questions // 3
+            })
+        question_fanout = all_model_questions.pop("question_fanout")
+        for model_name, reason in question_fanout["dropped_models"].items():
+            QUESTION_MODELS_DROPPED.inc(model=model_name, reason=drop_reason_label(reason))
         # Sanitize all model outputs
         all_model_questions_sanitized = sanitize_question_dict(all_model_questions)
         
         # Step 2: Use selection model to pick best questions
-        best_questions = await question_selection_chain.ainvoke({
-            "all_model_questions": all_model_questions_sanitized,
-            "lecture_summary": lecture_summary,
-            "number_of_questions": number_of_questions,
-            "number_of_questions_in_each_category": number_of_questions // 3
-        })
+        with STAGE_DURATION.time(stage="question_selection"):
+            best_questions = await question_selection_chain.ainvoke({
+                "all_model_questions": all_model_questions_sanitized,
+                "lecture_summary": lecture_summary,
+                "number_of_questions": number_of_questions,
+                "number_of_questions_in_each_category": number_of_questions // 3
+            })
         
         # Sanitize final output (double-check)
         best_questions_sanitized = sanitize_question_dict(best_questions)
         
+        # Record which providers the selection was made from
+        best_questions_sanitized["contributing_models"] = question_fanout["contributing_models"]
+        best_questions_sanitized["dropped_models"] = question_fanout["dropped_models"]
+        
         return best_questions_sanitized
         
     except Exception as err:
         raise Exception(f"Question generation failed: {err}")
 
-async def process_single_lecture(
+async def save_lecture_summaries(
     lecture_idx: int,
-    lecture_pdf_path: Path,
-    split_pdf_dir: Path,
+    lecture_summaries_dir: Path,
+    cumulative_concise: str,
+    cumulative_detailed: str
+) -> None:
+    """Write the lecture's concise and detailed summaries so far"""
+    await asyncio.gather(
+        write_file(
+            lecture_summaries_dir / f"lecture_{lecture_idx + 1}_concise_summary.txt",
+            cumulative_concise
+        ),
+        write_file(
+            lecture_summaries_dir / f"lecture_{lecture_idx + 1}_detailed_summary.txt",
+            cumulative_detailed
+        )
+    )
+
+async def write_lecture_summary_stats(
+    lecture_idx: int,
+    lecture_stats_dir: Path,
+    windowing_options: dict,
+    summary_mode: str,
+    page_prompt_tokens: List[int],
+    stitch_prompt_tokens: int = 0,
+    page_context_tokens: Optional[List[int]] = None,
+    context_stats: Optional[dict] = None
+) -> None:
+    """Summary cost report for tuning the window size, summary mode and context budget"""
+    stitch_calls = 1 if stitch_prompt_tokens else 0
+    await write_file(
+        lecture_stats_dir / f"lecture_{lecture_idx + 1}_summary_stats.json",
+        {
+            "lecture": lecture_idx + 1,
+            "windowing": windowing_options,
+            "summary_mode": summary_mode,
+            "summary_context": context_stats,
+            "summary_calls": len(page_prompt_tokens) + stitch_calls,
+            "prompt_tokens": sum(page_prompt_tokens) + stitch_prompt_tokens,
+            "max_page_prompt_tokens": max(page_prompt_tokens, default=0),
+            "page_prompt_tokens": page_prompt_tokens,
+            "page_context_tokens": page_context_tokens or [],
+            "stitch_prompt_tokens": stitch_prompt_tokens
+        }
+    )
+
+async def summarize_pages_parallel(
+    lecture_idx: int,
+    pages: List[str],
     summary_chain,
+    concise_stitch_chain,
     number_of_questions: int,
-    lecture_summaries_dir: Path
+    progress: Optional[ProgressCallback] = None
 ) -> tuple:
-    """Process a single lecture to generate page-wise summaries"""
+    """
+    Map-reduce page summaries: summarize all pages concurrently without
+    previous-page context, then rebuild the connective concise summary in
+    one stitching call.
+    """
     try:
+        semaphore = asyncio.Semaphore(ai_api_secrets.SUMMARY_PARALLEL_FANOUT)
         
+        async def _summarize(page_num: int, page_text: str):
+            async with semaphore:
+                result = await process_single_page(
+                    page_num=page_num,
+                    page_text=page_text,
+                    previous_pages_summary="",
+                    summary_chain=summary_chain,
+                    number_of_questions=number_of_questions
+                )
+            await emit_progress(progress, "page_summarized", {
+                "lecture": lecture_idx + 1,
+                "page": page_num + 1,
+                "total_pages": len(pages),
+                "concise_summary": result[0],
+                "detailed_summary": result[1]
+            })
+            return result
         
+        # Map: independent page summaries, in page order
+        results = await asyncio.gather(*[
+            _summarize(page_num, page_text) for page_num, page_text in enumerate(pages)
+        ])
+        page_concise = [concise for concise, _, _ in results]
+        cumulative_detailed = "".join(detailed for _, detailed, _ in results)
+        page_prompt_tokens = [prompt_tokens for _, _, prompt_tokens in results]
         
-        # Split PDF into pages
-        total_pages = await split_pdf(lecture_pdf_path, split_pdf_dir)
+        # Reduce: connect the concise summaries (nothing to connect for one page)
+        stitch_prompt_tokens = 0
+        if len(pages) > 1:
+            stitch_inputs = {
+                "page_summaries": "".join(page_concise),
+                "number_of_pages": len(pages)
+            }
+            stitch_prompt_tokens = await asyncio.to_thread(
+                count_tokens, concise_stitch_prompt.format(**stitch_inputs)
+            )
+            with STAGE_DURATION.time(stage="summary_stitch"):
+                stitch_result = await concise_stitch_chain.ainvoke(stitch_inputs)
+            stitched = stitch_result["stitched_page_summaries"]
+            # Keep the unstitched summaries if the model did not return one per page
+            if len(stitched) == len(pages):
+                page_concise = [
+                    f"\n\n#### Page {page_num + 1}:\n{summary}\n"
+                    for page_num, summary in enumerate(stitched)
+                ]
         
+        return "".join(page_concise), cumulative_detailed, page_prompt_tokens, stitch_prompt_tokens
+    except Exception as err:
+        raise Exception(f"Parallel page summarization failed for lecture {lecture_idx}: {err}")
+
+async def process_single_lecture(
+    lecture_idx: int,
+    pages: List[str],
+    summary_chain,
+    number_of_questions: int,
+    lecture_summaries_dir: Path,
+    lecture_stats_dir: Path,
+    windowing_options: dict,
+    progress: Optional[ProgressCallback] = None,
+    summary_mode: str = SUMMARY_MODE_SEQUENTIAL,
+    concise_stitch_chain=None,
+    context_digest_chain=None
+) -> tuple:
+    """Process a single lecture to generate page-wise summaries"""
+    try:
+        if summary_mode == SUMMARY_MODE_PARALLEL:
+            (
+                cumulative_concise,
+                cumulative_detailed,
+                page_prompt_tokens,
+                stitch_prompt_tokens
+            ) = await summarize_pages_parallel(
+                lecture_idx=lecture_idx,
+                pages=pages,
+                summary_chain=summary_chain,
+                concise_stitch_chain=concise_stitch_chain,
+                number_of_questions=number_of_questions,
+                progress=progress
+            )
+            await save_lecture_summaries(
+                lecture_idx, lecture_summaries_dir, cumulative_concise, cumulative_detailed
+            )
+            await write_lecture_summary_stats(
+                lecture_idx,
+                lecture_stats_dir,
+                windowing_options,
+                summary_mode,
+                page_prompt_tokens,
+                stitch_prompt_tokens
+            )
+            return cumulative_concise, cumulative_detailed
         
-        # Process each page sequentially
+        # Process each page sequentially; the previous-pages context is bounded
+        summary_context = RollingSummaryContext(
+            strategy=ai_api_secrets.SUMMARY_CONTEXT_STRATEGY,
+            window_pages=ai_api_secrets.CONTEXT_WINDOW_PAGES,
+            token_budget=ai_api_secrets.CONTEXT_TOKEN_BUDGET,
+            digest_chain=context_digest_chain
+        )
         cumulative_concise = ""
         cumulative_detailed = ""
+        page_prompt_tokens = []
+        page_context_tokens = []
         
-        for page_num in range(total_pages):
-            
-            
-            concise, detailed = await process_single_page(
+        for page_num, page_text in enumerate(pages):
+            previous_pages_summary = summary_context.render()
+            concise, detailed, prompt_tokens = await process_single_page(
                 page_num=page_num,
-                split_pdf_dir=split_pdf_dir,
-                previous_pages_summary=cumulative_concise,
+                page_text=page_text,
+                previous_pages_summary=previous_pages_summary,
                 summary_chain=summary_chain,
                 number_of_questions=number_of_questions
             )
+            await summary_context.add_page(concise)
             
             cumulative_concise += concise
             cumulative_detailed += detailed
+            page_prompt_tokens.append(prompt_tokens)
+            page_context_tokens.append(await asyncio.to_thread(count_tokens, previous_pages_summary))
             
             # Save progress after each page
-            await asyncio.gather(
-                write_file(
-                    lecture_summaries_dir / f"lecture_{lecture_idx + 1}_concise_summary.txt",
-                    cumulative_concise
-                ),
-                write_file(
-                    lecture_summaries_dir / f"lecture_{lecture_idx + 1}_detailed_summary.txt",
-                    cumulative_detailed
-                )
+            await save_lecture_summaries(
+                lecture_idx, lecture_summaries_dir, cumulative_concise, cumulative_detailed
             )
+            await emit_progress(progress, "page_summarized", {
+                "lecture": lecture_idx + 1,
+                "page": page_num + 1,
+                "total_pages": len(pages),
+                "concise_summary": concise,
+                "detailed_summary": detailed
+            })
         
+        await write_lecture_summary_stats(
+            lecture_idx,
+            lecture_stats_dir,
+            windowing_options,
+            summary_mode,
+            page_prompt_tokens,
+            page_context_tokens=page_context_tokens,
+            context_stats=summary_context.stats()
+        )
         
         return cumulative_concise, cumulative_detailed
     except Exception as err:
@@ -284,129 +635,268 @@ async def cleanup(all_paths):
     except Exception as err:
         raise Exception(f"Cleanup failed: {err}")
 
-def create_zip_sync(all_paths, zip_buffer):
-    """Create ZIP file with all outputs"""
+async def cleanup_intermediates(all_paths):
+    """Remove input and intermediate files, keeping the output directory"""
     try:
-        with zipfile.ZipFile(zip_buffer, "w") as zip_file:
-            # Add lecture summaries
-            for file in all_paths["lecture_summaries_dir"].glob("*.txt"):
-                zip_file.write(file, arcname=f"lecture_summaries/{file.name}")
-            
-            # Add lecture questions
-            for file in all_paths["lecture_questions_dir"].glob("*.json"):
-                zip_file.write(file, arcname=f"lecture_questions/{file.name}")
-            
-            # Add cumulative questions
-            for file in all_paths["cumulative_questions_dir"].glob("*.json"):
-                zip_file.write(file, arcname=f"cumulative_questions/{file.name}")
-            
-            # Add all previous lecture summary
-            if all_paths["all_previous_lecture_summary_file"].exists():
-                zip_file.write(
-                    all_paths["all_previous_lecture_summary_file"],
-                    arcname="all_previous_lecture_summary.txt"
-                )
-        
-        return zip_buffer
+        for key in ("input_video_dir", "input_audio_dir", "input_text_dir"):
+            if all_paths[key].exists():
+                await asyncio.to_thread(shutil.rmtree, all_paths[key])
     except Exception as err:
-        raise Exception(f"ZIP creation failed: {err}")
+        raise Exception(f"Intermediate cleanup failed: {err}")
 
-async def QuestionAnswerGenerationModel(
-    request: Request,
-    uploaded_file: List[UploadFile] = File(...),
-    number_of_questions: int = Form(...),
-    hinglish: bool = Form(...)
-):
-    """Main API endpoint for question generation from multiple video lectures"""
-    try:
-        # Validation
-        if number_of_questions < 3 or number_of_questions > 21:
-            return JSONResponse(
-                content={"message": "Number must be between 3 and 21"},
-                status_code=400
-            )
-        if number_of_questions % 3 != 0:
-            return JSONResponse(
-                content={"message": "Number must be divisible by 3"},
-                status_code=400
-            )
-        if not uploaded_file or len(uploaded_file) == 0:
+def build_pipeline_options(
+    include_pdf: bool = False,
+    windowing: Optional[str] = None,
+    window_tokens: Optional[int] = None,
+    snap_to_sentences: bool = True,
+    output_format: str = "zip",
+    compression: Optional[str] = None,
+    summary_mode: Optional[str] = None
+) -> dict:
+    """Collect the optional per-request pipeline settings"""
+    return {
+        "include_pdf": include_pdf,
+        "summary_mode": summary_mode or ai_api_secrets.SUMMARY_MODE,
+        "output_format": output_format,
+        "compression": compression or ai_api_secrets.OUTPUT_ZIP_COMPRESSION,
+        "windowing": {
+            "mode": windowing or ai_api_secrets.TRANSCRIPT_WINDOWING,
+            "window_tokens": window_tokens or ai_api_secrets.SUMMARY_WINDOW_TOKENS,
+            "snap_to_sentences": snap_to_sentences
+        }
+    }
+
+def validate_output_options(output_format: str, compression: str) -> Optional[JSONResponse]:
+    """Validate the requested output format and ZIP compression"""
+    if output_format not in OUTPUT_FORMATS:
+        return JSONResponse(
+            content={"message": f"Output format must be one of {', '.join(OUTPUT_FORMATS)}"},
+            status_code=400
+        )
+    if compression not in ZIP_COMPRESSION_METHODS:
+        return JSONResponse(
+            content={"message": f"Compression must be one of {', '.join(ZIP_COMPRESSION_METHODS)}"},
+            status_code=400
+        )
+    return None
+
+def validate_request(
+    uploaded_file: List[UploadFile],
+    number_of_questions: int,
+    options: dict
+) -> Optional[JSONResponse]:
+    """Validate the request form, returning an error response if it is invalid"""
+    if number_of_questions < 3 or number_of_questions > 21:
+        return JSONResponse(
+            content={"message": "Number must be between 3 and 21"},
+            status_code=400
+        )
+    if number_of_questions % 3 != 0:
+        return JSONResponse(
+            content={"message": "Number must be divisible by 3"},
+            status_code=400
+        )
+    if not uploaded_file or len(uploaded_file) == 0:
+        return JSONResponse(
+            content={"message": "No files uploaded"},
+            status_code=400
+        )
+    if options["windowing"]["mode"] not in WINDOWING_MODES:
+        return JSONResponse(
+            content={"message": f"Windowing must be one of {', '.join(WINDOWING_MODES)}"},
+            status_code=400
+        )
+    if options["windowing"]["window_tokens"] < ai_api_secrets.MIN_SUMMARY_WINDOW_TOKENS:
+        return JSONResponse(
+            content={"message": f"Window tokens must be at least {ai_api_secrets.MIN_SUMMARY_WINDOW_TOKENS}"},
+            status_code=400
+        )
+    if options["summary_mode"] not in SUMMARY_MODES:
+        return JSONResponse(
+            content={"message": f"Summary mode must be one of {', '.join(SUMMARY_MODES)}"},
+            status_code=400
+        )
+    output_error = validate_output_options(options["output_format"], options["compression"])
+    if output_error is not None:
+        return output_error
+    for upload in uploaded_file:
+        if upload.content_type != "video/mp4":
             return JSONResponse(
-                content={"message": "No files uploaded"},
+                content={
+                    "message": f"Invalid file type for {upload.filename}. Upload MP4 only."
+                },
                 status_code=400
             )
+    return None
+
+def admission_rejected_response(err: AdmissionRejected) -> JSONResponse:
+    """429/503 with Retry-After for a request turned away by admission control"""
+    return JSONResponse(
+        content={"message": err.reason, "retry_after": err.retry_after},
+        status_code=err.status_code,
+        headers={"Retry-After": str(err.retry_after)}
+    )
+
+async def save_uploaded_videos(uploaded_file: List[UploadFile], all_paths: dict) -> List[dict]:
+    """Stream every uploaded video into the request workspace"""
+    try:
+        videos = []
+        for i, upload in enumerate(uploaded_file):
+            video_target = all_paths["input_video_dir"] / f"input_{i}.mp4"
+            # Returns the path plus the size and SHA-256 computed while streaming
+            with STAGE_DURATION.time(stage="upload_save"):
+                video = await stream_upload_to_file(
+                    upload,
+                    video_target,
+                    max_bytes=ai_api_secrets.MAX_UPLOAD_MB * 1024 * 1024,
+                    chunk_size=ai_api_secrets.UPLOAD_CHUNK_SIZE_KB * 1024
+                )
+            # Container duration (header only) feeds the admission cost estimate
+            video["duration_seconds"] = await asyncio.to_thread(probe_media_duration_seconds, video_target)
+            videos.append(video)
+        return videos
+    except UploadTooLargeError:
+        raise
+    except Exception as err:
+        raise Exception(f"Upload saving failed: {err}")
+
+async def ingest_lecture(
+    lecture_idx: int,
+    video_path: Path,
+    all_paths: dict,
+    hinglish: bool,
+    chain_registry: dict,
+    options: dict,
+    video_hash: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None
+) -> List[str]:
+    """Extract, transcribe and window one uploaded video"""
+    try:
+        text_file_path = all_paths["input_text_dir"] / f"input_{lecture_idx}.txt"
         
-        # Initialize
-        all_paths = await paths()
-        (
-            summary_model,
-            cumulative_summary_model,
-            question_models,
-            selection_model
-        ) = init_models()
-        # Create chains
-        summary_chain = create_summary_chain(summary_model)
-        question_generation_chain = create_question_generation_chain(question_models)
-        question_selection_chain = create_question_selection_chain(selection_model)
-        cumulative_summary_chain = create_cumulative_summary_chain(cumulative_summary_model)
-        
-        # Process all videos to PDFs first
+        # Re-uploaded videos reuse their earlier transcript (not while recording
+        # or replaying, so transcription calls reach the cassette)
+        cache_key = None
+        cache_hit = False
+        if transcript_cache is not None and model_cassette is None:
+            video_hash = video_hash or await file_sha256(video_path)
+            cache_key = transcript_cache.cache_key(video_hash, hinglish)
+            cache_hit = await transcript_cache.get(cache_key, text_file_path)
         
+        async def _on_chunk(chunk_index: int, text: str):
+            await emit_progress(progress, "transcription_chunk", {
+                "lecture": lecture_idx + 1,
+                "chunk": chunk_index,
+                "text": text
+            })
         
-        lecture_pdfs = []
-        for i, upload in enumerate(uploaded_file):
-            if upload.content_type != "video/mp4":
-                return JSONResponse(
-                    content={
-                        "message": f"Invalid file type for {upload.filename}. Upload MP4 only."
-                    },
-                    status_code=400
+        if not cache_hit:
+            # One ffmpeg pass straight to speech-optimized, API-sized segments
+            with STAGE_DURATION.time(stage="speech_extraction"):
+                segment_paths = await video_to_speech_segments(
+                    video_path,
+                    output_dir=all_paths["input_audio_dir"],
+                    segment_seconds=(
+                        ai_api_secrets.SPEECH_SEGMENT_SECONDS_HINGLISH if hinglish
+                        else ai_api_secrets.SPEECH_SEGMENT_SECONDS
+                    ),
+                    bitrate=ai_api_secrets.SPEECH_AUDIO_BITRATE,
+                    sample_rate=ai_api_secrets.SPEECH_SAMPLE_RATE
                 )
-            
-            
-            
-            file_bytes = await upload.read()
-            video_target = all_paths["input_video_dir"] / f"input_{i}.mp4"
-            audio_target = all_paths["input_audio_dir"] / f"input_{i}.mp3"
-            text_file_path = all_paths["input_text_dir"] / f"input_{i}.txt"
-            pdf_path = all_paths["input_pdf_dir"] / f"lecture_{i + 1}.pdf"
-            
-            await write_file(video_target, file_bytes)
-            await video_to_audio(video_target, output_path=audio_target)
-            await audio_to_text(
-                path=audio_target,
+            # Transcription API calls are bounded process-wide inside segments_to_text
+            with STAGE_DURATION.time(stage="transcription"):
+                await segments_to_text(
+                    segment_paths=segment_paths,
+                    text_file_path=text_file_path,
+                    hinglish=hinglish,
+                    client=chain_registry["transcription_client"],
+                    on_chunk=_on_chunk,
+                    chunk_concurrency=ai_api_secrets.TRANSCRIPTION_CHUNK_CONCURRENCY
+                )
+            if cache_key is not None:
+                await transcript_cache.put(cache_key, text_file_path)
+        await emit_progress(progress, "transcription_done", {
+            "lecture": lecture_idx + 1,
+            "cached": cache_hit
+        })
+        with STAGE_DURATION.time(stage="windowing"):
+            pages = await window_transcript(
+                font_path=all_paths["font_path"],
                 text_file_path=text_file_path,
-                hinglish=hinglish
+                windowing_options=options["windowing"]
             )
-            await save_text_to_pdf(
-                text_file_path=text_file_path,
-                output_path=pdf_path,
-                font_path=all_paths["font_path"]
+        # The transcript PDF is only an output artifact now
+        if options["include_pdf"]:
+            with STAGE_DURATION.time(stage="pdf_render"):
+                await save_text_to_pdf(
+                    text_file_path=text_file_path,
+                    output_path=all_paths["lecture_pdfs_dir"] / f"lecture_{lecture_idx + 1}.pdf",
+                    font_path=all_paths["font_path"]
+                )
+        return pages
+    except Exception as err:
+        raise Exception(f"Ingestion failed for lecture {lecture_idx}: {err}")
+
+async def run_question_answer_pipeline(
+    all_paths: dict,
+    videos: List[dict],
+    number_of_questions: int,
+    hinglish: bool,
+    chain_registry: dict,
+    options: dict,
+    progress: Optional[ProgressCallback] = None
+) -> None:
+    """
+    Run the full pipeline for the saved videos, writing all outputs into the workspace.
+    
+    Each lecture is a chain of graph tasks (ingest -> summarize -> questions,
+    and summarize -> fold -> cumulative questions). Only the cumulative summary
+    fold depends on the previous lecture, so lecture N+1 is transcribed and
+    summarized while lecture N's questions are still being generated.
+    """
+    # Chains are shared across requests
+    summary_chain = chain_registry["summary_chain"]
+    question_generation_chain = chain_registry["question_generation_chain"]
+    question_selection_chain = chain_registry["question_selection_chain"]
+    cumulative_summary_chain = chain_registry["cumulative_summary_chain"]
+    
+    def ingest_task(lecture_idx: int, video: dict):
+        async def _ingest(_deps: dict) -> List[str]:
+            # Transcribe the video and split the transcript into summary windows
+            return await ingest_lecture(
+                lecture_idx=lecture_idx,
+                video_path=video["path"],
+                all_paths=all_paths,
+                hinglish=hinglish,
+                chain_registry=chain_registry,
+                options=options,
+                video_hash=video["sha256"],
+                progress=progress
             )
-            
-            lecture_pdfs.append(pdf_path)
-            
-        
-        # Process each lecture
-        
-        
-        all_previous_lecture_summary = ""
-        
-        for lecture_idx, lecture_pdf in enumerate(lecture_pdfs):
-            # Create lecture-specific split directory
-            lecture_split_dir = all_paths["split_pdf_dir"] / f"lecture_{lecture_idx + 1}"
-            await asyncio.to_thread(lecture_split_dir.mkdir, parents=True, exist_ok=True)
-            
+        return _ingest
+    
+    def summarize_task(lecture_idx: int):
+        async def _summarize(deps: dict) -> tuple:
             # Generate summaries for this lecture
-            lecture_concise, lecture_detailed = await process_single_lecture(
+            return await process_single_lecture(
                 lecture_idx=lecture_idx,
-                lecture_pdf_path=lecture_pdf,
-                split_pdf_dir=lecture_split_dir,
+                pages=deps[f"ingest_{lecture_idx}"],
                 summary_chain=summary_chain,
                 number_of_questions=number_of_questions,
-                lecture_summaries_dir=all_paths["lecture_summaries_dir"]
+                lecture_summaries_dir=all_paths["lecture_summaries_dir"],
+                lecture_stats_dir=all_paths["lecture_stats_dir"],
+                windowing_options=options["windowing"],
+                progress=progress,
+                summary_mode=options["summary_mode"],
+                concise_stitch_chain=chain_registry["concise_stitch_chain"],
+                context_digest_chain=chain_registry["context_digest_chain"]
             )
+        return _summarize
+    
+    def questions_task(lecture_idx: int):
+        async def _questions(deps: dict) -> None:
             # Generate lecture-specific questions
+            _, lecture_detailed = deps[f"summarize_{lecture_idx}"]
             lecture_questions = await generate_questions_for_lecture(
                 lecture_summary=lecture_detailed,
                 question_generation_chain=question_generation_chain,
@@ -418,63 +908,179 @@ async def QuestionAnswerGenerationModel(
                 all_paths["lecture_questions_dir"] / f"lecture_{lecture_idx + 1}_questions.json",
                 lecture_questions
             )
-            
-            
+            await emit_progress(progress, "lecture_questions_ready", {
+                "lecture": lecture_idx + 1,
+                "questions": lecture_questions
+            })
+        return _questions
+    
+    def fold_task(lecture_idx: int):
+        async def _fold(deps: dict) -> str:
             # Update cumulative summary
+            lecture_concise, _ = deps[f"summarize_{lecture_idx}"]
             if lecture_idx == 0:
                 all_previous_lecture_summary = lecture_concise
             else:
-                
-                cumulative_result = await cumulative_summary_chain.ainvoke({
-                    "previous_lectures_summary": all_previous_lecture_summary,
-                    "new_lecture_summary": lecture_concise,
-                    "lecture_number": lecture_idx + 1
-                })
+                with STAGE_DURATION.time(stage="cumulative_summary"):
+                    cumulative_result = await cumulative_summary_chain.ainvoke({
+                        "previous_lectures_summary": deps[f"fold_{lecture_idx - 1}"],
+                        "new_lecture_summary": lecture_concise,
+                        "lecture_number": lecture_idx + 1
+                    })
                 all_previous_lecture_summary = cumulative_result["combined_summary"]
             
-            # Save cumulative summary
+            # Save cumulative summary (folds run in lecture order, so the last one wins)
             await write_file(
                 all_paths["all_previous_lecture_summary_file"],
                 all_previous_lecture_summary
             )
+            await emit_progress(progress, "cumulative_summary_ready", {
+                "lecture": lecture_idx + 1,
+                "summary": all_previous_lecture_summary
+            })
+            return all_previous_lecture_summary
+        return _fold
+    
+    def cumulative_questions_task(lecture_idx: int):
+        async def _cumulative_questions(deps: dict) -> None:
+            cumulative_questions = await generate_questions_for_lecture(
+                lecture_summary=deps[f"fold_{lecture_idx}"],
+                question_generation_chain=question_generation_chain,
+                question_selection_chain=question_selection_chain,
+                number_of_questions=number_of_questions
+            )
             
-            # Generate cumulative questions (from lecture 2 onwards)
-            if lecture_idx > 0:
-                cumulative_questions = await generate_questions_for_lecture(
-                    lecture_summary=all_previous_lecture_summary,
-                    question_generation_chain=question_generation_chain,
-                    question_selection_chain=question_selection_chain,
-                    number_of_questions=number_of_questions
-                )
-                
-                await write_file(
-                    all_paths["cumulative_questions_dir"] / f"cumulative_lectures_1_to_{lecture_idx + 1}_questions.json",
-                    cumulative_questions
-                )
-                
-        
-        # Create ZIP and return
-        
-        zip_buffer = io.BytesIO()
-        zip_buffer = await asyncio.to_thread(create_zip_sync, all_paths, zip_buffer)
-        zip_buffer.seek(0)
+            await write_file(
+                all_paths["cumulative_questions_dir"] / f"cumulative_lectures_1_to_{lecture_idx + 1}_questions.json",
+                cumulative_questions
+            )
+            await emit_progress(progress, "cumulative_questions_ready", {
+                "lectures": f"1_to_{lecture_idx + 1}",
+                "questions": cumulative_questions
+            })
+        return _cumulative_questions
+    
+    graph = TaskGraph()
+    for lecture_idx, video in enumerate(videos):
+        graph.add(f"ingest_{lecture_idx}", ingest_task(lecture_idx, video))
+        graph.add(f"summarize_{lecture_idx}", summarize_task(lecture_idx), deps=[f"ingest_{lecture_idx}"])
+        graph.add(f"questions_{lecture_idx}", questions_task(lecture_idx), deps=[f"summarize_{lecture_idx}"])
+        fold_deps = [f"summarize_{lecture_idx}"]
+        if lecture_idx > 0:
+            fold_deps.append(f"fold_{lecture_idx - 1}")
+        graph.add(f"fold_{lecture_idx}", fold_task(lecture_idx), deps=fold_deps)
+        # Cumulative questions (from lecture 2 onwards)
+        if lecture_idx > 0:
+            graph.add(
+                f"cumulative_questions_{lecture_idx}",
+                cumulative_questions_task(lecture_idx),
+                deps=[f"fold_{lecture_idx}"]
+            )
+    
+    with STAGE_DURATION.time(stage="pipeline"):
+        await graph.run()
+    # Task start/end offsets show how much the lectures overlapped
+    await write_file(all_paths["lecture_stats_dir"] / "pipeline_schedule.json", graph.timings)
+
+async def build_output_response(
+    all_paths: dict,
+    output_format: str = "zip",
+    compression: str = "stored",
+    background: Optional[BackgroundTask] = None
+):
+    """Return the workspace outputs as a streamed ZIP, NDJSON or a single JSON document"""
+    entries = await asyncio.to_thread(collect_output_entries, all_paths)
+    
+    if output_format == "json":
+        with STAGE_DURATION.time(stage="output"):
+            files = await asyncio.to_thread(lambda: [read_output_entry(*entry) for entry in entries])
+        return JSONResponse(content={"files": files}, status_code=200, background=background)
+    
+    if output_format == "ndjson":
+        return StreamingResponse(
+            timed_iterator(iter_ndjson_stream(entries), stage="output"),
+            media_type="application/x-ndjson",
+            status_code=200,
+            background=background
+        )
+    
+    # Entries are compressed and sent as they are produced
+    return StreamingResponse(
+        timed_iterator(iter_zip_stream(entries, compression), stage="output"),
+        media_type="application/x-zip-compressed",
+        headers={"Content-Disposition": "attachment; filename=lecture_questions_and_summaries.zip"},
+        status_code=200,
+        background=background
+    )
+
+async def QuestionAnswerGenerationModel(
+    request: Request,
+    uploaded_file: List[UploadFile] = File(...),
+    number_of_questions: int = Form(...),
+    hinglish: bool = Form(...),
+    include_pdf: bool = Form(False),
+    windowing: Optional[str] = Form(None),
+    window_tokens: Optional[int] = Form(None),
+    snap_to_sentences: bool = Form(True),
+    output_format: str = Form("zip"),
+    compression: Optional[str] = Form(None),
+    summary_mode: Optional[str] = Form(None)
+):
+    """Main API endpoint for question generation from multiple video lectures"""
+    all_paths = None
+    try:
+        # Validation
+        options = build_pipeline_options(
+            include_pdf=include_pdf,
+            windowing=windowing,
+            window_tokens=window_tokens,
+            snap_to_sentences=snap_to_sentences,
+            output_format=output_format,
+            compression=compression,
+            summary_mode=summary_mode
+        )
+        invalid_response = validate_request(uploaded_file, number_of_questions, options)
+        if invalid_response is not None:
+            return invalid_response
         
-        await cleanup(all_paths)
+        # Turn requests away early when the queue is already full
+        admission_controller.check_capacity()
         
+        # Initialize
+        all_paths = await paths()
+        videos = await save_uploaded_videos(uploaded_file, all_paths)
         
+        # Wait for a pipeline slot (or be rejected if too much work is admitted)
+        async with admission_controller.reserve(estimate_job_cost(videos)):
+            await run_question_answer_pipeline(
+                all_paths=all_paths,
+                videos=videos,
+                number_of_questions=number_of_questions,
+                hinglish=hinglish,
+                chain_registry=get_chain_registry(request),
+                options=options
+            )
         
-        return StreamingResponse(
-            zip_buffer,
-            media_type="application/x-zip-compressed",
-            headers={"Content-Disposition": "attachment; filename=lecture_questions_and_summaries.zip"},
-            status_code=200
+        # Stream outputs back; the workspace is removed once the response is sent
+        return await build_output_response(
+            all_paths,
+            output_format=options["output_format"],
+            compression=options["compression"],
+            background=BackgroundTask(cleanup, all_paths)
         )
         
+    except UploadTooLargeError as err:
+        await cleanup(all_paths)
+        return JSONResponse(content={"message": str(err)}, status_code=413)
+    except AdmissionRejected as err:
+        if all_paths is not None:
+            await cleanup(all_paths)
+        return admission_rejected_response(err)
     except Exception as err:
         
-        await cleanup(all_paths)
+        if all_paths is not None:
+            await cleanup(all_paths)
         return JSONResponse(
             content={"message": "Processing failed", "error": str(err)},
             status_code=500
         )
-    
\ No newline at end of file
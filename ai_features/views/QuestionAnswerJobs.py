@@ -0,0 +1,141 @@
+import uuid
+from typing import List, Optional
+from fastapi import Request, UploadFile, File, Form
+from core.config import ai_api_secrets
+from fastapi.responses import JSONResponse
+from helper_function.job_manager import job_manager, JOB_COMPLETED
+from helper_function.upload_streaming import UploadTooLargeError
+from helper_function.admission_control import AdmissionRejected, admission_controller, estimate_job_cost
+from ai_features.views.QuestionAnswerGenerationModel import (
+    paths,
+    cleanup,
+    validate_request,
+    build_pipeline_options,
+    build_output_response,
+    validate_output_options,
+    get_chain_registry,
+    save_uploaded_videos,
+    cleanup_intermediates,
+    admission_rejected_response,
+    run_question_answer_pipeline
+)
+
+async def SubmitQuestionAnswerJob(
+    request: Request,
+    uploaded_file: List[UploadFile] = File(...),
+    number_of_questions: int = Form(...),
+    hinglish: bool = Form(...),
+    include_pdf: bool = Form(False),
+    windowing: Optional[str] = Form(None),
+    window_tokens: Optional[int] = Form(None),
+    snap_to_sentences: bool = Form(True),
+    summary_mode: Optional[str] = Form(None)
+):
+    """Save the uploads and queue the pipeline as a background job"""
+    all_paths = None
+    try:
+        options = build_pipeline_options(
+            include_pdf=include_pdf,
+            windowing=windowing,
+            window_tokens=window_tokens,
+            snap_to_sentences=snap_to_sentences,
+            summary_mode=summary_mode
+        )
+        invalid_response = validate_request(uploaded_file, number_of_questions, options)
+        if invalid_response is not None:
+            return invalid_response
+        
+        # Turn requests away early when the queue is already full
+        admission_controller.check_capacity()
+        
+        # The job id doubles as the workspace directory name
+        job_id = str(uuid.uuid4())
+        all_paths = await paths(job_id)
+        # Uploads are only readable while the request is open
+        videos = await save_uploaded_videos(uploaded_file, all_paths)
+        chain_registry = get_chain_registry(request)
+        ticket = admission_controller.reserve(estimate_job_cost(videos))
+        
+        async def _job():
+            try:
+                async with ticket:
+                    await run_question_answer_pipeline(
+                        all_paths=all_paths,
+                        videos=videos,
+                        number_of_questions=number_of_questions,
+                        hinglish=hinglish,
+                        chain_registry=chain_registry,
+                        options=options
+                    )
+            finally:
+                await cleanup_intermediates(all_paths)
+        
+        # The reservation is returned even if the job is cancelled before it starts
+        job = job_manager.submit(job_id, _job, all_paths, on_finished=ticket.release)
+        return JSONResponse(content=job_manager.public_view(job), status_code=202)
+    except UploadTooLargeError as err:
+        await cleanup(all_paths)
+        return JSONResponse(content={"message": str(err)}, status_code=413)
+    except AdmissionRejected as err:
+        if all_paths is not None:
+            await cleanup(all_paths)
+        return admission_rejected_response(err)
+    except Exception as err:
+        if all_paths is not None:
+            await cleanup(all_paths)
+        return JSONResponse(
+            content={"message": "Job submission failed", "error": str(err)},
+            status_code=500
+        )
+
+async def GetQuestionAnswerJobStatus(job_id: str):
+    """Return the current state of a background job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(content={"message": "Job not found"}, status_code=404)
+    return JSONResponse(content=job_manager.public_view(job), status_code=200)
+
+async def DownloadQuestionAnswerJob(
+    job_id: str,
+    output_format: str = "zip",
+    compression: Optional[str] = None
+):
+    """Download the outputs of a completed job as ZIP, JSON or NDJSON"""
+    try:
+        compression = compression or ai_api_secrets.OUTPUT_ZIP_COMPRESSION
+        invalid_response = validate_output_options(output_format, compression)
+        if invalid_response is not None:
+            return invalid_response
+        job = job_manager.get(job_id)
+        if job is None:
+            return JSONResponse(content={"message": "Job not found"}, status_code=404)
+        if job["status"] != JOB_COMPLETED:
+            return JSONResponse(
+                content={"message": f"Job is {job['status']}", "error": job["error"]},
+                status_code=409
+            )
+        return await build_output_response(
+            job["all_paths"],
+            output_format=output_format,
+            compression=compression
+        )
+    except Exception as err:
+        return JSONResponse(
+            content={"message": "Download failed", "error": str(err)},
+            status_code=500
+        )
+
+async def DeleteQuestionAnswerJob(job_id: str):
+    """Cancel a job if needed and remove its workspace"""
+    try:
+        # Waits for a running job to stop before its workspace is deleted
+        job = await job_manager.remove(job_id)
+        if job is None:
+            return JSONResponse(content={"message": "Job not found"}, status_code=404)
+        await cleanup(job["all_paths"])
+        return JSONResponse(content={"message": "Job deleted"}, status_code=200)
+    except Exception as err:
+        return JSONResponse(
+            content={"message": "Job deletion failed", "error": str(err)},
+            status_code=500
+        )
@@ -0,0 +1,125 @@
+import asyncio
+from typing import List, Optional
+from fastapi import Request, UploadFile, File, Form
+from starlette.background import BackgroundTask
+from fastapi.responses import JSONResponse, StreamingResponse
+from helper_function.upload_streaming import UploadTooLargeError
+from helper_function.admission_control import AdmissionRejected, admission_controller, estimate_job_cost
+from helper_function.progress_events import STREAM_FORMATS, ProgressStream, format_event
+from ai_features.views.QuestionAnswerGenerationModel import (
+    paths,
+    cleanup,
+    validate_request,
+    get_chain_registry,
+    save_uploaded_videos,
+    build_pipeline_options,
+    admission_rejected_response,
+    run_question_answer_pipeline
+)
+
+async def QuestionAnswerGenerationStream(
+    request: Request,
+    uploaded_file: List[UploadFile] = File(...),
+    number_of_questions: int = Form(...),
+    hinglish: bool = Form(...),
+    windowing: Optional[str] = Form(None),
+    window_tokens: Optional[int] = Form(None),
+    snap_to_sentences: bool = Form(True),
+    summary_mode: Optional[str] = Form(None),
+    stream_format: str = Form("sse")
+):
+    """Run the pipeline and stream each stage's artifacts as Server-Sent Events or NDJSON"""
+    all_paths = None
+    try:
+        options = build_pipeline_options(
+            windowing=windowing,
+            window_tokens=window_tokens,
+            snap_to_sentences=snap_to_sentences,
+            summary_mode=summary_mode
+        )
+        invalid_response = validate_request(uploaded_file, number_of_questions, options)
+        if invalid_response is not None:
+            return invalid_response
+        if stream_format not in STREAM_FORMATS:
+            return JSONResponse(
+                content={"message": f"Stream format must be one of {', '.join(STREAM_FORMATS)}"},
+                status_code=400
+            )
+        
+        # Turn requests away early when the queue is already full
+        admission_controller.check_capacity()
+        
+        all_paths = await paths()
+        # Uploads are only readable before the response starts
+        videos = await save_uploaded_videos(uploaded_file, all_paths)
+        chain_registry = get_chain_registry(request)
+        # Rejections must happen before the 200 stream starts
+        ticket = admission_controller.reserve(estimate_job_cost(videos))
+    except UploadTooLargeError as err:
+        await cleanup(all_paths)
+        return JSONResponse(content={"message": str(err)}, status_code=413)
+    except AdmissionRejected as err:
+        if all_paths is not None:
+            await cleanup(all_paths)
+        return admission_rejected_response(err)
+    except Exception as err:
+        if all_paths is not None:
+            await cleanup(all_paths)
+        return JSONResponse(
+            content={"message": "Processing failed", "error": str(err)},
+            status_code=500
+        )
+    
+    progress = ProgressStream()
+    
+    async def _run():
+        try:
+            async with ticket:
+                await run_question_answer_pipeline(
+                    all_paths=all_paths,
+                    videos=videos,
+                    number_of_questions=number_of_questions,
+                    hinglish=hinglish,
+                    chain_registry=chain_registry,
+                    options=options,
+                    progress=progress
+                )
+            await progress("completed", {"request_id": all_paths["request_id"]})
+        except Exception as err:
+            await progress("error", {"message": "Processing failed", "error": str(err)})
+        finally:
+            await progress.close()
+    
+    pipeline_tasks = []
+    finished = False
+    
+    async def _finish():
+        # Runs from the stream's finally and from the response's background
+        # task; the latter also covers a client that left before the first chunk
+        nonlocal finished
+        if finished:
+            return
+        finished = True
+        for task in pipeline_tasks:
+            task.cancel()
+        await asyncio.gather(*pipeline_tasks, return_exceptions=True)
+        ticket.release()
+        await cleanup(all_paths)
+    
+    async def _event_stream():
+        pipeline_tasks.append(asyncio.create_task(_run()))
+        try:
+            async for event, payload in progress.events():
+                yield format_event(event, payload, stream_format)
+        finally:
+            # Client went away or the pipeline finished
+            await _finish()
+    
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _event_stream(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        status_code=200,
+        background=BackgroundTask(_finish)
+    )
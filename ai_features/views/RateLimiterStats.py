@@ -0,0 +1,12 @@
+from fastapi.responses import JSONResponse
+from helper_function.rate_limiter import rate_limiter_stats
+
+async def RateLimiterStats():
+    """Per-provider request counts, queue waits and retries of the shared rate limiters"""
+    try:
+        return JSONResponse(content={"providers": rate_limiter_stats()}, status_code=200)
+    except Exception as err:
+        return JSONResponse(
+            content={"message": "Rate limiter stats failed", "error": str(err)},
+            status_code=500
+        )
@@ -0,0 +1,92 @@
+"""
+Per-request model/chain setup cost: init_models() + create_*_chain on every
+request (old behaviour) versus a lookup in the app-wide chain registry.
+
+Runs offline; dummy API keys are set so the clients can be constructed.
+
+    python -m benchmarks.bench_model_registry --requests 50
+"""
+import os
+import json
+import time
+import argparse
+import statistics
+
+for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY", "GOOGLE_API_KEY", "LANGCHAIN_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+os.environ.setdefault("LANGCHAIN_PROJECT", "bench")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+from ai_features.views.QuestionAnswerGenerationModel import (
+    init_models,
+    build_chain_registry,
+    create_summary_chain,
+    create_concise_stitch_chain,
+    create_context_digest_chain,
+    create_shared_http_client,
+    create_question_selection_chain,
+    create_cumulative_summary_chain,
+    create_question_generation_chain
+)
+
+def per_request_setup():
+    """What every request used to do before the pipeline could start"""
+    (
+        summary_model,
+        cumulative_summary_model,
+        question_models,
+        selection_model,
+        stitch_model,
+        digest_model
+    ) = init_models()
+    return (
+        create_summary_chain(summary_model),
+        create_question_generation_chain(question_models),
+        create_question_selection_chain(selection_model),
+        create_cumulative_summary_chain(cumulative_summary_model),
+        create_concise_stitch_chain(stitch_model),
+        create_context_digest_chain(digest_model)
+    )
+
+def registry_lookup(chain_registry):
+    """What every request does now"""
+    return (
+        chain_registry["summary_chain"],
+        chain_registry["question_generation_chain"],
+        chain_registry["question_selection_chain"],
+        chain_registry["cumulative_summary_chain"],
+        chain_registry["concise_stitch_chain"],
+        chain_registry["context_digest_chain"]
+    )
+
+def _time_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.mean(samples), 4),
+        "p50_ms": round(statistics.median(samples), 4),
+        "max_ms": round(max(samples), 4)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    chain_registry = build_chain_registry(create_shared_http_client())
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    results = {
+        "requests": args.requests,
+        "registry_startup_ms": round(startup_ms, 4),
+        "before_per_request": _time_ms(per_request_setup, args.requests),
+        "after_per_request": _time_ms(lambda: registry_lookup(chain_registry), args.requests)
+    }
+    print(json.dumps(results, indent=4))
+
+if __name__ == "__main__":
+    main()
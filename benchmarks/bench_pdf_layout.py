@@ -0,0 +1,134 @@
+"""
+Transcript layout and PDF rendering time on long synthetic transcripts.
+
+- layout: the old layout (re-measuring the whole growing line for every
+  word) versus PdfRenderContext.layout_lines() (memoized word widths,
+  additive line width)
+- render: the old per-lecture setup (parse and register the TTF on every
+  render) versus the shared rendering context, for a batch of lectures
+
+Runs offline; dummy API keys are set so the app settings load.
+
+    python -m benchmarks.bench_pdf_layout --minutes 180 --words-per-minute 150 --lectures 10
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY", "GOOGLE_API_KEY", "LANGCHAIN_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+os.environ.setdefault("LANGCHAIN_PROJECT", "bench")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from helper_function.video_to_pdf_function import (
+    PDF_FONT_SIZE,
+    PdfRenderContext,
+    get_render_context,
+    save_texts_to_pdf
+)
+
+FONT_PATH = Path(__file__).resolve().parent.parent / "font" / "Poppins-Regular.ttf"
+MAX_WIDTH = 580 - 2 * 20
+
+def _synthetic_transcript(words: int, seed: int) -> str:
+    """Zipf-like word frequencies over a lecture-sized vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 11)))
+        for _ in range(8000)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return " ".join(rng.choices(vocabulary, weights=weights, k=words))
+
+def _layout_lines_quadratic(text: str, max_width: float, font_name: str) -> list:
+    """Previous implementation, kept here as the baseline"""
+    lines = []
+    current_line = []
+    for word in text.split():
+        test_line = ' '.join(current_line + [word])
+        if pdfmetrics.stringWidth(test_line, font_name, PDF_FONT_SIZE) > max_width:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+        else:
+            current_line.append(word)
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=180)
+    parser.add_argument("--words-per-minute", type=int, default=150)
+    parser.add_argument("--lectures", type=int, default=10, help="Lecture PDFs per render batch")
+    parser.add_argument("--lecture-minutes", type=int, default=10, help="Length of each batched lecture")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    context = get_render_context(FONT_PATH)
+    words = args.minutes * args.words_per_minute
+    text = _synthetic_transcript(words, args.seed)
+
+    old_lines, old_seconds = _timed(_layout_lines_quadratic, text, MAX_WIDTH, context.font_name)
+    new_lines, new_seconds = _timed(context.layout_lines, text, MAX_WIDTH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        jobs = []
+        for i in range(args.lectures):
+            text_file = tmp / f"input_{i}.txt"
+            text_file.write_text(
+                _synthetic_transcript(args.lecture_minutes * args.words_per_minute, args.seed + i + 1),
+                encoding="utf-8"
+            )
+            jobs.append((text_file, tmp / f"lecture_{i + 1}.pdf"))
+
+        # Old path: every lecture re-parsed and re-registered the TTF
+        start = time.perf_counter()
+        for text_file, output_path in jobs:
+            pdfmetrics.registerFont(TTFont(context.font_name, str(FONT_PATH)))
+            PdfRenderContext(FONT_PATH).render_pdf(text_file.read_text("utf-8"), output_path)
+        per_call_font_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(save_texts_to_pdf(FONT_PATH, jobs))
+        shared_context_seconds = time.perf_counter() - start
+
+        long_text_file = tmp / "long.txt"
+        long_text_file.write_text(text, encoding="utf-8")
+        start = time.perf_counter()
+        asyncio.run(save_texts_to_pdf(FONT_PATH, [(long_text_file, tmp / "long.pdf")]))
+        long_render_seconds = time.perf_counter() - start
+        pdf_bytes = (tmp / "long.pdf").stat().st_size
+
+    print(json.dumps({
+        "words": words,
+        "lines": len(new_lines),
+        "identical_lines": old_lines == new_lines,
+        "layout_seconds": {
+            "quadratic": round(old_seconds, 3),
+            "linear": round(new_seconds, 3),
+            "speedup": round(old_seconds / new_seconds, 1) if new_seconds else None
+        },
+        "long_render_seconds": round(long_render_seconds, 3),
+        "long_pdf_bytes": pdf_bytes,
+        "batch_render_seconds": {
+            "lectures": args.lectures,
+            "font_per_render": round(per_call_font_seconds, 3),
+            "shared_context": round(shared_context_seconds, 3)
+        }
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+End-to-end pipeline benchmark with no external APIs: the
+LactureQuestionAnswerGenerationModel endpoint is driven in-process on
+synthetic videos, with fake structured models and a fake audio client
+injected into the chain registry (see benchmarks/offline_providers.py).
+
+Each concurrency level runs in a fresh subprocess so peak RSS is per level.
+Reports wall time, per-request latency, per-stage breakdown (from the
+/metrics histograms), peak RSS and HTTP status counts as JSON, tagged with
+the current commit so runs can be compared.
+
+    python -m benchmarks.bench_pipeline_offline --lectures 2 --video-seconds 300 --concurrency 1 2 4
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+
+# Keep every run cold and unthrottled: caches would hide the pipeline and the
+# fakes have no provider quota to protect
+BENCH_ENV = {
+    "TRANSCRIPT_CACHE_ENABLED": "false",
+    "LLM_CACHE_ENABLED": "false",
+    "PROVIDER_RATE_LIMITS": "{}",
+    "LANGCHAIN_TRACING_V2": "false"
+}
+
+# Settings are validated on import, before any provider is replaced by a fake
+for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY", "GOOGLE_API_KEY", "LANGCHAIN_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+os.environ.setdefault("LANGCHAIN_PROJECT", "bench")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+async def _run_level(args, videos) -> dict:
+    import httpx
+    from fastapi import FastAPI
+    from helper_function.metrics import STAGE_DURATION
+    from ai_features.aiFeatureRoutes import aiFeatureRoutes
+    from benchmarks.offline_providers import FakeAudioClient, fake_models
+    from ai_features.views.QuestionAnswerGenerationModel import build_chain_registry, close_chain_registry
+
+    app = FastAPI()
+    app.include_router(aiFeatureRoutes)
+    app.state.chain_registry = build_chain_registry(
+        models=fake_models(
+            latency=args.llm_latency,
+            jitter=args.jitter,
+            failure_rate=args.llm_failure_rate,
+            seed=args.seed
+        ),
+        transcription_client=FakeAudioClient(
+            latency=args.audio_latency,
+            jitter=args.jitter,
+            failure_rate=args.audio_failure_rate,
+            seed=args.seed
+        )
+    )
+
+    async def _request(client: httpx.AsyncClient) -> dict:
+        files = [
+            ("uploaded_file", (video.name, video.open("rb"), "video/mp4"))
+            for video in videos
+        ]
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/Ai_Features/LactureQuestionAnswerGenerationModel",
+                data={"number_of_questions": str(args.questions), "hinglish": "false"},
+                files=files
+            )
+        finally:
+            for _, (_, handle, _) in files:
+                handle.close()
+        return {
+            "status": response.status_code,
+            "seconds": time.perf_counter() - start,
+            "bytes": len(response.content)
+        }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[_request(client) for _ in range(args.level)])
+        wall_seconds = time.perf_counter() - start
+    await close_chain_registry(app.state.chain_registry)
+
+    latencies = [r["seconds"] for r in responses]
+    statuses = {}
+    for r in responses:
+        statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    stages = {
+        labels[0]: {"count": value["count"], "total_seconds": round(value["sum"], 3)}
+        for labels, value in sorted(STAGE_DURATION.snapshot().items())
+    }
+    return {
+        "concurrency": args.level,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_requests_per_minute": round(args.level / wall_seconds * 60, 3),
+        "latency_seconds": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p50": round(statistics.median(latencies), 3),
+            "max": round(max(latencies), 3)
+        },
+        "statuses": statuses,
+        "stages": stages,
+        "peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_SELF), 1),
+        "peak_child_rss_mb": round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1)
+    }
+
+def _child(args) -> None:
+    videos = [Path(path) for path in args.videos]
+    print(json.dumps(asyncio.run(_run_level(args, videos))))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lectures", type=int, default=2)
+    parser.add_argument("--video-seconds", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--questions", type=int, default=9)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--audio-latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--audio-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the JSON results to this file")
+    parser.add_argument("--level", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--videos", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.level is not None:
+        _child(args)
+        return
+
+    from benchmarks.offline_providers import make_synthetic_video
+
+    env = {**os.environ, **BENCH_ENV}
+
+    forwarded = [
+        "--questions", str(args.questions),
+        "--llm-latency", str(args.llm_latency),
+        "--audio-latency", str(args.audio_latency),
+        "--jitter", str(args.jitter),
+        "--llm-failure-rate", str(args.llm_failure_rate),
+        "--audio-failure-rate", str(args.audio_failure_rate),
+        "--seed", str(args.seed)
+    ]
+    levels = []
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = [
+            make_synthetic_video(Path(tmp) / f"lecture_{i + 1}.mp4", args.video_seconds)
+            for i in range(args.lectures)
+        ]
+        for level in args.concurrency:
+            output = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_pipeline_offline",
+                    "--level", str(level), "--videos", *map(str, videos), *forwarded
+                ],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True
+            ).stdout
+            levels.append(json.loads(output.strip().splitlines()[-1]))
+
+    results = {
+        "commit": _git_commit(),
+        "lectures": args.lectures,
+        "video_seconds": args.video_seconds,
+        "questions": args.questions,
+        "llm_latency": args.llm_latency,
+        "audio_latency": args.audio_latency,
+        "jitter": args.jitter,
+        "llm_failure_rate": args.llm_failure_rate,
+        "audio_failure_rate": args.audio_failure_rate,
+        "levels": levels
+    }
+    print(json.dumps(results, indent=4))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Page summarization wall-clock and prompt-token cost: the sequential running
+summary (every page waits for the one before it) versus the parallel
+map-reduce mode (concurrent page summaries plus one stitching call).
+
+Runs offline with fake chains whose latency grows with prompt size, so the
+numbers show the shape of the trade-off rather than real provider timings.
+
+    python -m benchmarks.bench_summary_modes --pages 30 --fanout 8
+"""
+import os
+import json
+import time
+import asyncio
+import tempfile
+import argparse
+from pathlib import Path
+
+for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY", "GOOGLE_API_KEY", "LANGCHAIN_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+os.environ.setdefault("LANGCHAIN_PROJECT", "bench")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+from core.config import ai_api_secrets
+from ai_features.views.QuestionAnswerGenerationModel import (
+    SUMMARY_MODE_PARALLEL,
+    SUMMARY_MODE_SEQUENTIAL,
+    process_single_lecture
+)
+
+class FakeSummaryChain:
+    """Stands in for summary_prompt | structured model"""
+    def __init__(self, base_latency: float, seconds_per_kchar: float):
+        self.base_latency = base_latency
+        self.seconds_per_kchar = seconds_per_kchar
+
+    async def ainvoke(self, inputs: dict) -> dict:
+        prompt_chars = len(inputs["page_text"]) + len(inputs["cumulative_concise_summary"])
+        await asyncio.sleep(self.base_latency + self.seconds_per_kchar * prompt_chars / 1000)
+        return {
+            "concise_page_summary": "Concise summary sentence. " * 8,
+            "detail_page_summary": "Detailed summary sentence. " * 30
+        }
+
+class FakeStitchChain(FakeSummaryChain):
+    """Stands in for concise_stitch_prompt | structured model"""
+    async def ainvoke(self, inputs: dict) -> dict:
+        await asyncio.sleep(self.base_latency + self.seconds_per_kchar * len(inputs["page_summaries"]) / 1000)
+        return {
+            "stitched_page_summaries": [
+                "Stitched summary sentence. " * 8 for _ in range(inputs["number_of_pages"])
+            ]
+        }
+
+async def _run_mode(summary_mode: str, pages: list, args, work_dir: Path) -> dict:
+    summary_chain = FakeSummaryChain(args.base_latency, args.seconds_per_kchar)
+    stitch_chain = FakeStitchChain(args.base_latency, args.seconds_per_kchar)
+    mode_dir = work_dir / summary_mode
+    mode_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    await process_single_lecture(
+        lecture_idx=0,
+        pages=pages,
+        summary_chain=summary_chain,
+        number_of_questions=9,
+        lecture_summaries_dir=mode_dir,
+        lecture_stats_dir=mode_dir,
+        windowing_options={"mode": "page"},
+        summary_mode=summary_mode,
+        concise_stitch_chain=stitch_chain
+    )
+    wall_seconds = time.perf_counter() - start
+
+    stats = json.loads((mode_dir / "lecture_1_summary_stats.json").read_text())
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "summary_calls": stats["summary_calls"],
+        "prompt_tokens": stats["prompt_tokens"],
+        "stitch_prompt_tokens": stats["stitch_prompt_tokens"]
+    }
+
+async def _main(args) -> dict:
+    ai_api_secrets.SUMMARY_PARALLEL_FANOUT = args.fanout
+    pages = [("Lecture transcript sentence about the topic. " * 60) for _ in range(args.pages)]
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        return {
+            "pages": args.pages,
+            "fanout": args.fanout,
+            SUMMARY_MODE_SEQUENTIAL: await _run_mode(SUMMARY_MODE_SEQUENTIAL, pages, args, work_dir),
+            SUMMARY_MODE_PARALLEL: await _run_mode(SUMMARY_MODE_PARALLEL, pages, args, work_dir)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--seconds-per-kchar", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_main(args)), indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Peak RSS while saving one uploaded video: the old `await upload.read()` +
+write_file() path versus stream_upload_to_file().
+
+Each (mode, size) pair runs in a fresh subprocess so ru_maxrss is not
+shared between measurements.
+
+    python -m benchmarks.bench_upload_rss --sizes-mb 64 256 1024
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+MODES = ("read_all", "stream")
+
+# The child imports the app settings, which need provider keys to validate
+CHILD_ENV = {
+    **{
+        key: "bench-dummy-key"
+        for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY", "GOOGLE_API_KEY", "LANGCHAIN_API_KEY")
+    },
+    "LANGCHAIN_PROJECT": "bench",
+    "LANGCHAIN_TRACING_V2": "false"
+}
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _make_source(size_mb: int, directory: Path) -> Path:
+    source = directory / f"source_{size_mb}mb.bin"
+    block = os.urandom(1024 * 1024)
+    with source.open("wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+    return source
+
+async def _save(mode: str, source: Path, target: Path) -> None:
+    from fastapi import UploadFile
+    from helper_function.video_to_pdf_function import write_file
+    from helper_function.upload_streaming import stream_upload_to_file
+
+    with source.open("rb") as f:
+        upload = UploadFile(file=f, filename=source.name)
+        if mode == "read_all":
+            await write_file(target, await upload.read())
+        else:
+            await stream_upload_to_file(upload, target)
+
+def _child(mode: str, source: str, target: str) -> None:
+    baseline_mb = _peak_rss_mb()
+    asyncio.run(_save(mode, Path(source), Path(target)))
+    print(json.dumps({"baseline_rss_mb": round(baseline_mb, 1), "peak_rss_mb": round(_peak_rss_mb(), 1)}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "SOURCE", "TARGET"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    env = {**CHILD_ENV, **os.environ}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for size_mb in args.sizes_mb:
+            source = _make_source(size_mb, tmp_dir)
+            for mode in MODES:
+                target = tmp_dir / f"target_{mode}.bin"
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_upload_rss", "--child", mode, str(source), str(target)],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                    text=True
+                ).stdout
+                results.append({"mode": mode, "size_mb": size_mb, **json.loads(output.strip().splitlines()[-1])})
+                target.unlink(missing_ok=True)
+            source.unlink()
+    print(json.dumps(results, indent=4))
+
+if __name__ == "__main__":
+    main()
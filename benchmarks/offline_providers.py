@@ -0,0 +1,164 @@
+"""
+Local stand-ins for the chat and transcription providers used by the offline
+benchmarks: schema-shaped structured models and an AsyncOpenAI-like audio
+client, both with configurable latency, jitter and failure rate.
+"""
+import random
+import asyncio
+import subprocess
+import imageio_ffmpeg
+from pathlib import Path
+from types import SimpleNamespace
+from langchain_core.runnables import RunnableLambda
+from helper_function.metrics import metered_model
+from helper_function.transcript_windowing import count_tokens
+from helper_function.rate_limiter import get_rate_limiter, rate_limited_model
+from helper_function.schema_definitions import (
+    summary_json_schema,
+    question_json_schema,
+    context_digest_json_schema,
+    concise_stitch_json_schema,
+    cumulative_summary_json_schema
+)
+
+WORDS = (
+    "lecture concept model data value system function process result method "
+    "analysis example theory structure element network signal memory energy "
+    "variable equation pattern layer gradient matrix vector sample error"
+).split()
+
+# Speech segments are 32 kbps MP3
+AUDIO_BYTES_PER_SECOND = 32_000 / 8
+
+class FakeProviderError(Exception):
+    """Transient provider failure; retried like a real 503"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.status_code = 503
+
+class LatencyProfile:
+    """Latency = base + per-unit cost, scaled by +/- jitter; fails with `failure_rate`"""
+
+    def __init__(self, base_seconds: float, per_unit_seconds: float, jitter: float, failure_rate: float, seed: int = 0):
+        self.base_seconds = base_seconds
+        self.per_unit_seconds = per_unit_seconds
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+
+    async def wait(self, units: float) -> None:
+        delay = (self.base_seconds + self.per_unit_seconds * units) * (1 + self.rng.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(max(delay, 0))
+        if self.rng.random() < self.failure_rate:
+            raise FakeProviderError("Simulated provider failure")
+
+def synthetic_text(words: int, rng: random.Random) -> str:
+    """Sentences of 12 words drawn from a small vocabulary"""
+    sentences = []
+    for start in range(0, words, 12):
+        sentence = [rng.choice(WORDS) for _ in range(min(12, words - start))]
+        sentences.append(" ".join(sentence).capitalize() + ".")
+    return " ".join(sentences)
+
+def fake_instance(schema: dict, rng: random.Random):
+    """Smallest plausible value for a JSON schema (objects, arrays and strings)"""
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        return {name: fake_instance(prop, rng) for name, prop in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        items = schema.get("items", {})
+        count = 4 if items.get("type") == "string" else 3
+        return [fake_instance(items, rng) for _ in range(count)]
+    if schema_type in ("integer", "number"):
+        return 1
+    if schema_type == "boolean":
+        return True
+    return synthetic_text(40, rng)
+
+def fake_structured_model(schema: dict, profile: LatencyProfile, name: str):
+    """Runnable that answers any prompt with a schema-shaped dict after a simulated delay"""
+
+    async def _ainvoke(prompt_value):
+        # Latency grows with the prompt like a real model's prefill
+        await profile.wait(count_tokens(prompt_value.to_string()) / 1000)
+        return fake_instance(schema, profile.rng)
+
+    def _invoke(prompt_value):
+        return asyncio.run(_ainvoke(prompt_value))
+
+    # Same wrappers as real models (metrics, retry/backoff), without any rate budget
+    return rate_limited_model(
+        metered_model(RunnableLambda(func=_invoke, afunc=_ainvoke, name=name), name, count_tokens),
+        get_rate_limiter(f"offline_{name}"),
+        count_tokens,
+        name
+    )
+
+def fake_models(
+    latency: float = 0.2,
+    per_ktoken: float = 0.02,
+    jitter: float = 0.3,
+    failure_rate: float = 0.0,
+    seed: int = 0
+) -> tuple:
+    """Stand-ins shaped like the init_models() result"""
+    def _profile(offset: int) -> LatencyProfile:
+        return LatencyProfile(latency, per_ktoken, jitter, failure_rate, seed + offset)
+
+    return (
+        fake_structured_model(summary_json_schema, _profile(1), "fake-summary"),
+        fake_structured_model(cumulative_summary_json_schema, _profile(2), "fake-cumulative"),
+        {
+            name: fake_structured_model(question_json_schema, _profile(10 + i), f"fake-{name}")
+            for i, name in enumerate(("openai", "anthropic", "xai", "google"))
+        },
+        fake_structured_model(question_json_schema, _profile(3), "fake-selection"),
+        fake_structured_model(concise_stitch_json_schema, _profile(4), "fake-stitch"),
+        fake_structured_model(context_digest_json_schema, _profile(5), "fake-digest")
+    )
+
+class FakeAudioClient:
+    """AsyncOpenAI-shaped client answering audio.transcriptions/translations.create"""
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        per_audio_minute: float = 0.5,
+        jitter: float = 0.3,
+        failure_rate: float = 0.0,
+        words_per_second: float = 2.5,
+        seed: int = 0
+    ):
+        self.profile = LatencyProfile(latency, per_audio_minute, jitter, failure_rate, seed)
+        self.words_per_second = words_per_second
+        create = self._create
+        self.audio = SimpleNamespace(
+            transcriptions=SimpleNamespace(create=create),
+            translations=SimpleNamespace(create=create)
+        )
+
+    async def _create(self, model: str, file, response_format: str = "text", **kwargs) -> str:
+        audio_seconds = len(file.getvalue()) / AUDIO_BYTES_PER_SECOND
+        await self.profile.wait(audio_seconds / 60)
+        return synthetic_text(max(int(audio_seconds * self.words_per_second), 1), self.profile.rng)
+
+    async def close(self) -> None:
+        pass
+
+def make_synthetic_video(path: Path, seconds: int) -> Path:
+    """Small test-pattern video with a tone track, generated by ffmpeg's lavfi sources"""
+    subprocess.run(
+        [
+            imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", "testsrc=size=320x240:rate=10",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=16000",
+            "-t", str(seconds), "-shortest",
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            str(path)
+        ],
+        check=True,
+        capture_output=True
+    )
+    return path
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 
 class ApiSecrets(BaseSettings):
@@ -9,6 +10,91 @@ class ApiSecrets(BaseSettings):
     LANGCHAIN_PROJECT: str
     LANGCHAIN_TRACING_V2: bool
     OPENAI_API_KEY: str
+    # Background job settings
+    JOB_MAX_WORKERS: int = 2
+    # Finished jobs and their workspaces are deleted after this long (0 = keep
+    # until DELETE); the reaper sweeps every JOB_REAPER_INTERVAL_SECONDS
+    JOB_RESULT_TTL_SECONDS: int = 24 * 3600
+    JOB_REAPER_INTERVAL_SECONDS: int = 300
+    # Shared HTTP connection pool for model clients
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_TIMEOUT_SECONDS: float = 600.0
+    # Transcript windowing for page summaries ("page" or "tokens")
+    TRANSCRIPT_WINDOWING: str = "page"
+    SUMMARY_WINDOW_TOKENS: int = 2000
+    MIN_SUMMARY_WINDOW_TOKENS: int = 200
+    # Page summary mode ("sequential" or "parallel" map-reduce) and its fan-out
+    SUMMARY_MODE: str = "sequential"
+    SUMMARY_PARALLEL_FANOUT: int = 8
+    # Previous-pages context for sequential summaries ("rolling" or "full"): the
+    # last CONTEXT_WINDOW_PAGES page summaries plus a digest, within the token budget
+    SUMMARY_CONTEXT_STRATEGY: str = "rolling"
+    CONTEXT_WINDOW_PAGES: int = 4
+    CONTEXT_TOKEN_BUDGET: int = 3000
+    # Question fan-out: select once QUESTION_QUORUM models answered (0 = all of them)
+    # or QUESTION_DEADLINE_SECONDS passed (0 = no deadline); late models are dropped.
+    # Waiting for every model is the default, the deadline is only a safety net
+    QUESTION_QUORUM: int = 0
+    QUESTION_DEADLINE_SECONDS: float = 180.0
+    # Process-wide per-provider rate limits (0 = unlimited) and retry/backoff
+    # for throttled (429) and transient provider errors
+    PROVIDER_RATE_LIMITS: Dict[str, Dict[str, int]] = {
+        "openai_chat": {"requests_per_minute": 500, "tokens_per_minute": 500000},
+        "openai_audio": {"requests_per_minute": 50, "tokens_per_minute": 0},
+        "anthropic": {"requests_per_minute": 50, "tokens_per_minute": 50000},
+        "xai": {"requests_per_minute": 60, "tokens_per_minute": 200000},
+        "google": {"requests_per_minute": 150, "tokens_per_minute": 1000000}
+    }
+    RATE_LIMIT_MAX_RETRIES: int = 5
+    RATE_LIMIT_BASE_DELAY_SECONDS: float = 1.0
+    RATE_LIMIT_MAX_DELAY_SECONDS: float = 60.0
+    # Admission control for pipeline runs: concurrent runs, bounded wait queue and
+    # admitted minutes of video (0 = unlimited); saturated requests get 429/503
+    ADMISSION_MAX_RUNNING_JOBS: int = 2
+    ADMISSION_MAX_QUEUED_JOBS: int = 8
+    ADMISSION_MAX_VIDEO_MINUTES: float = 1200.0
+    ADMISSION_DEFAULT_JOB_SECONDS: float = 600.0
+    # List prices (USD per million tokens) behind the /metrics cost estimates
+    MODEL_PRICES_USD_PER_MTOK: Dict[str, Dict[str, float]] = {
+        "gpt-5.1-2025-11-13": {"input": 1.25, "output": 10.0},
+        "gpt-5-mini": {"input": 0.25, "output": 2.0},
+        "claude-haiku-4-5-20251001": {"input": 1.0, "output": 5.0},
+        "grok-4-fast-reasoning": {"input": 0.2, "output": 0.5},
+        "gemini-2.5-flash": {"input": 0.3, "output": 2.5}
+    }
+    # Concurrent ingestion of uploaded videos: ffmpeg extraction processes and
+    # in-flight transcription API calls across all requests, and per lecture
+    INGEST_FFMPEG_PROCESSES: int = 2
+    TRANSCRIPTION_CONCURRENCY: int = 8
+    TRANSCRIPTION_CHUNK_CONCURRENCY: int = 4
+    # Speech extraction: mono 16 kHz MP3 segments sized for the transcription API
+    # (32 kbps keeps a 90 minute segment near 21 MB, under the 25 MB limit;
+    # gpt-4o-transcribe output limits need ~10 minute segments for Hinglish)
+    SPEECH_AUDIO_BITRATE: str = "32k"
+    SPEECH_SAMPLE_RATE: int = 16000
+    SPEECH_SEGMENT_SECONDS: int = 5400
+    SPEECH_SEGMENT_SECONDS_HINGLISH: int = 600
+    # Transcript cache (defaults to BASE_DIR/cache/transcripts)
+    TRANSCRIPT_CACHE_ENABLED: bool = True
+    TRANSCRIPT_CACHE_DIR: Optional[Path] = None
+    TRANSCRIPT_CACHE_MAX_MB: int = 512
+    # LLM response cache (defaults to BASE_DIR/cache/llm_responses.sqlite3)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: Optional[Path] = None
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 20000
+    # Record/replay of model and transcription calls ("off", "record" or "replay";
+    # defaults to BASE_DIR/cassettes/cassette.jsonl). Replay never calls the
+    # providers and waits the recorded latency times CASSETTE_LATENCY_SCALE
+    CASSETTE_MODE: str = "off"
+    CASSETTE_PATH: Optional[Path] = None
+    CASSETTE_LATENCY_SCALE: float = 1.0
+    # Upload streaming (0 disables the size limit)
+    MAX_UPLOAD_MB: int = 4096
+    UPLOAD_CHUNK_SIZE_KB: int = 1024
+    # Default ZIP compression: stored, deflated, bzip2 or lzma ("stored" streams as level-0 deflate)
+    OUTPUT_ZIP_COMPRESSION: str = "stored"
     class Config:
         env_file = ".env"
         extra = "ignore"  
@@ -0,0 +1,143 @@
+import math
+import time
+import asyncio
+from typing import List, Optional
+from core.config import ai_api_secrets
+
+# Used for videos whose duration could not be read (typical lecture recording bitrate)
+FALLBACK_MB_PER_VIDEO_MINUTE = 10.0
+
+class AdmissionRejected(Exception):
+    """The service is saturated; the client should retry after `retry_after` seconds"""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+class AdmissionTicket:
+    """
+    A reserved place for one pipeline run. `async with ticket:` waits for a
+    running slot; leaving the block (or `release()` if the run never starts)
+    gives the reservation back.
+    """
+
+    def __init__(self, controller: "AdmissionController", cost: float):
+        self.controller = controller
+        self.cost = cost
+        self.started_at: Optional[float] = None
+        self._acquired = False
+        self._released = False
+
+    async def __aenter__(self) -> "AdmissionTicket":
+        try:
+            await self.controller._slots.acquire()
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        self._acquired = True
+        self.controller.waiting -= 1
+        self.controller.running += 1
+        self.started_at = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self.controller._release(self)
+
+class AdmissionController:
+    """
+    Global gate in front of the heavy pipeline.
+
+    At most `max_running` runs execute at once and at most `max_queued` wait
+    for a slot; beyond that requests are rejected with 503. The cost
+    (minutes of video) of everything admitted is capped by `max_cost`
+    (0 = unlimited); a request that would exceed it is rejected with 429,
+    unless nothing else is admitted, so oversized uploads still get through
+    on an idle service.
+    """
+
+    def __init__(
+        self,
+        max_running: int,
+        max_queued: int,
+        max_cost: float = 0,
+        default_job_seconds: float = 300.0
+    ):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.max_cost = max_cost
+        self._slots = asyncio.Semaphore(max_running)
+        self.running = 0
+        self.waiting = 0
+        self.admitted_cost = 0.0
+        self.rejected = 0
+        # Moving average of run time, used for Retry-After
+        self.avg_job_seconds = default_job_seconds
+
+    def retry_after_seconds(self) -> int:
+        """Rough time until a running job finishes and frees a place"""
+        return max(math.ceil(self.avg_job_seconds / max(self.max_running, 1)), 1)
+
+    def _reject(self, status_code: int, reason: str) -> None:
+        self.rejected += 1
+        raise AdmissionRejected(status_code, self.retry_after_seconds(), reason)
+
+    def check_capacity(self) -> None:
+        """Cheap early rejection (before any upload is stored) when the queue is full"""
+        if self.running >= self.max_running and self.waiting >= self.max_queued:
+            self._reject(503, "Server is at capacity; the job queue is full")
+
+    def reserve(self, cost: float) -> AdmissionTicket:
+        """Admit a run of the given cost or raise AdmissionRejected"""
+        self.check_capacity()
+        if self.max_cost and self.admitted_cost and self.admitted_cost + cost > self.max_cost:
+            self._reject(429, "Too much video is already being processed")
+        self.waiting += 1
+        self.admitted_cost += cost
+        return AdmissionTicket(self, cost)
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        self.admitted_cost = max(self.admitted_cost - ticket.cost, 0.0)
+        if not ticket._acquired:
+            self.waiting -= 1
+            return
+        self.running -= 1
+        self._slots.release()
+        elapsed = time.monotonic() - ticket.started_at
+        self.avg_job_seconds = 0.8 * self.avg_job_seconds + 0.2 * elapsed
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_running": self.max_running,
+            "max_queued": self.max_queued,
+            "admitted_video_minutes": round(self.admitted_cost, 2),
+            "max_video_minutes": self.max_cost,
+            "rejected": self.rejected,
+            "avg_job_seconds": round(self.avg_job_seconds, 1)
+        }
+
+def estimate_job_cost(videos: List[dict]) -> float:
+    """Minutes of video in a request; file size stands in for unreadable durations"""
+    minutes = 0.0
+    for video in videos:
+        if video.get("duration_seconds"):
+            minutes += video["duration_seconds"] / 60
+        else:
+            minutes += video["size_bytes"] / (1024 * 1024) / FALLBACK_MB_PER_VIDEO_MINUTE
+    return minutes
+
+admission_controller = AdmissionController(
+    max_running=ai_api_secrets.ADMISSION_MAX_RUNNING_JOBS,
+    max_queued=ai_api_secrets.ADMISSION_MAX_QUEUED_JOBS,
+    max_cost=ai_api_secrets.ADMISSION_MAX_VIDEO_MINUTES,
+    default_job_seconds=ai_api_secrets.ADMISSION_DEFAULT_JOB_SECONDS
+)
@@ -0,0 +1,275 @@
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from core.config import ai_api_secrets
+from helper_function.quorum_fanout import quorum_fan_out
+from langchain_core.runnables import RunnableLambda
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+class CassetteMiss(Exception):
+    """Replay found no recording for a request (the job diverged from the recorded one)"""
+
+class ReplayedProviderError(Exception):
+    """A provider failure played back from the cassette, so retries happen as recorded"""
+
+    def __init__(self, message: str, status_code: Optional[int]):
+        super().__init__(message)
+        self.status_code = status_code
+
+class ModelCassette:
+    """
+    Record/replay log of model and transcription calls, one JSON object per line.
+
+    In record mode every call is written with its request, response (or error)
+    and duration, as is the outcome of each question fan-out; the file is
+    truncated on the first write. In replay mode
+    calls never reach the provider: each request is answered with its
+    recordings in recorded order (the last one repeats once they run out),
+    after the recorded duration times `latency_scale` (0 = no delay).
+    """
+
+    def __init__(self, path: Path, mode: str, latency_scale: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._truncated = False
+        self._entries: Optional[Dict[str, List[dict]]] = None
+        self._positions: Dict[str, int] = {}
+
+    @staticmethod
+    def make_key(kind: str, model_name: str, *parts: str) -> str:
+        """Stable key for one request of one kind (chat or audio endpoint) to one model"""
+        digest = hashlib.sha256()
+        for part in (kind, model_name, *parts):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _append_sync(self, entry: dict) -> None:
+        with self._lock:
+            if not self._truncated:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a" if self._truncated else "w", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._truncated = True
+            self.recorded += 1
+
+    def _load_sync(self) -> Dict[str, List[dict]]:
+        with self._lock:
+            if self._entries is None:
+                entries: Dict[str, List[dict]] = {}
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entries.setdefault(entry["key"], []).append(entry)
+                self._entries = entries
+            return self._entries
+
+    def _entry(
+        self,
+        kind: str,
+        key: str,
+        model_name: str,
+        request: dict,
+        seconds: float,
+        response: Any = None,
+        error: Optional[BaseException] = None
+    ) -> dict:
+        entry = {
+            "kind": kind,
+            "key": key,
+            "model": model_name,
+            "request": request,
+            "seconds": round(seconds, 4),
+            "response": response
+        }
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+            entry["status_code"] = getattr(error, "status_code", None)
+        return entry
+
+    def _next_recording(self, entries: Dict[str, List[dict]], key: str, model_name: str) -> dict:
+        recordings = entries.get(key)
+        if not recordings:
+            self.misses += 1
+            raise CassetteMiss(f"No recorded call to {model_name} matches this request")
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.replayed += 1
+        return recordings[min(position, len(recordings) - 1)]
+
+    @staticmethod
+    def _playback(entry: dict) -> Any:
+        if "error" in entry:
+            raise ReplayedProviderError(entry["error"], entry.get("status_code"))
+        return entry["response"]
+
+    async def record(
+        self,
+        kind: str,
+        key: str,
+        model_name: str,
+        request: dict,
+        seconds: float,
+        response: Any = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        entry = self._entry(kind, key, model_name, request, seconds, response, error)
+        await asyncio.to_thread(self._append_sync, entry)
+
+    async def replay(self, key: str, model_name: str) -> Any:
+        """Play back the next recording for `key`: wait, then return or raise"""
+        entry = self._next_recording(await asyncio.to_thread(self._load_sync), key, model_name)
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["seconds"] * self.latency_scale)
+        return self._playback(entry)
+
+    async def call(self, kind: str, key: str, model_name: str, request: dict, call) -> Any:
+        """Replay the call, or make it and record the outcome"""
+        if self.mode == "replay":
+            return await self.replay(key, model_name)
+        start = time.perf_counter()
+        try:
+            response = await call()
+        except Exception as err:
+            await self.record(kind, key, model_name, request, time.perf_counter() - start, error=err)
+            raise
+        await self.record(kind, key, model_name, request, time.perf_counter() - start, response=response)
+        return response
+
+    def call_sync(self, kind: str, key: str, model_name: str, request: dict, call) -> Any:
+        """Blocking counterpart of call() for sync invocations"""
+        if self.mode == "replay":
+            entry = self._next_recording(self._load_sync(), key, model_name)
+            if self.latency_scale > 0:
+                time.sleep(entry["seconds"] * self.latency_scale)
+            return self._playback(entry)
+        start = time.perf_counter()
+        try:
+            response = call()
+        except Exception as err:
+            self._append_sync(self._entry(kind, key, model_name, request, time.perf_counter() - start, error=err))
+            raise
+        self._append_sync(self._entry(kind, key, model_name, request, time.perf_counter() - start, response=response))
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "path": str(self.path),
+            "latency_scale": self.latency_scale,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses
+        }
+
+def cassette_model(structured_model, cassette: ModelCassette, model_name: str, schema: dict):
+    """Wrap a structured-output model so its calls are recorded to or replayed from the cassette"""
+
+    def _request(prompt_value):
+        prompt_text = prompt_value.to_string()
+        key = cassette.make_key("chat", model_name, prompt_text, json.dumps(schema, sort_keys=True))
+        return key, {"prompt": prompt_text, "schema": schema.get("title")}
+
+    async def _ainvoke(prompt_value):
+        key, request = _request(prompt_value)
+        return await cassette.call(
+            "chat", key, model_name, request, lambda: structured_model.ainvoke(prompt_value)
+        )
+
+    def _invoke(prompt_value):
+        key, request = _request(prompt_value)
+        return cassette.call_sync(
+            "chat", key, model_name, request, lambda: structured_model.invoke(prompt_value)
+        )
+
+    return RunnableLambda(func=_invoke, afunc=_ainvoke, name=f"cassette_{model_name}")
+
+async def cassette_fan_out(
+    cassette: ModelCassette,
+    chains: Dict[str, Any],
+    inputs: dict,
+    quorum: int = 0,
+    deadline_seconds: Optional[float] = None
+) -> Tuple[Dict[str, Any], dict]:
+    """
+    quorum_fan_out() whose outcome is part of the recording.
+
+    Which models contributed depends on timing, so recording stores the
+    fan-out report keyed by the inputs, and replay invokes exactly the
+    recorded contributors (no quorum, no deadline) and reports the recorded
+    dropped models.
+    """
+    key = cassette.make_key(
+        "fanout", ",".join(sorted(chains)), json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    )
+    if cassette.mode == "replay":
+        report = await cassette.replay(key, "question fan-out")
+        contributing = {name: chains[name] for name in report["contributing_models"]}
+        answers, _ = await quorum_fan_out(contributing, inputs)
+        return answers, report
+    answers, report = await quorum_fan_out(chains, inputs, quorum, deadline_seconds)
+    # No recorded duration: the contributors' own recordings carry the latency
+    await cassette.record("fanout", key, "question fan-out", {"models": sorted(chains)}, 0.0, response=report)
+    return answers, report
+
+class CassetteAudioClient:
+    """AsyncOpenAI-shaped wrapper recording or replaying audio transcriptions/translations"""
+
+    def __init__(self, client, cassette: ModelCassette):
+        self.client = client
+        self.cassette = cassette
+        self.audio = SimpleNamespace(
+            transcriptions=SimpleNamespace(create=self._endpoint("transcriptions")),
+            translations=SimpleNamespace(create=self._endpoint("translations"))
+        )
+
+    def _endpoint(self, endpoint: str):
+        async def _create(model: str, file, **kwargs) -> str:
+            # Audio is matched by content; the prompt and format are part of the request
+            audio_hash = hashlib.sha256(file.getvalue()).hexdigest()
+            options = json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
+            key = self.cassette.make_key(f"audio_{endpoint}", model, audio_hash, options)
+
+            async def _call() -> str:
+                response = await getattr(self.client.audio, endpoint).create(model=model, file=file, **kwargs)
+                return response.text if hasattr(response, "text") else str(response)
+
+            return await self.cassette.call(
+                f"audio_{endpoint}",
+                key,
+                model,
+                {"file": getattr(file, "name", None), "audio_sha256": audio_hash, "options": kwargs},
+                _call
+            )
+
+        return _create
+
+    async def close(self) -> None:
+        await self.client.close()
+
+def _create_model_cassette() -> Optional[ModelCassette]:
+    if ai_api_secrets.CASSETTE_MODE == "off":
+        return None
+    path = ai_api_secrets.CASSETTE_PATH or ai_api_secrets.BASE_DIR / "cassettes" / "cassette.jsonl"
+    return ModelCassette(
+        path=path,
+        mode=ai_api_secrets.CASSETTE_MODE,
+        latency_scale=ai_api_secrets.CASSETTE_LATENCY_SCALE
+    )
+
+model_cassette = _create_model_cassette()
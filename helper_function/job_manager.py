@@ -0,0 +1,129 @@
+import time
+import shutil
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+from core.config import ai_api_secrets
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+class JobManager:
+    """
+    In-process registry of background pipeline jobs.
+
+    Jobs are started as asyncio tasks but only `max_workers` of them run the
+    pipeline at the same time; the rest wait in the `queued` state. Finished
+    jobs and their workspaces are reaped `result_ttl_seconds` after they end
+    (0 keeps them until deleted).
+    """
+
+    def __init__(self, max_workers: int, result_ttl_seconds: int = 0):
+        self.max_workers = max_workers
+        self.result_ttl_seconds = result_ttl_seconds
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._jobs: Dict[str, dict] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(
+        self,
+        job_id: str,
+        job_fn: Callable[[], Awaitable[None]],
+        all_paths: dict,
+        on_finished: Optional[Callable[[], None]] = None
+    ) -> dict:
+        """Register a job and schedule it on the worker pool; `on_finished` runs however it ends"""
+        job = {
+            "job_id": job_id,
+            "status": JOB_QUEUED,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "all_paths": all_paths
+        }
+        self._jobs[job_id] = job
+        self._tasks[job_id] = asyncio.create_task(self._run(job, job_fn, on_finished))
+        return job
+
+    async def _run(
+        self,
+        job: dict,
+        job_fn: Callable[[], Awaitable[None]],
+        on_finished: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Wait for a free worker slot, then run the job"""
+        try:
+            async with self._semaphore:
+                job["status"] = JOB_RUNNING
+                job["started_at"] = time.time()
+                await job_fn()
+                job["status"] = JOB_COMPLETED
+        except asyncio.CancelledError:
+            job["status"] = JOB_FAILED
+            job["error"] = "Job cancelled"
+        except Exception as err:
+            job["status"] = JOB_FAILED
+            job["error"] = str(err)
+        finally:
+            job["finished_at"] = time.time()
+            if on_finished is not None:
+                on_finished()
+            self._tasks.pop(job["job_id"], None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the job record or None"""
+        return self._jobs.get(job_id)
+
+    async def remove(self, job_id: str) -> Optional[dict]:
+        """
+        Forget a job, cancelling it if it has not finished. Returns once the
+        cancelled job has unwound, so its workspace is no longer being written.
+        """
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return self._jobs.pop(job_id, None)
+
+    async def reap_expired(self, now: Optional[float] = None) -> int:
+        """Forget finished jobs older than the TTL and delete their workspaces"""
+        if not self.result_ttl_seconds:
+            return 0
+        now = time.time() if now is None else now
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and now - job["finished_at"] > self.result_ttl_seconds
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            data_dir = job["all_paths"]["data_dir"]
+            await asyncio.to_thread(shutil.rmtree, data_dir, ignore_errors=True)
+        return len(expired)
+
+    async def run_reaper(self, interval_seconds: float) -> None:
+        """Reap expired jobs every `interval_seconds` until cancelled (started by the app lifespan)"""
+        if not self.result_ttl_seconds:
+            return
+        while True:
+            await asyncio.sleep(max(interval_seconds, 1))
+            try:
+                await self.reap_expired()
+            except Exception:
+                # A failed sweep is retried on the next interval
+                pass
+
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker slot"""
+        return sum(1 for job in self._jobs.values() if job["status"] == JOB_QUEUED)
+
+    @staticmethod
+    def public_view(job: dict) -> dict:
+        """Job fields that are safe to return to API clients"""
+        return {key: value for key, value in job.items() if key != "all_paths"}
+
+job_manager = JobManager(
+    max_workers=ai_api_secrets.JOB_MAX_WORKERS,
+    result_ttl_seconds=ai_api_secrets.JOB_RESULT_TTL_SECONDS
+)
@@ -0,0 +1,149 @@
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Optional
+from core.config import ai_api_secrets
+from langchain_core.runnables import RunnableLambda
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache for structured model responses.
+
+    Keys combine the model name, the rendered prompt and the output schema.
+    Entries expire after `ttl_seconds`; when more than `max_entries` are
+    stored the least recently used ones are dropped.
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: int, max_entries: int):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, model_name TEXT, response TEXT, "
+                "created_at REAL, last_access REAL)"
+            )
+            self._initialized = True
+        return connection
+
+    @staticmethod
+    def make_key(model_name: str, prompt_text: str, schema: dict) -> str:
+        """Stable cache key for one prompt sent to one model with one schema"""
+        digest = hashlib.sha256()
+        for part in (model_name, prompt_text, json.dumps(schema, sort_keys=True)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get_sync(self, key: str) -> Optional[Any]:
+        """Return the cached response or None (counting hits and misses)"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or now - row[1] > self.ttl_seconds:
+                    self.misses += 1
+                    return None
+                connection.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+                connection.commit()
+                self.hits += 1
+                return json.loads(row[0])
+            finally:
+                connection.close()
+
+    def put_sync(self, key: str, model_name: str, response: Any) -> None:
+        """Store a response and apply TTL and size eviction"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                    (key, model_name, json.dumps(response), now, now)
+                )
+                connection.execute(
+                    "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+                connection.execute(
+                    "DELETE FROM llm_responses WHERE key IN ("
+                    "SELECT key FROM llm_responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                connection.commit()
+            finally:
+                connection.close()
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def aput(self, key: str, model_name: str, response: Any) -> None:
+        await asyncio.to_thread(self.put_sync, key, model_name, response)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            connection = self._connect()
+            try:
+                entries = connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            finally:
+                connection.close()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries
+        }
+
+def cached_structured_model(structured_model, cache: LLMResponseCache, model_name: str, schema: dict):
+    """Wrap a structured-output model so identical prompts are answered from the cache"""
+
+    def _invoke(prompt_value):
+        key = cache.make_key(model_name, prompt_value.to_string(), schema)
+        cached = cache.get_sync(key)
+        if cached is not None:
+            return cached
+        response = structured_model.invoke(prompt_value)
+        cache.put_sync(key, model_name, response)
+        return response
+
+    async def _ainvoke(prompt_value):
+        key = cache.make_key(model_name, prompt_value.to_string(), schema)
+        cached = await cache.aget(key)
+        if cached is not None:
+            return cached
+        response = await structured_model.ainvoke(prompt_value)
+        await cache.aput(key, model_name, response)
+        return response
+
+    return RunnableLambda(func=_invoke, afunc=_ainvoke, name=f"cached_{model_name}")
+
+def _create_llm_response_cache() -> Optional[LLMResponseCache]:
+    if not ai_api_secrets.LLM_CACHE_ENABLED:
+        return None
+    db_path = ai_api_secrets.LLM_CACHE_PATH or ai_api_secrets.BASE_DIR / "cache" / "llm_responses.sqlite3"
+    return LLMResponseCache(
+        db_path=db_path,
+        ttl_seconds=ai_api_secrets.LLM_CACHE_TTL_SECONDS,
+        max_entries=ai_api_secrets.LLM_CACHE_MAX_ENTRIES
+    )
+
+llm_response_cache = _create_llm_response_cache()
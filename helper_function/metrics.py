@@ -0,0 +1,283 @@
+import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from core.config import ai_api_secrets
+from helper_function.job_manager import job_manager
+from helper_function.rate_limiter import rate_limiters
+from helper_function.admission_control import admission_controller
+from langchain_core.runnables import RunnableLambda
+
+# Stage durations range from sub-second page writes to hour-long transcriptions
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    """Base for labelled metrics rendered in the Prometheus text format"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+class _ValueMetric(_Metric):
+    """Labelled values, either updated in place or read from a callback at scrape time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set_callback(self, callback: Callable[[], Dict[Tuple[str, ...], float]]) -> None:
+        self._callback = callback
+
+    def _samples(self) -> Iterator[str]:
+        if self._callback is not None:
+            values = self._callback()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Counter(_ValueMetric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(_ValueMetric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DURATION_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[Tuple[str, ...], list] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    counts[i] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def snapshot(self) -> Dict[Tuple[str, ...], dict]:
+        """Observation count and sum per label set"""
+        with self._lock:
+            return {
+                key: {"count": self._counts[key][-1], "sum": self._sums[key]}
+                for key in self._counts
+            }
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the block (works around awaits too)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            counts = {key: list(value) for key, value in self._counts.items()}
+            sums = dict(self._sums)
+        for key in sorted(counts):
+            for upper, count in zip(self.buckets, counts[key]):
+                le = 'le="' + _format_value(upper) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(sums[key])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {counts[key][-1]}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.register(Histogram(
+    "pipeline_stage_duration_seconds",
+    "Wall time of each pipeline stage",
+    ["stage"]
+))
+LLM_REQUEST_DURATION = registry.register(Histogram(
+    "llm_request_duration_seconds",
+    "Latency of structured model calls (excluding rate-limit queueing and cache hits)",
+    ["model"]
+))
+LLM_REQUESTS = registry.register(Counter(
+    "llm_requests_total",
+    "Structured model calls by outcome",
+    ["model", "status"]
+))
+LLM_PROMPT_TOKENS = registry.register(Counter(
+    "llm_prompt_tokens_total",
+    "Estimated prompt tokens sent per model",
+    ["model"]
+))
+LLM_COMPLETION_TOKENS = registry.register(Counter(
+    "llm_completion_tokens_total",
+    "Estimated completion tokens received per model",
+    ["model"]
+))
+ESTIMATED_COST = registry.register(Counter(
+    "llm_estimated_cost_usd_total",
+    "Estimated spend per model (chat tokens and transcription minutes)",
+    ["model"]
+))
+TRANSCRIBED_AUDIO = registry.register(Counter(
+    "transcription_audio_seconds_total",
+    "Seconds of audio sent for transcription",
+    ["model"]
+))
+QUESTION_MODELS_DROPPED = registry.register(Counter(
+    "question_models_dropped_total",
+    "Question generation models left out of selection (late, or the HTTP status or error class)",
+    ["model", "reason"]
+))
+JOBS_IN_FLIGHT = registry.register(Gauge(
+    "pipeline_jobs_in_flight",
+    "Pipeline runs currently executing"
+))
+JOBS_QUEUED = registry.register(Gauge(
+    "pipeline_jobs_queued",
+    "Pipeline runs admitted and waiting for a slot"
+))
+BACKGROUND_QUEUE_DEPTH = registry.register(Gauge(
+    "background_jobs_queue_depth",
+    "Background jobs waiting for a job worker"
+))
+RATE_LIMIT_WAITING = registry.register(Gauge(
+    "rate_limiter_waiting_requests",
+    "Provider calls queued on the shared rate limiter",
+    ["provider"]
+))
+RATE_LIMIT_WAIT = registry.register(Counter(
+    "rate_limiter_wait_seconds_total",
+    "Time provider calls spent waiting for rate-limit budget",
+    ["provider"]
+))
+
+# Gauges and totals owned by other components are read when /metrics is scraped
+JOBS_IN_FLIGHT.set_callback(lambda: {(): admission_controller.running})
+JOBS_QUEUED.set_callback(lambda: {(): admission_controller.waiting})
+BACKGROUND_QUEUE_DEPTH.set_callback(lambda: {(): job_manager.queue_depth()})
+RATE_LIMIT_WAITING.set_callback(lambda: {
+    (name,): limiter.waiting for name, limiter in rate_limiters.items()
+})
+RATE_LIMIT_WAIT.set_callback(lambda: {
+    (name,): limiter.wait_seconds_total for name, limiter in rate_limiters.items()
+})
+
+def estimate_chat_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD estimate from the configured per-million-token prices (0 for unknown models)"""
+    prices = ai_api_secrets.MODEL_PRICES_USD_PER_MTOK.get(model_name)
+    if not prices:
+        return 0.0
+    return (prompt_tokens * prices.get("input", 0) + completion_tokens * prices.get("output", 0)) / 1_000_000
+
+def record_transcription(model_name: str, duration_seconds: float, cost_usd: float) -> None:
+    TRANSCRIBED_AUDIO.inc(duration_seconds, model=model_name)
+    ESTIMATED_COST.inc(cost_usd, model=model_name)
+
+def metered_model(structured_model, model_name: str, estimate_tokens: Callable[[str], int]):
+    """Wrap a structured-output model to record latency, token and cost estimates per call"""
+
+    async def _ainvoke(prompt_value):
+        start = time.perf_counter()
+        try:
+            response = await structured_model.ainvoke(prompt_value)
+        except Exception:
+            LLM_REQUESTS.inc(model=model_name, status="error")
+            raise
+        finally:
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - start, model=model_name)
+        prompt_tokens = await asyncio.to_thread(estimate_tokens, prompt_value.to_string())
+        completion_tokens = await asyncio.to_thread(
+            estimate_tokens, json.dumps(response, ensure_ascii=False, default=str)
+        )
+        LLM_REQUESTS.inc(model=model_name, status="ok")
+        LLM_PROMPT_TOKENS.inc(prompt_tokens, model=model_name)
+        LLM_COMPLETION_TOKENS.inc(completion_tokens, model=model_name)
+        ESTIMATED_COST.inc(estimate_chat_cost(model_name, prompt_tokens, completion_tokens), model=model_name)
+        return response
+
+    def _invoke(prompt_value):
+        return structured_model.invoke(prompt_value)
+
+    return RunnableLambda(func=_invoke, afunc=_ainvoke, name=f"metered_{model_name}")
+
+def timed_iterator(chunks: Iterable[bytes], stage: str) -> Iterator[bytes]:
+    """Pass a response body through, observing how long producing it took"""
+    start = time.perf_counter()
+    try:
+        yield from chunks
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage=stage)
@@ -0,0 +1,107 @@
+import json
+import base64
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+OUTPUT_FORMATS = ("zip", "json", "ndjson")
+
+ZIP_COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA
+}
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# (workspace directory key, glob, folder inside the archive)
+OUTPUT_LAYOUT = (
+    ("lecture_summaries_dir", "*.txt", "lecture_summaries"),
+    ("lecture_stats_dir", "*.json", "lecture_stats"),
+    ("lecture_questions_dir", "*.json", "lecture_questions"),
+    ("cumulative_questions_dir", "*.json", "cumulative_questions"),
+    ("lecture_pdfs_dir", "*.pdf", "lecture_pdfs"),
+)
+
+def collect_output_entries(all_paths: dict) -> List[Tuple[str, Path]]:
+    """List (archive name, file) pairs for every output artifact in a workspace"""
+    entries = []
+    for dir_key, pattern, folder in OUTPUT_LAYOUT:
+        for file in sorted(all_paths[dir_key].glob(pattern)):
+            entries.append((f"{folder}/{file.name}", file))
+    if all_paths["all_previous_lecture_summary_file"].exists():
+        entries.append(("all_previous_lecture_summary.txt", all_paths["all_previous_lecture_summary_file"]))
+    return entries
+
+class _ZipStreamBuffer:
+    """Write-only sink for ZipFile; bytes are drained after each write batch"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_zip_stream(
+    entries: List[Tuple[str, Path]],
+    compression: str = "stored",
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive piece by piece while its entries are being compressed.
+
+    The sink is not seekable, so ZipFile writes data descriptors after each
+    entry instead of patching local headers; nothing but the current chunk
+    is held in memory. Strict streaming readers (e.g. Java's ZipInputStream)
+    reject STORED entries followed by a data descriptor, so "stored" is
+    written as level-0 DEFLATED, which costs about the same. Entries are
+    opened by name so they pick up the archive's method and level.
+    """
+    compress_type = ZIP_COMPRESSION_METHODS[compression]
+    compress_level = None
+    if compress_type == zipfile.ZIP_STORED:
+        compress_type, compress_level = zipfile.ZIP_DEFLATED, 0
+    sink = _ZipStreamBuffer()
+    with zipfile.ZipFile(sink, "w", compression=compress_type, compresslevel=compress_level) as zip_file:
+        for arcname, file in entries:
+            with file.open("rb") as source, zip_file.open(arcname, "w") as target:
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    target.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+def read_output_entry(arcname: str, file: Path) -> dict:
+    """Decode one artifact into a JSON-friendly record"""
+    if file.suffix == ".json":
+        return {"path": arcname, "type": "json", "content": json.loads(file.read_text("utf-8"))}
+    if file.suffix == ".txt":
+        return {"path": arcname, "type": "text", "content": file.read_text("utf-8")}
+    return {
+        "path": arcname,
+        "type": "binary",
+        "encoding": "base64",
+        "content": base64.b64encode(file.read_bytes()).decode("ascii")
+    }
+
+def iter_ndjson_stream(entries: List[Tuple[str, Path]]) -> Iterator[bytes]:
+    """Yield one JSON record per artifact, newline-delimited"""
+    for arcname, file in entries:
+        yield (json.dumps(read_output_entry(arcname, file)) + "\n").encode("utf-8")
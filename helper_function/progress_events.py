@@ -0,0 +1,40 @@
+import json
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+# Async callback receiving (event name, JSON-serialisable payload)
+ProgressCallback = Callable[[str, dict], Awaitable[None]]
+
+STREAM_FORMATS = ("sse", "ndjson")
+
+async def emit_progress(progress: Optional[ProgressCallback], event: str, payload: dict) -> None:
+    """Send a progress event if the caller asked for them"""
+    if progress is not None:
+        await progress(event, payload)
+
+class ProgressStream:
+    """Queue-backed progress callback whose events can be drained by a response generator"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def __call__(self, event: str, payload: dict) -> None:
+        await self._queue.put((event, payload))
+
+    async def close(self) -> None:
+        """Signal that no more events will be produced"""
+        await self._queue.put(None)
+
+    async def events(self) -> AsyncIterator[Tuple[str, dict]]:
+        """Yield events in the order they were emitted until the stream is closed"""
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            yield item
+
+def format_event(event: str, payload: dict, stream_format: str = "sse") -> str:
+    """Serialise one event as a Server-Sent Event or an NDJSON line"""
+    if stream_format == "ndjson":
+        return json.dumps({"event": event, "data": payload}) + "\n"
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
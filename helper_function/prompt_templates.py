@@ -122,7 +122,7 @@ Generate exactly {number_of_questions} multiple-choice questions ({number_of_que
 - Avoid complex mathematical equations that cannot be written in plain text
 - If a concept requires complex math notation, describe it in words instead
 - Test: Every character must be easily typeable on a standard English keyboard
-- NEVER use Unicode escape sequences or special characters that appear as \u codes
+- NEVER use Unicode escape sequences or special characters that appear as \\u codes
 
 ## 3. Diversity
 - Cover a wide range of topics from the lecture summary
@@ -276,4 +276,52 @@ Create a CONCISE combined summary that:
 
 Provide a combined summary that seamlessly integrates all lectures, with emphasis on the most recent content while preserving essential earlier concepts. The summary should be comprehensive yet concise (under 2000 words).
 """
-)
\ No newline at end of file
+)
+
+# Template for stitching independently generated page summaries into a connected narrative
+concise_stitch_prompt = PromptTemplate(
+    input_variables=["page_summaries", "number_of_pages"],
+    template="""
+You are given {number_of_pages} CONCISE PAGE SUMMARIES of one lecture. Each was written without seeing the other pages, so they do not connect to each other.
+
+# OBJECTIVE
+Rewrite each page summary so that, read in order, they form one connected lecture narrative.
+
+# CONSTRUCTION RULES
+1. Return EXACTLY {number_of_pages} summaries, one per page, in the same order
+2. Keep the facts of each page summary; do NOT add information that is not in the page summaries
+3. Connect each page to the earlier pages using logical connectors:
+   - "Building on [previous concept]..."
+   - "Next, the lecturer explains..."
+   - "Consequently, the focus shifts to..."
+   - "Following the discussion on [previous topic]..."
+4. The first page (or any page with no clear connection) may begin with "In this section..." or similar
+5. Maintain neutral academic tone, novel-style prose, no lists or bullet points
+6. 3-5 sentences per page
+7. Do NOT create summary in language other than English
+
+# PAGE SUMMARIES
+{page_summaries}
+"""
+)
+
+# Template for compacting the summaries of pages that slid out of the rolling context window
+context_digest_prompt = PromptTemplate(
+    input_variables=["earlier_pages_summary", "max_words"],
+    template="""
+You are given the CONCISE SUMMARIES of the earlier pages of a lecture. They are used as background context while the remaining pages are summarized.
+
+# OBJECTIVE
+Compact them into a single DIGEST of at most {max_words} words.
+
+# CONSTRUCTION RULES
+1. Keep the core concepts, key definitions, and the order in which topics were introduced
+2. Remove examples, repetition, and minor details
+3. Do NOT add information that is not in the summaries
+4. Neutral academic tone, continuous prose, no lists or bullet points
+5. Do NOT create the digest in language other than English
+
+# EARLIER PAGE SUMMARIES
+{earlier_pages_summary}
+"""
+)
@@ -0,0 +1,90 @@
+import re
+import time
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+def _drop_reason(exception: BaseException) -> str:
+    """Exception class and provider status code only; messages may echo the prompt"""
+    status_code = getattr(exception, "status_code", None)
+    if status_code is not None:
+        return f"error: {type(exception).__name__} ({status_code})"
+    return f"error: {type(exception).__name__}"
+
+# "error: RateLimitError (429)" or "error: TimeoutError"
+DROP_REASON_RE = re.compile(r"^error: (\w+)(?: \((\d+)\))?$")
+
+def drop_reason_label(reason: str) -> str:
+    """
+    Metric label for a drop reason: "late", the provider's HTTP status code,
+    or the exception class when there is no status code.
+    """
+    match = DROP_REASON_RE.match(reason)
+    if match is None:
+        return reason
+    error_class, status_code = match.groups()
+    return status_code or error_class
+
+async def quorum_fan_out(
+    chains: Dict[str, Any],
+    inputs: dict,
+    quorum: int = 0,
+    deadline_seconds: Optional[float] = None
+) -> Tuple[Dict[str, Any], dict]:
+    """
+    Invoke every chain concurrently and return once `quorum` of them have
+    answered or the deadline has passed, whichever comes first.
+
+    A quorum of 0 (or more than the number of chains) waits for all of them.
+    Failed chains are dropped. If no chain has answered by the deadline, the
+    first answer after it is used. Chains still running when the fan-out
+    returns are cancelled. Returns the answers by name and a report of which
+    chains contributed, which were dropped ("late", or the error class and
+    status code), and how long it took.
+    """
+    required = len(chains) if quorum <= 0 else min(quorum, len(chains))
+    started = time.perf_counter()
+    deadline = None if deadline_seconds is None else started + deadline_seconds
+
+    tasks = {
+        asyncio.ensure_future(chain.ainvoke(inputs)): name
+        for name, chain in chains.items()
+    }
+    answers: Dict[str, Any] = {}
+    dropped: Dict[str, str] = {}
+    pending = set(tasks)
+    try:
+        while pending and len(answers) < required:
+            timeout = None
+            if deadline is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 and answers:
+                    break
+                # Past the deadline with no answers yet: wait for the first one
+                timeout = remaining if remaining > 0 else None
+            finished, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                name = tasks[task]
+                if task.exception() is not None:
+                    dropped[name] = _drop_reason(task.exception())
+                else:
+                    answers[name] = task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+            dropped[tasks[task]] = "late"
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if not answers:
+        raise Exception(f"No model answered: {dropped}")
+
+    report = {
+        "contributing_models": [name for name in chains if name in answers],
+        "dropped_models": dropped,
+        "quorum": required,
+        "deadline_seconds": deadline_seconds,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+    return answers, report
@@ -0,0 +1,218 @@
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+from core.config import ai_api_secrets
+from langchain_core.runnables import RunnableLambda
+
+# HTTP statuses worth retrying: timeouts, conflicts, throttling and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Exception class names used by the provider SDKs for throttling and transient failures
+RETRYABLE_ERROR_NAMES = (
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "InternalServerError",
+    "OverloadedError",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "DeadlineExceeded"
+)
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_per_second = per_minute / 60
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)"""
+        self._refill()
+        # A request larger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+class ProviderRateLimiter:
+    """
+    Process-wide request and token budget for one provider.
+
+    Callers queue in arrival order and wait until both the requests/min and
+    the tokens/min bucket can cover them. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waiting = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait for budget for one request of `tokens` tokens; returns the seconds waited"""
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    wait = max(
+                        self.requests.wait_time(1) if self.requests else 0.0,
+                        self.tokens.wait_time(tokens) if self.tokens and tokens else 0.0
+                    )
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                if self.requests:
+                    self.requests.consume(1)
+                if self.tokens and tokens:
+                    self.tokens.consume(tokens)
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return waited
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.acquired,
+            "waiting": self.waiting,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.acquired, 3) if self.acquired else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures
+        }
+
+def _error_chain(err: BaseException):
+    """The error and the exceptions it was raised from"""
+    seen = set()
+    while err is not None and id(err) not in seen:
+        seen.add(id(err))
+        yield err
+        err = err.__cause__ or err.__context__
+
+def _status_code(err: BaseException) -> Optional[int]:
+    status = getattr(err, "status_code", None)
+    if status is None:
+        status = getattr(getattr(err, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_rate_limit_error(err: BaseException) -> bool:
+    return any(
+        _status_code(e) == 429 or type(e).__name__ in ("RateLimitError", "ResourceExhausted")
+        for e in _error_chain(err)
+    )
+
+def is_retryable_error(err: BaseException) -> bool:
+    """Throttling, timeouts and transient server errors; not bad requests or auth failures"""
+    return any(
+        _status_code(e) in RETRYABLE_STATUS_CODES or type(e).__name__ in RETRYABLE_ERROR_NAMES
+        for e in _error_chain(err)
+    )
+
+def _retry_after_seconds(err: BaseException) -> Optional[float]:
+    """Server-provided Retry-After delay, if any"""
+    for e in _error_chain(err):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if headers is None:
+            continue
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+    delay = random.uniform(0, min(
+        ai_api_secrets.RATE_LIMIT_MAX_DELAY_SECONDS,
+        ai_api_secrets.RATE_LIMIT_BASE_DELAY_SECONDS * 2 ** attempt
+    ))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+async def call_with_rate_limit(
+    limiter: ProviderRateLimiter,
+    call: Callable[[], Awaitable[Any]],
+    tokens: int = 0,
+    max_retries: Optional[int] = None
+) -> Any:
+    """Run `call` within the provider's budget, retrying throttled and transient failures"""
+    max_retries = ai_api_secrets.RATE_LIMIT_MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(max_retries + 1):
+        await limiter.acquire(tokens)
+        try:
+            return await call()
+        except Exception as err:
+            if is_rate_limit_error(err):
+                limiter.rate_limited += 1
+            if attempt == max_retries or not is_retryable_error(err):
+                limiter.failures += 1
+                raise
+            limiter.retries += 1
+            await asyncio.sleep(backoff_delay(attempt, _retry_after_seconds(err)))
+
+def rate_limited_model(
+    structured_model,
+    limiter: ProviderRateLimiter,
+    estimate_tokens: Callable[[str], int],
+    model_name: str
+):
+    """Wrap a structured-output model so async calls go through the provider's rate limiter"""
+
+    async def _ainvoke(prompt_value):
+        tokens = await asyncio.to_thread(estimate_tokens, prompt_value.to_string())
+        return await call_with_rate_limit(
+            limiter, lambda: structured_model.ainvoke(prompt_value), tokens=tokens
+        )
+
+    def _invoke(prompt_value):
+        # Synchronous calls (scripts, notebooks) bypass the asyncio-based limiter
+        return structured_model.invoke(prompt_value)
+
+    return RunnableLambda(func=_invoke, afunc=_ainvoke, name=f"rate_limited_{model_name}")
+
+def _create_rate_limiters() -> Dict[str, ProviderRateLimiter]:
+    return {
+        name: ProviderRateLimiter(
+            name,
+            requests_per_minute=limits.get("requests_per_minute", 0),
+            tokens_per_minute=limits.get("tokens_per_minute", 0)
+        )
+        for name, limits in ai_api_secrets.PROVIDER_RATE_LIMITS.items()
+    }
+
+# Keyed by provider: openai_chat, openai_audio, anthropic, xai, google
+rate_limiters = _create_rate_limiters()
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """Limiter for a provider, created unlimited if it has no configured limits"""
+    if provider not in rate_limiters:
+        rate_limiters[provider] = ProviderRateLimiter(provider)
+    return rate_limiters[provider]
+
+def rate_limiter_stats() -> dict:
+    return {name: limiter.stats() for name, limiter in rate_limiters.items()}
@@ -18,7 +18,8 @@ async def extract_questions_function(x):
             all_questions[model_name] = x[key]
     
     return {
-        "all_model_questions": all_questions
+        "all_model_questions": all_questions,
+        "question_fanout": x.get("question_fanout")
     }
 
 # Create runnable lambdas
@@ -122,4 +122,33 @@ cumulative_summary_json_schema = {
         }
     },
     "required": ["combined_summary"]
+}
+
+# Schema for stitching independently generated concise page summaries
+concise_stitch_json_schema = {
+    "title": "stitched_concise_page_summaries",
+    "type": "object",
+    "properties": {
+        "stitched_page_summaries": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            },
+            "description": "One connected concise summary per page, in page order (3-5 sentences each)"
+        }
+    },
+    "required": ["stitched_page_summaries"]
+}
+
+# Schema for compacting earlier page summaries into a rolling context digest
+context_digest_json_schema = {
+    "title": "earlier_pages_digest",
+    "type": "object",
+    "properties": {
+        "digest": {
+            "type": "string",
+            "description": "Compact digest of the earlier pages' concise summaries, within the requested word limit"
+        }
+    },
+    "required": ["digest"]
 }
\ No newline at end of file
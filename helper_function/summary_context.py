@@ -0,0 +1,115 @@
+import asyncio
+from collections import deque
+from helper_function.transcript_windowing import count_tokens, keep_last_tokens
+
+SUMMARY_CONTEXT_FULL = "full"
+SUMMARY_CONTEXT_ROLLING = "rolling"
+SUMMARY_CONTEXT_STRATEGIES = (SUMMARY_CONTEXT_FULL, SUMMARY_CONTEXT_ROLLING)
+
+# Rough words-per-token ratio used to turn the digest's token budget into a word limit
+APPROX_WORDS_PER_TOKEN = 0.75
+
+DIGEST_HEADER = "\n\n#### Earlier pages (digest):\n"
+
+def _fit_digest(digest: str, max_tokens: int) -> tuple:
+    """Keep the newest part of the digest that fits the budget, with its token count"""
+    digest = keep_last_tokens(digest, max_tokens)
+    return digest, count_tokens(digest)
+
+class RollingSummaryContext:
+    """
+    Previous-pages context for page summarization that stays within a fixed
+    token budget: the concise summaries of the last `window_pages` pages
+    verbatim, plus a digest of everything older.
+
+    Pages sliding out of the window are appended to the digest; once the
+    digest no longer fits the budget it is compacted with `digest_chain` to
+    half of its share (so compactions stay periodic rather than per page)
+    and hard-trimmed if the model still overshoots. The "full" strategy
+    keeps the old behaviour of passing every previous page summary.
+
+    Each page is token-counted once, in a worker thread, when it is added;
+    the budget checks add up those cached counts.
+    """
+
+    def __init__(
+        self,
+        strategy: str = SUMMARY_CONTEXT_ROLLING,
+        window_pages: int = 4,
+        token_budget: int = 3000,
+        digest_chain=None
+    ):
+        if strategy not in SUMMARY_CONTEXT_STRATEGIES:
+            raise ValueError(f"Unknown summary context strategy: {strategy}")
+        self.strategy = strategy
+        self.window_pages = max(window_pages, 1)
+        self.token_budget = token_budget
+        self.digest_chain = digest_chain
+        # (formatted page summary, token count) for the verbatim pages
+        self.window = deque()
+        self.window_tokens = 0
+        self.digest = ""
+        self.digest_tokens = 0
+        self.compactions = 0
+        self._full_context = ""
+
+    def render(self) -> str:
+        """Context to pass as `cumulative_concise_summary` for the next page"""
+        if self.strategy == SUMMARY_CONTEXT_FULL:
+            return self._full_context
+        digest = f"{DIGEST_HEADER}{self.digest}\n" if self.digest else ""
+        return digest + "".join(page for page, _ in self.window)
+
+    def context_tokens(self) -> int:
+        """Token cost of render(), from the cached per-part counts"""
+        if not self.digest:
+            return self.window_tokens
+        # +1 for the newline closing the digest
+        return count_tokens(DIGEST_HEADER) + self.digest_tokens + 1 + self.window_tokens
+
+    async def add_page(self, formatted_concise: str) -> None:
+        """Record a summarized page, sliding and compacting the context as needed"""
+        if self.strategy == SUMMARY_CONTEXT_FULL:
+            self._full_context += formatted_concise
+            return
+
+        page_tokens = await asyncio.to_thread(count_tokens, formatted_concise)
+        self.window.append((formatted_concise, page_tokens))
+        self.window_tokens += page_tokens
+        # Slide by page count, then by budget (always keep the latest page verbatim)
+        while len(self.window) > self.window_pages or (
+            len(self.window) > 1 and self.window_tokens > self.token_budget
+        ):
+            page, page_tokens = self.window.popleft()
+            self.window_tokens -= page_tokens
+            self.digest += page
+            self.digest_tokens += page_tokens
+
+        if self.digest and self.context_tokens() > self.token_budget:
+            await self._compact()
+
+    async def _compact(self) -> None:
+        """Shrink the digest so the whole context fits the token budget again"""
+        digest_budget = max(
+            self.token_budget - self.window_tokens - count_tokens(DIGEST_HEADER) - 1, 0
+        )
+        if self.digest_chain is not None and digest_budget > 0:
+            try:
+                result = await self.digest_chain.ainvoke({
+                    "earlier_pages_summary": self.digest,
+                    "max_words": max(int(digest_budget * APPROX_WORDS_PER_TOKEN) // 2, 1)
+                })
+                self.digest = result["digest"].strip()
+                self.compactions += 1
+            except Exception as err:
+                raise Exception(f"Summary context compaction failed: {err}")
+        self.digest, self.digest_tokens = await asyncio.to_thread(_fit_digest, self.digest, digest_budget)
+
+    def stats(self) -> dict:
+        """Context settings and compaction count for the lecture stats report"""
+        return {
+            "strategy": self.strategy,
+            "window_pages": self.window_pages,
+            "token_budget": self.token_budget,
+            "digest_compactions": self.compactions
+        }
@@ -0,0 +1,76 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+# Node functions receive the results of their dependencies, keyed by node name
+NodeFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+class TaskGraphError(Exception):
+    """A node failed; the remaining nodes were cancelled"""
+
+    def __init__(self, node: str, err: BaseException):
+        super().__init__(f"Task '{node}' failed: {err}")
+        self.node = node
+        self.original = err
+
+class TaskGraph:
+    """
+    Async scheduler for a dependency graph of coroutines.
+
+    Every node starts as soon as all of its dependencies have finished, so
+    independent branches overlap. The first failure cancels every node still
+    pending or running and is re-raised as a TaskGraphError.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, dict] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, dict] = {}
+
+    def add(self, name: str, fn: NodeFn, deps: Iterable[str] = ()) -> None:
+        """Register a node; dependencies must already be registered"""
+        if name in self._nodes:
+            raise ValueError(f"Duplicate task: {name}")
+        deps = tuple(deps)
+        for dep in deps:
+            if dep not in self._nodes:
+                raise ValueError(f"Task '{name}' depends on unknown task '{dep}'")
+        self._nodes[name] = {"fn": fn, "deps": deps}
+
+    async def _run_node(self, name: str, done: Dict[str, asyncio.Future], started: float) -> None:
+        node = self._nodes[name]
+        await asyncio.gather(*[done[dep] for dep in node["deps"]])
+        start = time.perf_counter()
+        result = await node["fn"]({dep: self.results[dep] for dep in node["deps"]})
+        self.results[name] = result
+        self.timings[name] = {
+            "start_s": round(start - started, 3),
+            "end_s": round(time.perf_counter() - started, 3)
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every node, returning the results by node name"""
+        started = time.perf_counter()
+        done: Dict[str, asyncio.Future] = {}
+        names = {}
+        # Nodes are registered after their dependencies, so creation order is topological
+        for name in self._nodes:
+            done[name] = asyncio.ensure_future(self._run_node(name, done, started))
+            names[done[name]] = name
+
+        pending = set(done.values())
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                failed = [
+                    task for task in finished
+                    if not task.cancelled() and task.exception() is not None
+                ]
+                if failed:
+                    raise TaskGraphError(names[failed[0]], failed[0].exception())
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return self.results
@@ -0,0 +1,101 @@
+import os
+import uuid
+import shutil
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+from core.config import ai_api_secrets
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def _file_sha256_sync(path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Stream a file through SHA-256 without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+async def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file, computed off the event loop"""
+    return await asyncio.to_thread(_file_sha256_sync, path)
+
+class TranscriptCache:
+    """
+    On-disk transcript cache keyed by video content hash and transcription mode.
+
+    Entries are plain text files; reads refresh the file mtime so eviction
+    (oldest mtime first) behaves as an LRU once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(video_hash: str, hinglish: bool) -> str:
+        """Key for one video transcribed in one mode"""
+        return f"{video_hash}_{'hinglish' if hinglish else 'english'}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.txt"
+
+    def _get_sync(self, key: str, target_path: Path) -> bool:
+        entry = self._entry_path(key)
+        with self._lock:
+            if not entry.exists():
+                return False
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(entry, target_path)
+            # Mark as recently used
+            os.utime(entry)
+        return True
+
+    def _put_sync(self, key: str, source_path: Path) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(key)
+        # Copy under a temp name so readers never see a partial entry
+        temp_entry = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(source_path, temp_entry)
+        with self._lock:
+            os.replace(temp_entry, entry)
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total_bytes = 0
+        for entry in self.cache_dir.glob("*.txt"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total_bytes += stat.st_size
+        for _, size, entry in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total_bytes -= size
+
+    async def get(self, key: str, target_path: Path) -> bool:
+        """Copy a cached transcript to target_path; returns False on a miss"""
+        try:
+            return await asyncio.to_thread(self._get_sync, key, target_path)
+        except Exception as err:
+            raise Exception(f"Transcript cache read failed: {err}")
+
+    async def put(self, key: str, source_path: Path) -> None:
+        """Store a finished transcript and evict old entries if needed"""
+        try:
+            await asyncio.to_thread(self._put_sync, key, source_path)
+        except Exception as err:
+            raise Exception(f"Transcript cache write failed: {err}")
+
+def _create_transcript_cache() -> Optional[TranscriptCache]:
+    if not ai_api_secrets.TRANSCRIPT_CACHE_ENABLED:
+        return None
+    cache_dir = ai_api_secrets.TRANSCRIPT_CACHE_DIR or ai_api_secrets.BASE_DIR / "cache" / "transcripts"
+    return TranscriptCache(cache_dir, ai_api_secrets.TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024)
+
+transcript_cache = _create_transcript_cache()
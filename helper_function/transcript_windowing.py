@@ -0,0 +1,120 @@
+import re
+import asyncio
+import tiktoken
+from pathlib import Path
+from typing import List
+from functools import lru_cache
+from helper_function.video_to_pdf_function import paginate_transcript
+
+WINDOWING_PAGE = "page"
+WINDOWING_TOKENS = "tokens"
+WINDOWING_MODES = (WINDOWING_PAGE, WINDOWING_TOKENS)
+
+# Rough characters-per-token ratio used when the tokenizer files are unavailable
+APPROX_CHARS_PER_TOKEN = 4
+
+# Sentence ends: ., ! or ? (optionally followed by a closing quote/bracket) and whitespace
+SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str = "o200k_base"):
+    """Load (once) the tokenizer used for budgeting, or None if it cannot be fetched"""
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        # tiktoken downloads its BPE files on first use; fall back to an estimate offline
+        return None
+
+@lru_cache(maxsize=128)
+def count_tokens(text: str) -> int:
+    """
+    Number of tokens the text costs in a prompt. Memoized, so a prompt
+    counted by the caller, the rate limiter and the metrics is encoded once.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // APPROX_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def _split_oversized(unit: str, max_tokens: int) -> List[str]:
+    """Hard-split a single unit that alone exceeds the budget"""
+    encoding = _get_encoding()
+    if encoding is None:
+        max_chars = max_tokens * APPROX_CHARS_PER_TOKEN
+        return [unit[start:start + max_chars] for start in range(0, len(unit), max_chars)]
+    tokens = encoding.encode(unit, disallowed_special=())
+    return [
+        encoding.decode(tokens[start:start + max_tokens])
+        for start in range(0, len(tokens), max_tokens)
+    ]
+
+def keep_last_tokens(text: str, max_tokens: int) -> str:
+    """The end of the text that fits in `max_tokens` (one encode, one decode)"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        max_chars = max_tokens * APPROX_CHARS_PER_TOKEN
+        return text[-max_chars:] if len(text) > max_chars else text
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[-max_tokens:])
+
+def window_by_tokens(text: str, max_tokens: int, snap_to_sentences: bool = True) -> List[str]:
+    """
+    Split text into windows of at most `max_tokens` tokens.
+
+    With `snap_to_sentences` windows only end on sentence boundaries (unless a
+    single sentence is larger than the budget); otherwise they end on word
+    boundaries.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    
+    if snap_to_sentences:
+        units = [unit for unit in SENTENCE_BOUNDARY_RE.split(text.strip()) if unit]
+    else:
+        units = text.split()
+    
+    windows = []
+    current_units = []
+    current_tokens = 0
+    for unit in units:
+        # +1 for the joining whitespace
+        unit_tokens = count_tokens(unit) + 1
+        if unit_tokens > max_tokens:
+            if current_units:
+                windows.append(" ".join(current_units))
+                current_units, current_tokens = [], 0
+            windows.extend(_split_oversized(unit, max_tokens))
+            continue
+        if current_tokens + unit_tokens > max_tokens and current_units:
+            windows.append(" ".join(current_units))
+            current_units, current_tokens = [], 0
+        current_units.append(unit)
+        current_tokens += unit_tokens
+    if current_units:
+        windows.append(" ".join(current_units))
+    
+    return windows or [""]
+
+async def window_transcript(
+    font_path: Path,
+    text_file_path: Path,
+    windowing_options: dict
+) -> List[str]:
+    """Split a transcript into summary windows using the requested strategy"""
+    try:
+        if windowing_options["mode"] == WINDOWING_PAGE:
+            return await paginate_transcript(font_path=font_path, text_file_path=text_file_path)
+        
+        text = await asyncio.to_thread(text_file_path.read_text, "utf-8")
+        return await asyncio.to_thread(
+            window_by_tokens,
+            text,
+            windowing_options["window_tokens"],
+            windowing_options["snap_to_sentences"]
+        )
+    except Exception as err:
+        raise Exception(f"Transcript windowing failed: {err}")
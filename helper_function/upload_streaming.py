@@ -0,0 +1,47 @@
+import asyncio
+import hashlib
+from pathlib import Path
+from fastapi import UploadFile
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+async def stream_upload_to_file(
+    upload: UploadFile,
+    target_path: Path,
+    max_bytes: int = 0,
+    chunk_size: int = 1024 * 1024
+) -> dict:
+    """
+    Copy an upload to disk in fixed-size chunks, hashing it on the way.
+
+    Memory use stays at one chunk regardless of the upload size. A
+    `max_bytes` of 0 disables the size check; partial files are removed
+    when the limit is hit or the copy fails.
+    """
+    digest = hashlib.sha256()
+    size_bytes = 0
+    output_file = await asyncio.to_thread(target_path.open, "wb")
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size_bytes += len(chunk)
+            if max_bytes and size_bytes > max_bytes:
+                raise UploadTooLargeError(
+                    f"{upload.filename} exceeds the {max_bytes // (1024 * 1024)} MB upload limit"
+                )
+            digest.update(chunk)
+            await asyncio.to_thread(output_file.write, chunk)
+    except Exception:
+        await asyncio.to_thread(output_file.close)
+        await asyncio.to_thread(target_path.unlink, True)
+        raise
+    await asyncio.to_thread(output_file.close)
+    
+    return {
+        "path": target_path,
+        "size_bytes": size_bytes,
+        "sha256": digest.hexdigest()
+    }
@@ -1,113 +1,243 @@
 import os
 import io
+import re
 import json
 import random
 import asyncio
 import tempfile
+import threading
+import subprocess
+import imageio_ffmpeg
 from io import BytesIO
 from pathlib import Path
 from openai import OpenAI
-from typing import Optional
+from typing import Dict, Optional
 from openai import AsyncOpenAI
-from pydub import AudioSegment
-from typing import Union, List
-from moviepy import VideoFileClip
+from typing import Awaitable, Callable, Tuple, Union, List
 from reportlab.pdfgen import canvas
 from langsmith.run_helpers import trace
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PdfWriter
 from reportlab.pdfbase import pdfmetrics
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfbase.ttfonts import TTFont
+from helper_function.metrics import record_transcription
+from helper_function.worker_pools import ffmpeg_semaphore, transcription_semaphore
+from helper_function.rate_limiter import call_with_rate_limit, get_rate_limiter
+
+# "Duration: 01:23:45.67" line of ffmpeg's input header
+DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+def probe_media_duration_seconds(path: Path) -> Optional[float]:
+    """Container duration from the ffmpeg header dump (no decoding); None if unreadable"""
+    result = subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-hide_banner", "-i", str(path)],
+        capture_output=True
+    )
+    # ffmpeg exits non-zero without an output file; the header is still on stderr
+    match = DURATION_RE.search(result.stderr.decode(errors="replace"))
+    if match is None:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
 
-async def video_to_audio(video_path: Path, output_path: Path) -> Path:
-    """Convert video to audio regardless of length"""
+async def video_to_speech_segments(
+    video_path: Path,
+    output_dir: Path,
+    segment_seconds: int,
+    bitrate: str = "32k",
+    sample_rate: int = 16000
+) -> List[Path]:
+    """
+    Extract the audio track straight into mono, low-bitrate MP3 segments with
+    a single ffmpeg pass, run as an asyncio subprocess.
+    """
     # Validate input path
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
-    try:
-        # Process video in chunks
-        with VideoFileClip(video_path) as video:
-            audio = video.audio
-            audio.write_audiofile(
-                output_path,
-                codec='mp3',
-                bitrate='192k',
-                logger=None  # Disable progress bar for cleaner output
-            )
-        return output_path
-    except Exception as e:
-        # Clean up partial files on error
-        if os.path.exists(output_path):
-            os.remove(output_path)
-        raise RuntimeError(f"Conversion failed: {str(e)}")
-    
-async def save_text_to_pdf(
+    stem = Path(video_path).stem
+    output_pattern = output_dir / f"{stem}_segment_%03d.mp3"
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-i", str(video_path),
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-c:a", "libmp3lame", "-b:a", bitrate,
+        "-f", "segment", "-segment_time", str(segment_seconds), "-reset_timestamps", "1",
+        str(output_pattern)
+    ]
+    async with ffmpeg_semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+    if process.returncode != 0:
+        # Clean up partial segments on error
+        for segment in output_dir.glob(f"{stem}_segment_*.mp3"):
+            segment.unlink(missing_ok=True)
+        raise RuntimeError(f"Conversion failed: {stderr.decode(errors='replace').strip()}")
+    
+    segments = sorted(output_dir.glob(f"{stem}_segment_*.mp3"))
+    if not segments:
+        raise RuntimeError(f"Conversion failed: no audio extracted from {video_path}")
+    return segments
+
+# Page layout used for transcript pages (letter size, 12pt)
+PDF_FONT_SIZE = 12
+PDF_TOP_Y = 750
+PDF_BOTTOM_Y = 50
+PDF_LINE_HEIGHT = 20
+PDF_LINES_PER_PAGE = (PDF_TOP_Y - PDF_BOTTOM_Y) // PDF_LINE_HEIGHT + 1
+# Distinct words remembered per font before the width memo is reset
+MAX_MEMOIZED_WORDS = 200_000
+
+class PdfRenderContext:
+    """
+    Process-wide rendering state for one TTF font.
+
+    The font is parsed and registered with reportlab once; its glyph width
+    table (1/1000 em units) is copied out so words are measured without going
+    through pdfmetrics, and word widths are memoized across renders. Safe to
+    share between the asyncio.to_thread workers: the memo only ever gains
+    entries with the same value for a word.
+    """
+
+    def __init__(self, font_path: Path):
+        self.font_path = Path(font_path)
+        self.font_name = self.font_path.stem
+        font = TTFont(self.font_name, str(self.font_path))
+        pdfmetrics.registerFont(font)
+        self._char_units = dict(font.face.charWidths)
+        self._default_units = font.face.defaultWidth
+        self._space_units = self.word_units(" ")
+        self._word_units: Dict[str, float] = {}
+
+    def word_units(self, word: str) -> float:
+        """Width of a word in glyph units, as reportlab's stringWidth at size 1000"""
+        get = self._char_units.get
+        default = self._default_units
+        return sum(get(ord(char), default) for char in word)
+
+    def layout_lines(self, text: str, max_width: float) -> List[str]:
+        """
+        Break text into the lines that would be drawn on the PDF canvas.
+
+        Line widths are accumulated in glyph units (additive and exact), so
+        layout is linear in the text length and breaks exactly where
+        measuring the whole line would.
+        """
+        if len(self._word_units) > MAX_MEMOIZED_WORDS:
+            self._word_units = {}
+        word_units = self._word_units
+        scale = 0.001 * PDF_FONT_SIZE
+        lines = []
+        current_line = []
+        line_units = 0
+        for word in text.split():
+            units = word_units.get(word)
+            if units is None:
+                units = word_units[word] = self.word_units(word)
+            test_units = line_units + self._space_units + units if current_line else units
+            if scale * test_units > max_width:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                line_units = units
+            else:
+                current_line.append(word)
+                line_units = test_units
+        if current_line:
+            lines.append(' '.join(current_line))
+        return lines
+
+    def render_pdf(self, text: str, output_path: Path, page_width: int = 580, page_margin: int = 20) -> None:
+        """Draw text onto letter pages, one text object per page"""
+        c = canvas.Canvas(str(output_path), pagesize=letter)
+        lines = self.layout_lines(text, page_width - 2 * page_margin)
+        for start in range(0, len(lines), PDF_LINES_PER_PAGE):
+            if start:
+                c.showPage()
+            text_object = c.beginText(page_margin, PDF_TOP_Y)
+            text_object.setFont(self.font_name, PDF_FONT_SIZE, leading=PDF_LINE_HEIGHT)
+            text_object.textLines(lines[start:start + PDF_LINES_PER_PAGE])
+            c.drawText(text_object)
+        c.save()
+
+_render_contexts: Dict[Path, PdfRenderContext] = {}
+_render_contexts_lock = threading.Lock()
+
+def get_render_context(font_path: Path) -> PdfRenderContext:
+    """The shared rendering context for a font, created on first use"""
+    key = Path(font_path).resolve()
+    context = _render_contexts.get(key)
+    if context is None:
+        with _render_contexts_lock:
+            context = _render_contexts.get(key)
+            if context is None:
+                context = _render_contexts[key] = PdfRenderContext(key)
+    return context
+
+def paginate_text(
+    text: str,
+    font_path: Path,
+    page_width: int = 580,
+    page_margin: int = 20,
+) -> List[str]:
+    """
+    Split transcript text into the same page-sized windows that
+    save_text_to_pdf produces, without rendering or re-parsing a PDF.
+    """
+    lines = get_render_context(font_path).layout_lines(text, page_width - 2 * page_margin)
+    pages = [
+        "\n".join(lines[start:start + PDF_LINES_PER_PAGE])
+        for start in range(0, len(lines), PDF_LINES_PER_PAGE)
+    ]
+    # An empty transcript still renders as one blank page
+    return pages or [""]
+
+async def paginate_transcript(
     font_path: Path,
-    output_path: Path,
     text_file_path: Path,
     page_width: int = 580,
     page_margin: int = 20,
-) -> None:
+) -> List[str]:
+    """Read a transcript file and split it into page-sized text windows"""
     try:
-        # Read text from the provided text file without blocking the event loop
         text = await asyncio.to_thread(text_file_path.read_text, "utf-8")
-        def _generate_pdf():
-            # Register font and setup canvas
-            pdfmetrics.registerFont(TTFont("Poppins", str(font_path)))
-            c = canvas.Canvas(str(output_path), pagesize=letter)
-            c.setFont("Poppins", 12)
-            # Layout parameters
-            x, y = page_margin, 750
-            line_height = 20
-            words = text.split()
-            current_line = []
-            # Text layout algorithm
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                if c.stringWidth(test_line, "Poppins", 12) > (page_width - 2 * page_margin):
-                    c.drawString(x, y, ' '.join(current_line))
-                    y -= line_height
-                    current_line = [word]
-                    if y < 50:  # New page check
-                        c.showPage()
-                        c.setFont("Poppins", 12)
-                        y = 750
-                else:
-                    current_line.append(word)
-            # Render remaining text
-            if current_line:
-                c.drawString(x, y, ' '.join(current_line))
-            c.save()
-        # Execute blocking PDF generation in thread
-        await asyncio.to_thread(_generate_pdf)
+        return await asyncio.to_thread(paginate_text, text, font_path, page_width, page_margin)
     except Exception as err:
-        raise Exception(f"something went wrong {err}")
-
-async def split_pdf(input_pdf_path: Path, output_folder: Path) -> int:
-    try:
-        # Open the PDF file
-        reader = await _read_pdf(input_pdf_path)
-        total_pages = len(reader.pages)
-        
-        # Iterate through all pages
-        for i, page in enumerate(reader.pages, start=1):
-            writer = PdfWriter()
-            writer.add_page(page)
+        raise Exception(f"Transcript pagination failed: {err}")
 
-            out_path = output_folder / f"page_{i}.pdf"
-            # Write the single-page PDF in a thread
-            await write_file(out_path, writer)
-        return total_pages
-    except Exception as err:
-        raise Exception(f"something went wrong {err}")
-    
-async def _read_pdf(path: Path) -> PdfReader:
+async def save_texts_to_pdf(
+    font_path: Path,
+    jobs: List[Tuple[Path, Path]],
+    page_width: int = 580,
+    page_margin: int = 20,
+) -> None:
+    """Render several (text_file_path, output_path) transcripts in one worker thread"""
     try:
-        return await asyncio.to_thread(PdfReader, path)
+        def _generate_pdfs():
+            context = get_render_context(font_path)
+            for text_file_path, output_path in jobs:
+                text = Path(text_file_path).read_text("utf-8")
+                context.render_pdf(text, output_path, page_width, page_margin)
+        # Execute blocking PDF generation in thread
+        await asyncio.to_thread(_generate_pdfs)
     except Exception as err:
         raise Exception(f"something went wrong {err}")
-    
+
+async def save_text_to_pdf(
+    font_path: Path,
+    output_path: Path,
+    text_file_path: Path,
+    page_width: int = 580,
+    page_margin: int = 20,
+) -> None:
+    await save_texts_to_pdf(font_path, [(text_file_path, output_path)], page_width, page_margin)
+
 async def write_file(
     path: Path,
     content: Union[bytes, PdfWriter, str, dict],
@@ -144,81 +274,79 @@ async def write_file(
     except Exception as err:
         raise Exception(f"File write error: {err}")
     
-async def audio_to_text(
-    path: Path,
+async def segments_to_text(
+    segment_paths: List[Path],
     text_file_path: Path,
     hinglish: bool = False,
+    client: Optional[AsyncOpenAI] = None,
+    on_chunk: Optional[Callable[[int, str], Awaitable[None]]] = None,
+    chunk_concurrency: int = 4,
 ) -> Path:
     """
-    Robust async audio transcription with automatic chunking.
-    
-    Handles both Whisper-1 and GPT-4o-transcribe limits:
-    - Whisper-1: 25MB file limit
-    - GPT-4o-transcribe: 25MB file limit + 1500 seconds (25 min) duration limit
+    Transcribe audio that was already cut into API-sized segments.
     
-    Args:
-        path: Path to audio file
-        text_file_path: Path where transcript will be saved
-        hinglish: If True, uses GPT-4o-transcribe with Hinglish prompt
+    Segments from video_to_speech_segments are uploaded as-is: there is no
+    decode/re-encode step. A single segment is written like an unchunked
+    transcript; several are transcribed concurrently and written in order.
     
     Returns:
         Path to the saved transcript file
     """
-    client = AsyncOpenAI()
-    
-    file_size_mb = os.path.getsize(path) / (1024 * 1024)
-    # Load audio metadata to check if chunking is needed
-    audio = await asyncio.to_thread(AudioSegment.from_file, path)
-    duration_seconds = len(audio) / 1000
-    
+    # Retries happen in call_with_rate_limit, not in the SDK
+    client = client or AsyncOpenAI(max_retries=0)
+    
+    # Header-only probe with the bundled ffmpeg (no system ffprobe needed)
+    durations = [
+        duration or 0.0
+        for duration in await asyncio.gather(*[
+            asyncio.to_thread(probe_media_duration_seconds, segment) for segment in segment_paths
+        ])
+    ]
+    duration_seconds = sum(durations)
+    file_size_mb = sum(os.path.getsize(segment) for segment in segment_paths) / (1024 * 1024)
     
     # Ensure output directory exists
     text_file_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Determine if chunking is needed
-    needs_chunking = False
-    # GPT-4o-transcribe: 1500s duration limit + 2000 token output limit
-    # For Hinglish: use shorter chunks (10 min = 600s) to avoid output token limit
-    max_duration = 600 if hinglish else 1400  # Whisper can handle longer chunks
-    
-    if hinglish:
-        # GPT-4o has strict 2000 token output limit - chunk more aggressively
-        if duration_seconds > max_duration or file_size_mb > 24:
-            needs_chunking = True
-    else:
-        # Whisper only has 25MB file limit
-        if file_size_mb > 24:
-            needs_chunking = True
-    
     # Calculate estimated cost
     cost_per_minute = 0.006  # Whisper/GPT-4o cost
     estimated_cost = (duration_seconds / 60) * cost_per_minute
     
     # Setup trace
-    name = "whisper-translate_audio_chunks" if not hinglish else "gpt-4o-transcribe-translate_audio_chunks_hinglish"
+    name = "whisper-translate_audio_segments" if not hinglish else "gpt-4o-transcribe-translate_audio_segments_hinglish"
     tags = ["translation", "whisper" if not hinglish else "gpt-4o-transcribe-hinglish"]
     
     async with trace(
         name=name,
         run_type="tool",
-        inputs={"file_path": str(path), "duration_seconds": duration_seconds, "file_size_mb": file_size_mb},
+        inputs={
+            "segments": [str(segment) for segment in segment_paths],
+            "duration_seconds": duration_seconds,
+            "file_size_mb": file_size_mb
+        },
         tags=tags,
     ) as run:
         try:
-            if not needs_chunking:
-                # Process entire file at once
-                transcript = await _transcribe_file(client, path, hinglish)
+            if len(segment_paths) == 1:
+                transcript = await _transcribe_file(client, segment_paths[0], hinglish)
                 # Write synchronously to ensure it completes
                 _write_transcript_sync(text_file_path, transcript, append=False)
                 full_text = transcript
+                if on_chunk is not None:
+                    await on_chunk(0, transcript)
             else:
-                # Process in chunks
-                full_text = await _transcribe_in_chunks(client, audio, text_file_path, hinglish, max_duration)
+                full_text = await _transcribe_ordered(
+                    client, segment_paths, durations, text_file_path, hinglish, on_chunk,
+                    max_concurrency=chunk_concurrency
+                )
             
             run.end(
                 outputs={"translation": full_text},
                 metadata={"cost_usd": round(estimated_cost, 6)}
             )
+            record_transcription(
+                "gpt-4o-transcribe" if hinglish else "whisper-1", duration_seconds, estimated_cost
+            )
         except Exception as e:
             run.end(error=str(e))
             raise
@@ -239,9 +367,9 @@ async def _transcribe_file(
     audio_file = BytesIO(file_content)
     audio_file.name = file_path.name  # OpenAI needs a name attribute
     
-    try:
+    async def _request():
         if hinglish:
-            response = await client.audio.transcriptions.create(
+            return await client.audio.transcriptions.create(
                 model="gpt-4o-transcribe",
                 file=audio_file,
                 response_format="text",
@@ -254,84 +382,83 @@ async def _transcribe_file(
                     "5. Output only the final English text with inline Hindi words—no extra commentary."
                 ),
             )
-        else:
-            response = await client.audio.translations.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text"
-            )
-        
+        return await client.audio.translations.create(
+            model="whisper-1",
+            file=audio_file,
+            response_format="text"
+        )
+    
+    async def _call():
+        # A fresh read position for every attempt
+        audio_file.seek(0)
+        # Only the HTTP call holds a slot, not the rate-limit wait or backoff
+        async with transcription_semaphore:
+            return await _request()
+    
+    try:
+        # Shared audio budget; throttled calls back off and retry
+        response = await call_with_rate_limit(get_rate_limiter("openai_audio"), _call)
         return response.text if hasattr(response, 'text') else str(response)
     
     except Exception as e:
         raise RuntimeError(f"Transcription API call failed for {file_path.name}: {e}") from e
 
-async def _transcribe_in_chunks(
+async def _transcribe_ordered(
     client: AsyncOpenAI,
-    audio: AudioSegment,
+    chunk_paths: List[Path],
+    chunk_durations: List[float],
     text_file_path: Path,
     hinglish: bool,
-    max_chunk_seconds: int
+    on_chunk: Optional[Callable[[int, str], Awaitable[None]]] = None,
+    max_concurrency: int = 4
 ) -> str:
-    """Transcribe audio in chunks and append to file immediately."""
-    duration_ms = len(audio)
-    chunk_ms = max_chunk_seconds * 1000
-    chunk_index = 0
+    """
+    Transcribe chunks concurrently and append them to the file in order.
     
+    Up to `max_concurrency` chunks are transcribed at once. Each finished
+    chunk is written as soon as every earlier chunk has been written, so the
+    file always holds an in-order prefix of the transcript.
+    """
     # Clear the file first (synchronously to ensure it happens)
     _write_transcript_sync(text_file_path, "", append=False)
     
+    semaphore = asyncio.Semaphore(max_concurrency)
+    write_lock = asyncio.Lock()
+    finished = {}  # chunk_index -> transcript, waiting for earlier chunks
     all_transcripts = []  # Keep track for returning full text
-    start_ms = 0
     
-    while start_ms < duration_ms:
-        end_ms = min(start_ms + chunk_ms, duration_ms)
-        chunk = audio[start_ms:end_ms]
-        chunk_duration = (end_ms - start_ms) / 1000
-        
-        # Export chunk to temporary file
-        temp_file = text_file_path.parent / f"temp_chunk_{chunk_index}.mp3"
+    async def _process(chunk_index: int):
         try:
-            # Export chunk (in thread to not block)
-            await asyncio.to_thread(
-                chunk.export,
-                str(temp_file),
-                format="mp3",
-                bitrate="128k"  # Lower bitrate to stay under 25MB
-            )
-            
-            
-            
-            # Transcribe chunk
-            transcript = await _transcribe_file(client, temp_file, hinglish)
-            
-            
-            
-            # IMMEDIATELY write to file SYNCHRONOUSLY (no threading, no delays)
-            chunk_text = f"--- CHUNK {chunk_index} ({chunk_duration:.1f}s) ---\n{transcript.strip()}\n\n"
-            _write_transcript_sync(text_file_path, chunk_text, append=True)
-            
-            # Also keep in memory for final return
-            all_transcripts.append(transcript.strip())
-            
-            
-            
+            async with semaphore:
+                # Throttled and transient failures are retried inside _transcribe_file
+                transcript = await _transcribe_file(client, chunk_paths[chunk_index], hinglish)
         except Exception as e:
             # Log error and fail immediately
             error_msg = f"--- CHUNK {chunk_index} FAILED: {str(e)} ---\n\n"
             _write_transcript_sync(text_file_path, error_msg, append=True)
             raise RuntimeError(f"Failed to transcribe chunk {chunk_index}: {e}") from e
         
-        finally:
-            # Clean up temp file
-            if temp_file.exists():
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
-        
-        chunk_index += 1
-        start_ms = end_ms
+        async with write_lock:
+            finished[chunk_index] = transcript.strip()
+            # Flush every chunk that is now contiguous with what's been written
+            while len(all_transcripts) in finished:
+                next_index = len(all_transcripts)
+                next_text = finished.pop(next_index)
+                chunk_text = f"--- CHUNK {next_index} ({chunk_durations[next_index]:.1f}s) ---\n{next_text}\n\n"
+                _write_transcript_sync(text_file_path, chunk_text, append=True)
+                all_transcripts.append(next_text)
+                if on_chunk is not None:
+                    await on_chunk(next_index, next_text)
+    
+    tasks = [asyncio.create_task(_process(chunk_index)) for chunk_index in range(len(chunk_durations))]
+    try:
+        await asyncio.gather(*tasks)
+    except Exception:
+        # One chunk failed for good: stop the rest
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
     
     # Return combined text for the trace output
     return "\n".join(all_transcripts)
@@ -0,0 +1,8 @@
+import asyncio
+from core.config import ai_api_secrets
+
+# Limits concurrent ffmpeg speech-extraction processes across all requests
+ffmpeg_semaphore = asyncio.Semaphore(ai_api_secrets.INGEST_FFMPEG_PROCESSES)
+
+# Limits in-flight transcription API calls (not lectures) across all requests
+transcription_semaphore = asyncio.Semaphore(ai_api_secrets.TRANSCRIPTION_CONCURRENCY)
@@ -1,10 +1,43 @@
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import Response
 from core.routes import api_router
+from core.config import ai_api_secrets
+from contextlib import asynccontextmanager
+from helper_function.job_manager import job_manager
+from helper_function.transcript_windowing import count_tokens
+from helper_function.video_to_pdf_function import get_render_context
+from helper_function.metrics import registry, PROMETHEUS_CONTENT_TYPE
+from ai_features.views.QuestionAnswerGenerationModel import (
+    build_chain_registry,
+    close_chain_registry,
+    create_shared_http_client
+)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build model clients and chains once for the whole process
+    app.state.chain_registry = build_chain_registry(create_shared_http_client())
+    # Parse and register the transcript font once, before the first render
+    await asyncio.to_thread(get_render_context, ai_api_secrets.BASE_DIR / "font" / "Poppins-Regular.ttf")
+    # Load the tokenizer (downloading its BPE file on first run) off the event loop
+    await asyncio.to_thread(count_tokens, "")
+    # Expire finished background jobs that were never deleted
+    job_reaper = asyncio.create_task(job_manager.run_reaper(ai_api_secrets.JOB_REAPER_INTERVAL_SECONDS))
+    yield
+    job_reaper.cancel()
+    await asyncio.gather(job_reaper, return_exceptions=True)
+    await close_chain_registry(app.state.chain_registry)
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(api_router)
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint: stage latencies, token/cost counters and queue gauges"""
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 
 
 #uvicorn main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
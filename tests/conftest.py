@@ -0,0 +1,6 @@
+import os
+
+# core.config requires the provider settings at import time; no test reaches a provider
+for key in ("OPENAI_API_KEY", "GOOGLE_API_KEY", "LANGCHAIN_API_KEY", "LANGCHAIN_PROJECT"):
+    os.environ.setdefault(key, "test")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
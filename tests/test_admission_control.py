@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from helper_function.admission_control import (
+    AdmissionController,
+    AdmissionRejected,
+    estimate_job_cost,
+    FALLBACK_MB_PER_VIDEO_MINUTE
+)
+
+def test_runs_beyond_max_running_wait_for_a_slot():
+    async def _scenario():
+        controller = AdmissionController(max_running=1, max_queued=1)
+        order = []
+
+        async def _run(name: str):
+            async with controller.reserve(1):
+                order.append(("start", name))
+                await asyncio.sleep(0.02)
+                order.append(("end", name))
+
+        first = asyncio.ensure_future(_run("first"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(_run("second"))
+        await asyncio.sleep(0.005)
+        assert controller.stats()["running"] == 1
+        assert controller.stats()["waiting"] == 1
+        await asyncio.gather(first, second)
+        return controller, order
+
+    controller, order = asyncio.run(_scenario())
+    assert order == [("start", "first"), ("end", "first"), ("start", "second"), ("end", "second")]
+    assert controller.running == 0 and controller.waiting == 0 and controller.admitted_cost == 0
+
+def test_full_queue_is_rejected_with_503():
+    async def _scenario():
+        controller = AdmissionController(max_running=1, max_queued=1)
+        running = controller.reserve(1)
+        await running.__aenter__()
+        queued = controller.reserve(1)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            controller.reserve(1)
+        queued.release()
+        await running.__aexit__(None, None, None)
+        return controller, excinfo.value
+
+    controller, rejection = asyncio.run(_scenario())
+    assert rejection.status_code == 503
+    assert rejection.retry_after >= 1
+    assert controller.rejected == 1
+
+def test_cost_cap_rejects_with_429_unless_idle():
+    async def _scenario():
+        controller = AdmissionController(max_running=4, max_queued=4, max_cost=60)
+        # An oversized job is admitted on an idle service
+        oversized = controller.reserve(90)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            controller.reserve(1)
+        oversized.release()
+        small = controller.reserve(30)
+        also_small = controller.reserve(30)
+        small.release()
+        also_small.release()
+        return controller, excinfo.value
+
+    controller, rejection = asyncio.run(_scenario())
+    assert rejection.status_code == 429
+    assert controller.admitted_cost == 0 and controller.waiting == 0
+
+def test_cancelled_wait_gives_the_reservation_back():
+    async def _scenario():
+        controller = AdmissionController(max_running=1, max_queued=2)
+        running = controller.reserve(5)
+        await running.__aenter__()
+
+        async def _wait():
+            async with controller.reserve(5):
+                pass
+
+        waiter = asyncio.ensure_future(_wait())
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await running.__aexit__(None, None, None)
+        return controller
+
+    controller = asyncio.run(_scenario())
+    assert controller.running == 0 and controller.waiting == 0 and controller.admitted_cost == 0
+
+def test_estimate_job_cost_falls_back_to_file_size():
+    videos = [
+        {"duration_seconds": 600, "size_bytes": 1},
+        {"duration_seconds": None, "size_bytes": int(FALLBACK_MB_PER_VIDEO_MINUTE * 1024 * 1024 * 3)}
+    ]
+    assert estimate_job_cost(videos) == pytest.approx(13)
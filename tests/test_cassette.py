@@ -0,0 +1,172 @@
+import io
+import json
+import asyncio
+import pytest
+from types import SimpleNamespace
+from langchain_core.prompt_values import StringPromptValue
+from helper_function.cassette import (
+    CassetteAudioClient,
+    CassetteMiss,
+    ModelCassette,
+    ReplayedProviderError,
+    cassette_fan_out,
+    cassette_model
+)
+
+SCHEMA = {"title": "questions", "type": "object"}
+
+class ProviderError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+class FakeStructuredModel:
+    """Answers with a counter so repeated calls to the same prompt are distinguishable"""
+
+    def __init__(self, fail_first: bool = False):
+        self.calls = 0
+        self.fail_first = fail_first
+
+    def invoke(self, prompt_value):
+        self.calls += 1
+        if self.fail_first and self.calls == 1:
+            raise ProviderError("rate limited", 429)
+        return {"answer": f"{prompt_value.to_string()} #{self.calls}"}
+
+    async def ainvoke(self, prompt_value):
+        return self.invoke(prompt_value)
+
+class FakeAudioClient:
+    def __init__(self):
+        self.calls = 0
+
+        async def _create(model: str, file, **kwargs):
+            self.calls += 1
+            return "transcribed text"
+
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=_create))
+
+class FakeChain:
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.calls = 0
+
+    async def ainvoke(self, inputs: dict):
+        self.calls += 1
+        return self.answer
+
+def _prompt(text: str) -> StringPromptValue:
+    return StringPromptValue(text=text)
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ModelCassette(tmp_path / "cassette.jsonl", "off")
+
+def test_recorded_calls_replay_in_order_without_the_provider(tmp_path):
+    path = tmp_path / "cassettes" / "cassette.jsonl"
+    recorder = cassette_model(FakeStructuredModel(), ModelCassette(path, "record"), "gpt", SCHEMA)
+
+    async def _record():
+        return [await recorder.ainvoke(_prompt("page one")) for _ in range(2)]
+
+    recorded = asyncio.run(_record())
+    assert recorded == [{"answer": "page one #1"}, {"answer": "page one #2"}]
+    assert [json.loads(line)["kind"] for line in path.read_text().splitlines()] == ["chat", "chat"]
+
+    provider = FakeStructuredModel()
+    cassette = ModelCassette(path, "replay", latency_scale=0)
+    player = cassette_model(provider, cassette, "gpt", SCHEMA)
+
+    async def _replay():
+        return [await player.ainvoke(_prompt("page one")) for _ in range(3)]
+
+    # The last recording repeats once the recordings run out
+    assert asyncio.run(_replay()) == recorded + recorded[-1:]
+    assert provider.calls == 0
+    assert cassette.stats()["replayed"] == 3
+
+def test_sync_invoke_records_and_replays(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    recorded = cassette_model(FakeStructuredModel(), ModelCassette(path, "record"), "gpt", SCHEMA).invoke(_prompt("x"))
+    player = cassette_model(FakeStructuredModel(), ModelCassette(path, "replay", latency_scale=0), "gpt", SCHEMA)
+    assert player.invoke(_prompt("x")) == recorded
+
+def test_recording_truncates_an_old_cassette(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    path.write_text('{"key": "stale"}\n')
+    cassette_model(FakeStructuredModel(), ModelCassette(path, "record"), "gpt", SCHEMA).invoke(_prompt("x"))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["key"] != "stale"
+
+def test_provider_errors_are_recorded_and_replayed(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    recorder = cassette_model(FakeStructuredModel(fail_first=True), ModelCassette(path, "record"), "gpt", SCHEMA)
+    with pytest.raises(ProviderError):
+        recorder.invoke(_prompt("x"))
+    recorder.invoke(_prompt("x"))
+
+    player = cassette_model(FakeStructuredModel(), ModelCassette(path, "replay", latency_scale=0), "gpt", SCHEMA)
+    with pytest.raises(ReplayedProviderError) as excinfo:
+        player.invoke(_prompt("x"))
+    assert excinfo.value.status_code == 429
+    assert "ProviderError" in str(excinfo.value)
+    # The retry gets the recorded success
+    assert player.invoke(_prompt("x")) == {"answer": "x #2"}
+
+def test_miss_in_replay_raises(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    cassette_model(FakeStructuredModel(), ModelCassette(path, "record"), "gpt", SCHEMA).invoke(_prompt("x"))
+    cassette = ModelCassette(path, "replay", latency_scale=0)
+    provider = FakeStructuredModel()
+
+    async def _scenario():
+        # A different prompt, and the same prompt to another model, diverge from the recording
+        with pytest.raises(CassetteMiss):
+            await cassette_model(provider, cassette, "gpt", SCHEMA).ainvoke(_prompt("y"))
+        with pytest.raises(CassetteMiss):
+            await cassette_model(provider, cassette, "claude", SCHEMA).ainvoke(_prompt("x"))
+
+    asyncio.run(_scenario())
+    assert cassette.misses == 2
+    assert provider.calls == 0
+
+def test_audio_client_records_and_replays_by_content(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    client = FakeAudioClient()
+
+    async def _transcribe(cassette: ModelCassette, audio: bytes) -> str:
+        wrapped = CassetteAudioClient(client, cassette)
+        return await wrapped.audio.transcriptions.create(model="whisper-1", file=io.BytesIO(audio), language="en")
+
+    assert asyncio.run(_transcribe(ModelCassette(path, "record"), b"audio")) == "transcribed text"
+    replay = ModelCassette(path, "replay", latency_scale=0)
+    assert asyncio.run(_transcribe(replay, b"audio")) == "transcribed text"
+    assert client.calls == 1
+    with pytest.raises(CassetteMiss):
+        asyncio.run(_transcribe(replay, b"other audio"))
+
+def test_fan_out_replays_the_recorded_contributors(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    inputs = {"summary": "page one"}
+
+    async def _record():
+        chains = {"gpt": FakeChain("a"), "claude": FakeChain("b")}
+        return await cassette_fan_out(ModelCassette(path, "record"), chains, inputs)
+
+    answers, report = asyncio.run(_record())
+    assert answers == {"gpt": "a", "claude": "b"}
+
+    # Pretend claude was dropped in the recorded run
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    lines[0]["response"]["contributing_models"] = ["gpt"]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    chains = {"gpt": FakeChain("a"), "claude": FakeChain("b")}
+
+    async def _replay():
+        return await cassette_fan_out(ModelCassette(path, "replay", latency_scale=0), chains, inputs)
+
+    replayed_answers, replayed_report = asyncio.run(_replay())
+    assert replayed_answers == {"gpt": "a"}
+    assert replayed_report["contributing_models"] == ["gpt"]
+    assert chains["claude"].calls == 0
@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from helper_function import rate_limiter
+from helper_function.video_to_pdf_function import _transcribe_ordered
+
+class TransientError(Exception):
+    status_code = 503
+
+class FakeAudioClient:
+    """
+    Translates segment `i` to "text i" after `delays[i]` seconds. Segments in
+    `fail` raise their error instead; `flaky` segments fail once, then succeed.
+    """
+
+    def __init__(self, delays: dict, fail: dict = None, flaky: set = None):
+        self.delays = delays
+        self.fail = fail or {}
+        self.flaky = set(flaky or ())
+        self.calls = []
+        self.cancelled = []
+        self.audio = SimpleNamespace(translations=SimpleNamespace(create=self._create))
+
+    async def _create(self, model: str, file, response_format: str):
+        index = int(file.name.split("_")[1].split(".")[0])
+        self.calls.append(index)
+        try:
+            await asyncio.sleep(self.delays[index])
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        if index in self.fail:
+            raise self.fail[index]
+        if index in self.flaky:
+            self.flaky.discard(index)
+            raise TransientError("try again")
+        return f"text {index}"
+
+@pytest.fixture
+def segments(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"segment_{i}.mp3"
+        path.write_bytes(b"audio %d" % i)
+        paths.append(path)
+    return paths
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+def _transcribe(client, segments, text_file, on_chunk=None, max_concurrency=4):
+    return asyncio.run(_transcribe_ordered(
+        client, segments, [10.0] * len(segments), text_file, False, on_chunk, max_concurrency=max_concurrency
+    ))
+
+def test_out_of_order_segments_are_written_in_order(segments, tmp_path):
+    text_file = tmp_path / "transcript.txt"
+    client = FakeAudioClient({0: 0.06, 1: 0.01, 2: 0.04, 3: 0})
+    callbacks = []
+
+    async def _on_chunk(index: int, text: str):
+        # The file always holds an in-order prefix when a chunk is reported
+        callbacks.append((index, text, text_file.read_text(encoding="utf-8")))
+
+    full_text = _transcribe(client, segments, text_file, _on_chunk)
+    expected = "".join(f"--- CHUNK {i} (10.0s) ---\ntext {i}\n\n" for i in range(4))
+    assert text_file.read_text(encoding="utf-8") == expected
+    assert full_text == "\n".join(f"text {i}" for i in range(4))
+    assert [(index, text) for index, text, _ in callbacks] == [(i, f"text {i}") for i in range(4)]
+    for index, _, file_text in callbacks:
+        assert file_text == "".join(f"--- CHUNK {i} (10.0s) ---\ntext {i}\n\n" for i in range(index + 1))
+
+def test_concurrency_limit_is_respected(segments, tmp_path):
+    client = FakeAudioClient({0: 0.02, 1: 0.02, 2: 0.02, 3: 0.02})
+    in_flight = []
+    peak = []
+    create = client._create
+
+    async def _tracking_create(**kwargs):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        try:
+            return await create(**kwargs)
+        finally:
+            in_flight.pop()
+
+    client.audio.translations.create = _tracking_create
+    _transcribe(client, segments, tmp_path / "transcript.txt", max_concurrency=2)
+    assert max(peak) == 2
+
+def test_transient_failure_is_retried_for_that_segment_only(segments, tmp_path):
+    text_file = tmp_path / "transcript.txt"
+    client = FakeAudioClient({0: 0, 1: 0, 2: 0, 3: 0}, flaky={2})
+    _transcribe(client, segments, text_file)
+    assert sorted(client.calls) == [0, 1, 2, 2, 3]
+    assert "text 2" in text_file.read_text(encoding="utf-8")
+
+def test_failed_segment_cancels_the_pending_ones(segments, tmp_path):
+    text_file = tmp_path / "transcript.txt"
+    client = FakeAudioClient({0: 0, 1: 0.01, 2: 5, 3: 5}, fail={1: ValueError("bad audio")})
+    callbacks = []
+
+    async def _on_chunk(index: int, text: str):
+        callbacks.append(index)
+
+    with pytest.raises(RuntimeError, match="chunk 1"):
+        _transcribe(client, segments, text_file, _on_chunk)
+    assert sorted(client.cancelled) == [2, 3]
+    assert callbacks == [0]
+    written = text_file.read_text(encoding="utf-8")
+    assert written.startswith("--- CHUNK 0 (10.0s) ---\ntext 0\n\n--- CHUNK 1 FAILED:")
+    assert "text 2" not in written and "text 3" not in written
@@ -0,0 +1,76 @@
+import asyncio
+from helper_function.job_manager import JobManager, JOB_COMPLETED, JOB_FAILED
+from ai_features.views import QuestionAnswerJobs as jobs_view
+
+def test_job_runs_and_finishes():
+    async def _scenario():
+        manager = JobManager(max_workers=1)
+        finished = []
+
+        async def _job():
+            await asyncio.sleep(0)
+
+        job = manager.submit("job", _job, {}, on_finished=lambda: finished.append(True))
+        await asyncio.sleep(0.01)
+        return job, finished
+
+    job, finished = asyncio.run(_scenario())
+    assert job["status"] == JOB_COMPLETED
+    assert finished == [True]
+
+def test_remove_waits_for_the_cancelled_job():
+    async def _scenario():
+        manager = JobManager(max_workers=1)
+        unwound = []
+
+        async def _job():
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # Cancellation still has work to do before the task ends
+                await asyncio.sleep(0.01)
+                unwound.append(True)
+
+        job = manager.submit("job", _job, {})
+        await asyncio.sleep(0)
+        removed = await manager.remove("job")
+        return job, removed, unwound, manager
+
+    job, removed, unwound, manager = asyncio.run(_scenario())
+    assert removed is job
+    assert unwound == [True]
+    assert job["status"] == JOB_FAILED and job["error"] == "Job cancelled"
+    assert manager.get("job") is None
+
+def test_deleting_a_running_job_removes_its_workspace(tmp_path, monkeypatch):
+    data_dir = tmp_path / "job"
+    data_dir.mkdir()
+    manager = JobManager(max_workers=1)
+    monkeypatch.setattr(jobs_view, "job_manager", manager)
+
+    async def _scenario():
+        started = asyncio.Event()
+
+        async def _job():
+            try:
+                started.set()
+                while True:
+                    (data_dir / "partial.txt").write_text("working")
+                    await asyncio.sleep(0.001)
+            finally:
+                # Like cleanup_intermediates: the job still touches its workspace while unwinding
+                await asyncio.sleep(0.01)
+                (data_dir / "intermediate").mkdir(parents=True, exist_ok=True)
+                (data_dir / "intermediate" / "late.txt").write_text("late write")
+
+        manager.submit("job", _job, {"data_dir": data_dir})
+        await started.wait()
+        response = await jobs_view.DeleteQuestionAnswerJob("job")
+        # The server keeps running; nothing may reappear afterwards
+        await asyncio.sleep(0.05)
+        return response
+
+    response = asyncio.run(_scenario())
+    assert response.status_code == 200
+    assert not data_dir.exists()
+    assert manager.get("job") is None
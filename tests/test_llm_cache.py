@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from langchain_core.prompt_values import StringPromptValue
+from helper_function import llm_cache
+from helper_function.llm_cache import LLMResponseCache, cached_structured_model
+
+SCHEMA = {"title": "summary", "type": "object", "properties": {"summary": {"type": "string"}}}
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic time for TTL and LRU ordering"""
+    now = {"value": 1_000.0}
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now["value"]))
+    return now
+
+def _cache(tmp_path, ttl_seconds: int = 3600, max_entries: int = 100) -> LLMResponseCache:
+    return LLMResponseCache(tmp_path / "cache" / "llm.sqlite3", ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+class FakeStructuredModel:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt_value):
+        self.calls += 1
+        return {"summary": prompt_value.to_string().upper()}
+
+    async def ainvoke(self, prompt_value):
+        return self.invoke(prompt_value)
+
+def test_key_is_stable_and_covers_model_prompt_and_schema():
+    key = LLMResponseCache.make_key("gpt", "prompt", SCHEMA)
+    assert key == LLMResponseCache.make_key("gpt", "prompt", dict(reversed(list(SCHEMA.items()))))
+    assert key != LLMResponseCache.make_key("claude", "prompt", SCHEMA)
+    assert key != LLMResponseCache.make_key("gpt", "prompt ", SCHEMA)
+    assert key != LLMResponseCache.make_key("gpt", "prompt", {**SCHEMA, "title": "questions"})
+    # Parts are separated, so shifting text between them changes the key
+    assert LLMResponseCache.make_key("ab", "c", SCHEMA) != LLMResponseCache.make_key("a", "bc", SCHEMA)
+
+def test_roundtrip_and_hit_miss_counters(tmp_path, clock):
+    cache = _cache(tmp_path)
+    key = cache.make_key("gpt", "prompt", SCHEMA)
+    assert cache.get_sync(key) is None
+    cache.put_sync(key, "gpt", {"summary": "x", "points": [1, 2]})
+    assert cache.get_sync(key) == {"summary": "x", "points": [1, 2]}
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+def test_expired_entries_are_misses(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=60)
+    cache.put_sync("key", "gpt", {"summary": "x"})
+    clock["value"] += 61
+    assert cache.get_sync("key") is None
+
+def test_max_entries_evicts_least_recently_used(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.put_sync("a", "gpt", "A")
+    clock["value"] += 1
+    cache.put_sync("b", "gpt", "B")
+    clock["value"] += 1
+    # Reading "a" makes "b" the least recently used
+    assert cache.get_sync("a") == "A"
+    clock["value"] += 1
+    cache.put_sync("c", "gpt", "C")
+    assert cache.stats()["entries"] == 2
+    assert cache.get_sync("b") is None
+    assert cache.get_sync("a") == "A"
+    assert cache.get_sync("c") == "C"
+
+def test_cached_model_answers_repeated_prompts_from_the_cache(tmp_path):
+    cache = _cache(tmp_path)
+    model = FakeStructuredModel()
+    cached = cached_structured_model(model, cache, "gpt", SCHEMA)
+    prompt = StringPromptValue(text="summarize page one")
+
+    async def _scenario():
+        return [await cached.ainvoke(prompt), await cached.ainvoke(prompt)]
+
+    assert asyncio.run(_scenario()) == [{"summary": "SUMMARIZE PAGE ONE"}] * 2
+    assert cached.invoke(prompt) == {"summary": "SUMMARIZE PAGE ONE"}
+    assert model.calls == 1
+    # Another model name is another cache entry
+    cached_structured_model(model, cache, "claude", SCHEMA).invoke(prompt)
+    assert model.calls == 2
+
+def test_concurrent_gets_and_puts(tmp_path):
+    cache = _cache(tmp_path, max_entries=1000)
+
+    async def _scenario():
+        await asyncio.gather(*[cache.aput(f"key{i}", "gpt", {"i": i}) for i in range(50)])
+        return await asyncio.gather(*[
+            operation
+            for i in range(50)
+            for operation in (cache.aget(f"key{i}"), cache.aput(f"key{i}", "gpt", {"i": i}))
+        ])
+
+    results = asyncio.run(_scenario())
+    assert results[0::2] == [{"i": i} for i in range(50)]
+    assert cache.stats()["entries"] == 50
+    assert cache.hits == 50 and cache.misses == 0
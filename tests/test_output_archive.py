@@ -0,0 +1,69 @@
+import io
+import json
+import os
+import zipfile
+import pytest
+from helper_function.output_archive import (
+    OUTPUT_LAYOUT,
+    collect_output_entries,
+    iter_ndjson_stream,
+    iter_zip_stream
+)
+
+@pytest.fixture
+def workspace(tmp_path):
+    all_paths = {}
+    for dir_key, _, folder in OUTPUT_LAYOUT:
+        all_paths[dir_key] = tmp_path / folder
+        all_paths[dir_key].mkdir()
+    all_paths["all_previous_lecture_summary_file"] = tmp_path / "all_previous_lecture_summary.txt"
+    (all_paths["lecture_summaries_dir"] / "lecture_1.txt").write_text("summary " * 500, encoding="utf-8")
+    (all_paths["lecture_questions_dir"] / "lecture_1.json").write_text(json.dumps({"q": ["What?"]}), encoding="utf-8")
+    (all_paths["lecture_pdfs_dir"] / "lecture_1.pdf").write_bytes(os.urandom(600 * 1024))
+    all_paths["all_previous_lecture_summary_file"].write_text("all", encoding="utf-8")
+    return all_paths
+
+def test_collect_output_entries(workspace):
+    names = [arcname for arcname, _ in collect_output_entries(workspace)]
+    assert names == [
+        "lecture_summaries/lecture_1.txt",
+        "lecture_questions/lecture_1.json",
+        "lecture_pdfs/lecture_1.pdf",
+        "all_previous_lecture_summary.txt"
+    ]
+
+@pytest.mark.parametrize("compression", ["stored", "deflated", "bzip2", "lzma"])
+def test_streamed_zip_is_valid(workspace, compression):
+    entries = collect_output_entries(workspace)
+    chunks = list(iter_zip_stream(entries, compression, chunk_size=64 * 1024))
+    # Written piece by piece, not as one buffer at the end
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        for arcname, file in entries:
+            assert archive.read(arcname) == file.read_bytes()
+
+def test_stored_streams_as_deflate_for_strict_readers(workspace):
+    data = b"".join(iter_zip_stream(collect_output_entries(workspace), "stored"))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        # Entries carry a data descriptor, which strict readers refuse for STORED
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_DEFLATED}
+
+def test_ndjson_stream(workspace):
+    records = [json.loads(line) for line in b"".join(iter_ndjson_stream(collect_output_entries(workspace))).splitlines()]
+    by_path = {record["path"]: record for record in records}
+    assert by_path["lecture_questions/lecture_1.json"]["content"] == {"q": ["What?"]}
+    assert by_path["lecture_summaries/lecture_1.txt"]["type"] == "text"
+    assert by_path["lecture_pdfs/lecture_1.pdf"]["encoding"] == "base64"
+
+def test_compress_level_reaches_the_entries(workspace):
+    entries = collect_output_entries(workspace)
+    stored = b"".join(iter_zip_stream(entries, "stored"))
+    deflated = b"".join(iter_zip_stream(entries, "deflated"))
+    raw_size = sum(file.stat().st_size for _, file in entries)
+    # Level 0 keeps the repetitive summary text at full size; the default level shrinks it
+    assert len(stored) > raw_size
+    assert len(deflated) < len(stored) - 2000
+    with zipfile.ZipFile(io.BytesIO(stored)) as archive:
+        summary = archive.getinfo("lecture_summaries/lecture_1.txt")
+        assert summary.compress_size >= summary.file_size
@@ -0,0 +1,45 @@
+import pytest
+from pathlib import Path
+from helper_function.video_to_pdf_function import PDF_LINES_PER_PAGE, get_render_context, paginate_text
+
+FONT_PATH = Path(__file__).resolve().parent.parent / "font" / "Poppins-Regular.ttf"
+MAX_WIDTH = 580 - 2 * 20
+
+@pytest.fixture(scope="module")
+def line_word():
+    """The shortest word of which two no longer fit on one line"""
+    context = get_render_context(FONT_PATH)
+    for length in range(1, 200):
+        word = "m" * length
+        if len(context.layout_lines(f"{word} {word}", MAX_WIDTH)) == 2:
+            return word
+    raise AssertionError("no word fills half a line")
+
+def test_empty_text_is_one_blank_page():
+    assert paginate_text("", FONT_PATH) == [""]
+    assert paginate_text(" \n\t ", FONT_PATH) == [""]
+
+def test_over_long_word_is_kept_whole_on_its_own_line():
+    word = "a" * 500
+    pages = paginate_text(f"before {word} after", FONT_PATH)
+    assert pages == [f"before\n{word}\nafter"]
+
+def test_over_long_first_word_is_kept_whole():
+    word = "a" * 500
+    (page,) = paginate_text(word, FONT_PATH)
+    assert [line for line in page.split("\n") if line] == [word]
+
+def test_exactly_full_page_stays_one_page(line_word):
+    pages = paginate_text(" ".join([line_word] * PDF_LINES_PER_PAGE), FONT_PATH)
+    assert pages == ["\n".join([line_word] * PDF_LINES_PER_PAGE)]
+
+def test_one_line_over_a_full_page_starts_a_new_page(line_word):
+    pages = paginate_text(" ".join([line_word] * (PDF_LINES_PER_PAGE + 1)), FONT_PATH)
+    assert pages == ["\n".join([line_word] * PDF_LINES_PER_PAGE), line_word]
+
+def test_pages_keep_every_word_in_order():
+    text = " ".join(f"word{i}" for i in range(5000))
+    pages = paginate_text(text, FONT_PATH)
+    assert len(pages) > 1
+    assert " ".join(pages).split() == text.split()
+    assert all(len(page.split("\n")) <= PDF_LINES_PER_PAGE for page in pages)
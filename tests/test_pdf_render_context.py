@@ -0,0 +1,66 @@
+import asyncio
+import random
+import threading
+from pathlib import Path
+from PyPDF2 import PdfReader
+from helper_function import video_to_pdf_function
+from helper_function.video_to_pdf_function import get_render_context, save_texts_to_pdf
+
+FONT_PATH = Path(__file__).resolve().parent.parent / "font" / "Poppins-Regular.ttf"
+
+def _text(seed: int, words: int = 3000) -> str:
+    rng = random.Random(seed)
+    return " ".join(
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(1, 12)))
+        for _ in range(words)
+    )
+
+def test_one_context_per_font_path():
+    context = get_render_context(FONT_PATH)
+    # Relative or unresolved spellings of the same file share the context
+    assert get_render_context(FONT_PATH.parent / ".." / "font" / FONT_PATH.name) is context
+    assert context.font_name == "Poppins-Regular"
+
+def test_concurrent_first_use_registers_the_font_once(monkeypatch, tmp_path):
+    font_copy = tmp_path / "Poppins-Copy.ttf"
+    font_copy.write_bytes(FONT_PATH.read_bytes())
+    created = []
+    original_ttfont = video_to_pdf_function.TTFont
+
+    def _counting_ttfont(*args, **kwargs):
+        created.append(args[0])
+        return original_ttfont(*args, **kwargs)
+
+    monkeypatch.setattr(video_to_pdf_function, "TTFont", _counting_ttfont)
+    monkeypatch.setattr(video_to_pdf_function, "_render_contexts", {})
+    contexts = []
+    threads = [
+        threading.Thread(target=lambda: contexts.append(get_render_context(font_copy)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert created == ["Poppins-Copy"]
+    assert all(context is contexts[0] for context in contexts)
+
+def test_renders_reuse_the_registered_font(monkeypatch, tmp_path):
+    get_render_context(FONT_PATH)
+    # After the first use no render parses the TTF again
+    monkeypatch.setattr(video_to_pdf_function, "TTFont", None)
+    jobs = []
+    for i in range(3):
+        text_file = tmp_path / f"lecture_{i}.txt"
+        text_file.write_text(_text(i), encoding="utf-8")
+        jobs.append((text_file, tmp_path / f"lecture_{i}.pdf"))
+    asyncio.run(save_texts_to_pdf(FONT_PATH, jobs))
+    for _, output in jobs:
+        assert len(PdfReader(str(output)).pages) > 1
+
+def test_render_pdf_keeps_every_word(tmp_path):
+    output = tmp_path / "lecture.pdf"
+    text = _text(7)
+    get_render_context(FONT_PATH).render_pdf(text, output)
+    extracted = " ".join(page.extract_text() for page in PdfReader(str(output)).pages)
+    assert extracted.split() == text.split()
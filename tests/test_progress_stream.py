@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from helper_function.admission_control import AdmissionController
+from ai_features.views import QuestionAnswerProgressStream as stream_view
+
+@pytest.fixture
+def stream_endpoint(tmp_path, monkeypatch):
+    controller = AdmissionController(max_running=1, max_queued=1)
+    data_dir = tmp_path / "request"
+    pipeline_calls = []
+
+    async def _paths():
+        data_dir.mkdir()
+        return {"request_id": "request", "data_dir": data_dir}
+
+    async def _save_uploaded_videos(uploaded_file, all_paths):
+        return [{"path": all_paths["data_dir"] / "input_0.mp4", "size_bytes": 1, "duration_seconds": 60}]
+
+    async def _run_pipeline(**kwargs):
+        pipeline_calls.append(kwargs)
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(stream_view, "admission_controller", controller)
+    monkeypatch.setattr(stream_view, "paths", _paths)
+    monkeypatch.setattr(stream_view, "validate_request", lambda *args: None)
+    monkeypatch.setattr(stream_view, "save_uploaded_videos", _save_uploaded_videos)
+    monkeypatch.setattr(stream_view, "get_chain_registry", lambda request: {})
+    monkeypatch.setattr(stream_view, "run_question_answer_pipeline", _run_pipeline)
+
+    async def _call():
+        return await stream_view.QuestionAnswerGenerationStream(
+            request=None,
+            uploaded_file=[object()],
+            number_of_questions=5,
+            hinglish=False,
+            windowing=None,
+            window_tokens=None,
+            snap_to_sentences=True,
+            summary_mode=None,
+            stream_format="sse"
+        )
+
+    return _call, controller, data_dir, pipeline_calls
+
+def test_disconnect_before_first_chunk_releases_ticket_and_workspace(stream_endpoint):
+    call_endpoint, controller, data_dir, pipeline_calls = stream_endpoint
+    sent = []
+
+    async def _receive():
+        return {"type": "http.disconnect"}
+
+    async def _send(message):
+        sent.append(message)
+        # A stalled client: the disconnect arrives before the headers are out
+        await asyncio.sleep(10)
+
+    async def _scenario():
+        response = await call_endpoint()
+        assert controller.waiting == 1 and data_dir.exists()
+        await response({"type": "http"}, _receive, _send)
+
+    asyncio.run(_scenario())
+    # The body generator never ran, yet the reservation and workspace are gone
+    assert not any(message["type"] == "http.response.body" for message in sent)
+    assert pipeline_calls == []
+    assert controller.waiting == 0 and controller.running == 0 and controller.admitted_cost == 0
+    assert not data_dir.exists()
+
+def test_disconnect_mid_stream_cancels_pipeline_and_releases_once(stream_endpoint):
+    call_endpoint, controller, data_dir, pipeline_calls = stream_endpoint
+
+    async def _scenario():
+        response = await call_endpoint()
+        body = response.body_iterator
+        first_chunk = asyncio.ensure_future(body.__anext__())
+        while not pipeline_calls:
+            await asyncio.sleep(0)
+        assert controller.running == 1
+        first_chunk.cancel()
+        await asyncio.gather(first_chunk, return_exceptions=True)
+        await body.aclose()
+        # The background task runs afterwards and must not release twice
+        await response.background()
+
+    asyncio.run(_scenario())
+    assert controller.waiting == 0 and controller.running == 0 and controller.admitted_cost == 0
+    assert not data_dir.exists()
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from langchain_core.runnables import RunnableLambda
+from helper_function.metrics import QUESTION_MODELS_DROPPED
+from helper_function.quorum_fanout import drop_reason_label, quorum_fan_out
+from ai_features.views.QuestionAnswerGenerationModel import generate_questions_for_lecture
+
+class ProviderError(Exception):
+    status_code = 503
+
+class FakeChain:
+    def __init__(self, answer, delay: float = 0, error: Exception = None):
+        self.answer = answer
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def ainvoke(self, inputs: dict):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+def test_quorum_zero_waits_for_every_chain():
+    chains = {"a": FakeChain("A"), "b": FakeChain("B", 0.02)}
+    answers, report = asyncio.run(quorum_fan_out(chains, {}))
+    assert answers == {"a": "A", "b": "B"}
+    assert report["contributing_models"] == ["a", "b"]
+    assert report["dropped_models"] == {}
+    assert report["quorum"] == 2
+
+def test_quorum_returns_early_and_cancels_late_chains():
+    slow = FakeChain("C", 5)
+    chains = {"a": FakeChain("A"), "b": FakeChain("B"), "c": slow}
+    answers, report = asyncio.run(quorum_fan_out(chains, {}, quorum=2))
+    assert answers == {"a": "A", "b": "B"}
+    assert report["dropped_models"] == {"c": "late"}
+    assert slow.cancelled
+
+def test_deadline_drops_late_chains():
+    chains = {"fast": FakeChain("F"), "slow": FakeChain("S", 5)}
+    answers, report = asyncio.run(quorum_fan_out(chains, {}, deadline_seconds=0.05))
+    assert answers == {"fast": "F"}
+    assert report["dropped_models"] == {"slow": "late"}
+
+def test_first_answer_after_the_deadline_is_used():
+    chains = {"a": FakeChain("A", 0.05), "b": FakeChain("B", 5)}
+    answers, report = asyncio.run(quorum_fan_out(chains, {}, deadline_seconds=0.01))
+    assert answers == {"a": "A"}
+    assert report["dropped_models"] == {"b": "late"}
+
+def test_failures_report_class_and_status_not_message():
+    chains = {
+        "ok": FakeChain("A"),
+        "down": FakeChain(None, error=ProviderError("prompt text the provider echoed")),
+        "broken": FakeChain(None, error=ValueError("more prompt text"))
+    }
+    answers, report = asyncio.run(quorum_fan_out(chains, {}))
+    assert answers == {"ok": "A"}
+    assert report["dropped_models"] == {
+        "down": "error: ProviderError (503)",
+        "broken": "error: ValueError"
+    }
+
+def test_no_answers_raises():
+    chains = {"a": FakeChain(None, error=ValueError("x"))}
+    with pytest.raises(Exception, match="No model answered"):
+        asyncio.run(quorum_fan_out(chains, {}))
+
+def test_drop_reason_labels_are_status_class_or_late():
+    assert drop_reason_label("late") == "late"
+    assert drop_reason_label("error: ProviderError (503)") == "503"
+    assert drop_reason_label("error: ValueError") == "ValueError"
+
+def test_failed_model_is_counted_under_its_status_and_class():
+    chains = {
+        "openai": FakeChain({"questions": ["Q"]}),
+        "xai": FakeChain(None, error=ProviderError("echoed prompt")),
+        "google": FakeChain(None, error=ValueError("echoed prompt"))
+    }
+
+    async def _fan_out(inputs: dict) -> dict:
+        answers, report = await quorum_fan_out(chains, inputs)
+        return {"all_model_questions": answers, "question_fanout": report}
+
+    async def _select(inputs: dict) -> dict:
+        return {"questions": ["Q"]}
+
+    before = dict(QUESTION_MODELS_DROPPED._values)
+    result = asyncio.run(generate_questions_for_lecture(
+        lecture_summary="summary",
+        question_generation_chain=RunnableLambda(_fan_out),
+        question_selection_chain=RunnableLambda(_select),
+        number_of_questions=3
+    ))
+    assert result["contributing_models"] == ["openai"]
+    counted = {
+        key: value - before.get(key, 0)
+        for key, value in QUESTION_MODELS_DROPPED._values.items()
+        if value != before.get(key, 0)
+    }
+    assert counted == {("xai", "503"): 1, ("google", "ValueError"): 1}
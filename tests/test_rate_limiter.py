@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from helper_function import rate_limiter
+from helper_function.rate_limiter import (
+    TokenBucket,
+    ProviderRateLimiter,
+    backoff_delay,
+    call_with_rate_limit,
+    is_rate_limit_error,
+    is_retryable_error
+)
+
+class StatusError(Exception):
+    def __init__(self, status_code: int, headers: dict = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+class RateLimitError(Exception):
+    pass
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60) == 0
+    bucket.consume(60)
+    # One unit per second refill
+    assert bucket.wait_time(1) == pytest.approx(1, abs=0.05)
+
+def test_token_bucket_caps_oversized_requests_at_capacity():
+    bucket = TokenBucket(10)
+    assert bucket.wait_time(1000) == 0
+    bucket.consume(1000)
+    assert bucket.available == pytest.approx(0, abs=0.01)
+
+def test_limiter_without_limits_never_waits():
+    limiter = ProviderRateLimiter("test")
+
+    async def _acquire_many():
+        return [await limiter.acquire(10_000) for _ in range(50)]
+
+    assert max(asyncio.run(_acquire_many())) < 0.05
+    assert limiter.stats()["requests"] == 50
+
+def test_limiter_blocks_past_the_request_budget():
+    limiter = ProviderRateLimiter("test", requests_per_minute=600)
+    limiter.requests.available = 1
+
+    async def _acquire_two():
+        await limiter.acquire()
+        return await limiter.acquire()
+
+    # 10 requests per second: the second request waits about 0.1s
+    assert asyncio.run(_acquire_two()) == pytest.approx(0.1, abs=0.05)
+
+def test_error_classification():
+    assert is_rate_limit_error(StatusError(429))
+    assert is_rate_limit_error(RateLimitError())
+    assert is_retryable_error(StatusError(503))
+    assert not is_retryable_error(StatusError(400))
+    assert not is_retryable_error(StatusError(401))
+    # The status is found on a wrapped cause too
+    try:
+        try:
+            raise StatusError(502)
+        except StatusError as err:
+            raise RuntimeError("wrapped") from err
+    except RuntimeError as wrapped:
+        assert is_retryable_error(wrapped)
+
+def test_backoff_respects_retry_after():
+    # Reads the module function, not the fixture's replacement
+    assert backoff_delay(0, retry_after=7) >= 7
+
+def test_call_retries_transient_errors_then_succeeds():
+    limiter = ProviderRateLimiter("test")
+    attempts = []
+
+    async def _call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise StatusError(429)
+        return "ok"
+
+    assert asyncio.run(call_with_rate_limit(limiter, _call, max_retries=5)) == "ok"
+    assert len(attempts) == 3
+    assert limiter.retries == 2
+    assert limiter.rate_limited == 2
+    assert limiter.acquired == 3
+
+def test_call_does_not_retry_client_errors():
+    limiter = ProviderRateLimiter("test")
+    attempts = []
+
+    async def _call():
+        attempts.append(1)
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        asyncio.run(call_with_rate_limit(limiter, _call, max_retries=5))
+    assert len(attempts) == 1
+    assert limiter.failures == 1
+
+def test_call_gives_up_after_max_retries():
+    limiter = ProviderRateLimiter("test")
+    attempts = []
+
+    async def _call():
+        attempts.append(1)
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        asyncio.run(call_with_rate_limit(limiter, _call, max_retries=2))
+    assert len(attempts) == 3
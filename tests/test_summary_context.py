@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from helper_function.transcript_windowing import count_tokens, keep_last_tokens
+from helper_function.summary_context import DIGEST_HEADER, RollingSummaryContext
+
+def _page(n: int, words: int = 40) -> str:
+    return f"\n\n#### Page {n}\n" + " ".join(f"point{n}" for _ in range(words))
+
+class FakeDigestChain:
+    """Stands in for the digest model: returns a short digest and records the word limits"""
+
+    def __init__(self, reply: str = "short digest of earlier pages"):
+        self.reply = reply
+        self.calls = []
+
+    async def ainvoke(self, inputs: dict) -> dict:
+        self.calls.append(inputs)
+        return {"digest": self.reply}
+
+def _add_pages(context: RollingSummaryContext, pages) -> list:
+    async def _scenario():
+        rendered = []
+        for page in pages:
+            await context.add_page(page)
+            rendered.append(context.render())
+        return rendered
+    return asyncio.run(_scenario())
+
+def test_pages_slide_from_window_into_digest():
+    context = RollingSummaryContext(window_pages=2, token_budget=100_000)
+    pages = [_page(n) for n in range(4)]
+    _add_pages(context, pages)
+    assert [page for page, _ in context.window] == pages[2:]
+    assert context.digest == pages[0] + pages[1]
+    assert context.render() == f"{DIGEST_HEADER}{pages[0] + pages[1]}\n" + pages[2] + pages[3]
+    assert context.compactions == 0
+
+def test_cached_counts_match_the_pages():
+    context = RollingSummaryContext(window_pages=2, token_budget=100_000)
+    pages = [_page(n) for n in range(5)]
+    _add_pages(context, pages)
+    assert context.window_tokens == sum(count_tokens(page) for page in pages[3:])
+    assert context.digest_tokens == sum(count_tokens(page) for page in pages[:3])
+
+def test_overfull_digest_is_compacted_with_the_chain():
+    chain = FakeDigestChain()
+    context = RollingSummaryContext(window_pages=2, token_budget=count_tokens(_page(0)) * 3, digest_chain=chain)
+    _add_pages(context, [_page(n) for n in range(6)])
+    assert context.compactions >= 1
+    assert context.digest == chain.reply
+    assert context.digest_tokens == count_tokens(chain.reply)
+    assert all(call["max_words"] >= 1 for call in chain.calls)
+
+@pytest.mark.parametrize("digest_chain", [None, FakeDigestChain("long digest " * 500)])
+def test_rendered_context_stays_within_budget(digest_chain):
+    budget = 400
+    context = RollingSummaryContext(window_pages=3, token_budget=budget, digest_chain=digest_chain)
+    for rendered in _add_pages(context, [_page(n, words=30 + n % 7) for n in range(20)]):
+        assert count_tokens(rendered) <= budget
+        assert context.context_tokens() <= budget
+
+def test_full_strategy_keeps_every_page():
+    context = RollingSummaryContext(strategy="full", window_pages=1, token_budget=10)
+    pages = [_page(n) for n in range(3)]
+    _add_pages(context, pages)
+    assert context.render() == "".join(pages)
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        RollingSummaryContext(strategy="everything")
+
+def test_keep_last_tokens_keeps_the_end():
+    text = " ".join(f"word{i}" for i in range(200))
+    kept = keep_last_tokens(text, 20)
+    assert text.endswith(kept)
+    assert count_tokens(kept) <= 20
+    assert keep_last_tokens("short", 20) == "short"
+    assert keep_last_tokens(text, 0) == ""
@@ -0,0 +1,52 @@
+import asyncio
+from ai_features.views.QuestionAnswerGenerationModel import summarize_pages_parallel
+
+class FakeSummaryChain:
+    async def ainvoke(self, inputs: dict) -> dict:
+        page = inputs["page_text"]
+        return {"concise_page_summary": f"concise {page}", "detail_page_summary": f"detail {page}"}
+
+class FakeStitchChain:
+    """Returns `pages_returned` stitched summaries (None: one per page)"""
+
+    def __init__(self, pages_returned: int = None):
+        self.pages_returned = pages_returned
+        self.calls = []
+
+    async def ainvoke(self, inputs: dict) -> dict:
+        self.calls.append(inputs)
+        count = inputs["number_of_pages"] if self.pages_returned is None else self.pages_returned
+        return {"stitched_page_summaries": [f"stitched {i}" for i in range(count)]}
+
+def _summarize(pages, stitch_chain):
+    return asyncio.run(summarize_pages_parallel(
+        lecture_idx=0,
+        pages=pages,
+        summary_chain=FakeSummaryChain(),
+        concise_stitch_chain=stitch_chain,
+        number_of_questions=3
+    ))
+
+def _formatted(summaries) -> str:
+    return "".join(f"\n\n#### Page {i + 1}:\n{summary}\n" for i, summary in enumerate(summaries))
+
+def test_stitched_summaries_replace_the_page_summaries():
+    stitch_chain = FakeStitchChain()
+    concise, detailed, page_tokens, stitch_tokens = _summarize(["a", "b", "c"], stitch_chain)
+    assert concise == _formatted(["stitched 0", "stitched 1", "stitched 2"])
+    assert detailed == _formatted(["detail a", "detail b", "detail c"])
+    assert len(page_tokens) == 3 and stitch_tokens > 0
+    assert stitch_chain.calls[0]["page_summaries"] == _formatted(["concise a", "concise b", "concise c"])
+
+def test_wrong_stitched_page_count_falls_back_to_page_summaries():
+    for pages_returned in (2, 4):
+        concise, _, _, stitch_tokens = _summarize(["a", "b", "c"], FakeStitchChain(pages_returned))
+        assert concise == _formatted(["concise a", "concise b", "concise c"])
+        # The stitch call was still made and paid for
+        assert stitch_tokens > 0
+
+def test_single_page_is_not_stitched():
+    stitch_chain = FakeStitchChain()
+    concise, _, _, stitch_tokens = _summarize(["a"], stitch_chain)
+    assert concise == _formatted(["concise a"])
+    assert stitch_chain.calls == [] and stitch_tokens == 0
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from helper_function.task_graph import TaskGraph, TaskGraphError
+
+def _node(value, delay: float = 0, log: list = None, name: str = None):
+    async def _fn(deps: dict):
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return value(deps) if callable(value) else value
+    return _fn
+
+def test_results_flow_from_dependencies():
+    graph = TaskGraph()
+    graph.add("a", _node(1))
+    graph.add("b", _node(2))
+    graph.add("sum", _node(lambda deps: deps["a"] + deps["b"]), deps=["a", "b"])
+    assert asyncio.run(graph.run()) == {"a": 1, "b": 2, "sum": 3}
+    assert set(graph.timings) == {"a", "b", "sum"}
+
+def test_independent_branches_overlap():
+    log = []
+    graph = TaskGraph()
+    graph.add("slow", _node(None, 0.05, log, "slow"))
+    graph.add("fast", _node(None, 0, log, "fast"))
+    graph.add("after_fast", _node(None, 0, log, "after_fast"), deps=["fast"])
+    asyncio.run(graph.run())
+    # after_fast does not wait for the unrelated slow branch
+    assert log.index(("end", "after_fast")) < log.index(("end", "slow"))
+
+def test_dependent_starts_after_its_dependency_ends():
+    log = []
+    graph = TaskGraph()
+    graph.add("first", _node(None, 0.01, log, "first"))
+    graph.add("second", _node(None, 0, log, "second"), deps=["first"])
+    asyncio.run(graph.run())
+    assert log.index(("end", "first")) < log.index(("start", "second"))
+
+def test_failure_cancels_the_rest():
+    cancelled = []
+
+    async def _fails(deps):
+        raise ValueError("boom")
+
+    async def _slow(deps):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    graph = TaskGraph()
+    graph.add("fails", _fails)
+    graph.add("slow", _slow)
+    graph.add("never", _node(None), deps=["fails"])
+    with pytest.raises(TaskGraphError) as excinfo:
+        asyncio.run(graph.run())
+    assert excinfo.value.node == "fails"
+    assert isinstance(excinfo.value.original, ValueError)
+    assert cancelled == ["slow"]
+    assert "never" not in graph.results
+
+def test_add_rejects_duplicates_and_unknown_dependencies():
+    graph = TaskGraph()
+    graph.add("a", _node(1))
+    with pytest.raises(ValueError):
+        graph.add("a", _node(1))
+    with pytest.raises(ValueError):
+        graph.add("b", _node(1), deps=["missing"])
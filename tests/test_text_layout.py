@@ -0,0 +1,56 @@
+import random
+import pytest
+from pathlib import Path
+from reportlab.pdfbase import pdfmetrics
+from helper_function.video_to_pdf_function import PDF_FONT_SIZE, get_render_context
+
+FONT_PATH = Path(__file__).resolve().parent.parent / "font" / "Poppins-Regular.ttf"
+
+# Latin, punctuation, accented letters, Devanagari and characters the font lacks
+ALPHABETS = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
+    ".,;:!?'\"()[]-_/",
+    "àáâäçèéêëìíîïñòóôöùúûüß",
+    "अआइईउऊएऐओऔकखगघचछजझटठडढतथदधनपफबभमयरलवशषसहािीुूेैोौंः्",
+    "中文日本語한국어😀∑∫"
+)
+
+def _layout_lines_quadratic(text: str, max_width: float, font_name: str) -> list:
+    """Reference layout: measure the whole growing line for every word"""
+    lines = []
+    current_line = []
+    for word in text.split():
+        test_line = ' '.join(current_line + [word])
+        if pdfmetrics.stringWidth(test_line, font_name, PDF_FONT_SIZE) > max_width:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+        else:
+            current_line.append(word)
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+def _random_text(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(0, 400)):
+        alphabet = rng.choice(ALPHABETS)
+        words.append("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 25))))
+    separators = [" ", " ", " ", "  ", "\n", "\t"]
+    return "".join(word + rng.choice(separators) for word in words)
+
+@pytest.fixture(scope="module")
+def context():
+    return get_render_context(FONT_PATH)
+
+@pytest.mark.parametrize("seed", range(300))
+def test_layout_matches_whole_line_measurement(context, seed):
+    rng = random.Random(seed)
+    text = _random_text(rng)
+    max_width = rng.choice([540, 300, 120, 40])
+    assert context.layout_lines(text, max_width) == _layout_lines_quadratic(text, max_width, context.font_name)
+
+def test_layout_breaks_on_exact_width_boundary(context):
+    # A line exactly max_width wide still fits
+    words = ["lecture", "notes", "summary"]
+    width = pdfmetrics.stringWidth(" ".join(words), context.font_name, PDF_FONT_SIZE)
+    assert context.layout_lines(" ".join(words * 2), width)[0] == " ".join(words)
@@ -0,0 +1,41 @@
+import os
+import asyncio
+import hashlib
+from helper_function.transcript_cache import TranscriptCache, file_sha256
+
+def _write(path, text: str):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+def test_file_sha256_streams_the_whole_file(tmp_path):
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    path = tmp_path / "video.mp4"
+    path.write_bytes(data)
+    assert asyncio.run(file_sha256(path)) == hashlib.sha256(data).hexdigest()
+
+def test_cache_key_separates_transcription_modes():
+    assert TranscriptCache.cache_key("abc", True) != TranscriptCache.cache_key("abc", False)
+
+def test_put_then_get_round_trip(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    key = TranscriptCache.cache_key("abc", False)
+    target = tmp_path / "job" / "input_0.txt"
+    assert not asyncio.run(cache.get(key, target))
+    asyncio.run(cache.put(key, _write(tmp_path / "transcript.txt", "hello lecture")))
+    assert asyncio.run(cache.get(key, target))
+    assert target.read_text(encoding="utf-8") == "hello lecture"
+    # No temp files are left behind
+    assert [entry.name for entry in (tmp_path / "cache").iterdir()] == [f"{key}.txt"]
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=250)
+    source = _write(tmp_path / "transcript.txt", "x" * 100)
+    asyncio.run(cache.put("old", source))
+    asyncio.run(cache.put("used", source))
+    # Age both entries, then read "used" so it becomes the most recent
+    for name in ("old", "used"):
+        os.utime(tmp_path / "cache" / f"{name}.txt", (1, 1))
+    assert asyncio.run(cache.get("used", tmp_path / "out.txt"))
+    asyncio.run(cache.put("new", source))
+    remaining = sorted(entry.stem for entry in (tmp_path / "cache").glob("*.txt"))
+    assert remaining == ["new", "used"]
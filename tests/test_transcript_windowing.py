@@ -0,0 +1,49 @@
+import pytest
+from helper_function.transcript_windowing import count_tokens, window_by_tokens
+
+def _units_tokens(units) -> int:
+    # window_by_tokens charges one extra token per unit for the joining whitespace
+    return sum(count_tokens(unit) + 1 for unit in units)
+
+SENTENCES = ["The lecture starts here.", "Gradients flow backwards.", "Loss goes down!"]
+
+def test_sentences_that_exactly_fit_share_one_window():
+    budget = _units_tokens(SENTENCES)
+    assert window_by_tokens(" ".join(SENTENCES), budget) == [" ".join(SENTENCES)]
+
+def test_one_token_over_the_budget_starts_a_new_window():
+    budget = _units_tokens(SENTENCES) - 1
+    assert window_by_tokens(" ".join(SENTENCES), budget) == [
+        " ".join(SENTENCES[:2]),
+        SENTENCES[2]
+    ]
+
+def test_windows_end_on_sentence_boundaries():
+    text = " ".join(SENTENCES * 10)
+    budget = _units_tokens(SENTENCES[:2]) + 1
+    windows = window_by_tokens(text, budget)
+    assert " ".join(windows) == text
+    for window in windows:
+        assert window.endswith((".", "!"))
+        assert count_tokens(window) <= budget
+
+def test_paragraph_larger_than_the_budget_is_hard_split():
+    paragraph = " ".join(f"word{i}" for i in range(400))
+    windows = window_by_tokens(f"Short intro. {paragraph}", 50)
+    assert windows[0] == "Short intro."
+    assert len(windows) > 2
+    assert all(count_tokens(window) <= 50 for window in windows[1:])
+    assert "".join(windows[1:]) == paragraph
+
+def test_word_windows_without_sentence_snapping():
+    text = " ".join(f"w{i}" for i in range(100))
+    windows = window_by_tokens(text, 20, snap_to_sentences=False)
+    assert " ".join(windows).split() == text.split()
+    assert all(count_tokens(window) <= 20 for window in windows)
+
+def test_empty_text_is_one_empty_window():
+    assert window_by_tokens("", 10) == [""]
+
+def test_budget_must_be_positive():
+    with pytest.raises(ValueError):
+        window_by_tokens("text", 0)
@@ -0,0 +1,46 @@
+import io
+import os
+import asyncio
+import hashlib
+import pytest
+from fastapi import UploadFile
+from helper_function.upload_streaming import UploadTooLargeError, stream_upload_to_file
+
+class CountingFile(io.BytesIO):
+    """In-memory upload body that records the size of every read"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return super().read(size)
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=CountingFile(data), filename="lecture.mp4")
+
+def test_upload_is_copied_in_chunks(tmp_path):
+    data = os.urandom(10 * 1024 + 123)
+    upload = _upload(data)
+    target = tmp_path / "input_0.mp4"
+    result = asyncio.run(stream_upload_to_file(upload, target, chunk_size=1024))
+    assert target.read_bytes() == data
+    assert result == {"path": target, "size_bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+    # Never more than one chunk per read
+    assert set(upload.file.reads) == {1024}
+    assert len(upload.file.reads) == 12
+
+def test_upload_at_the_limit_is_accepted(tmp_path):
+    data = b"x" * 4096
+    result = asyncio.run(stream_upload_to_file(_upload(data), tmp_path / "input_0.mp4", max_bytes=4096, chunk_size=1000))
+    assert result["size_bytes"] == 4096
+
+def test_upload_over_the_limit_is_rejected_and_removed(tmp_path):
+    upload = _upload(b"x" * 4097)
+    target = tmp_path / "input_0.mp4"
+    with pytest.raises(UploadTooLargeError, match="lecture.mp4"):
+        asyncio.run(stream_upload_to_file(upload, target, max_bytes=4096, chunk_size=1000))
+    assert not target.exists()
+    # Reading stopped at the chunk that crossed the limit
+    assert len(upload.file.reads) == 5